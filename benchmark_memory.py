@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: regular vs compact (slotted) model classes and lazy loading
+Loads the same generated data set each way and compares traced allocations
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from project_manager import ProjectManager
+
+
+def build_data_file(path, projects, tasks_per_stage):
+    pm = ProjectManager(path, write_behind=True)
+    pm.default_stage_tasks = {
+        stage: [f"{stage} task {i}" for i in range(tasks_per_stage)]
+        for stage in pm.default_stage_tasks
+    }
+    for i in range(projects):
+        project = pm.create_project(f"Project {i}", f"Benchmark project {i}", deadline="2030-01-01")
+        for task in project.stages[0].tasks[::2]:
+            task.complete()
+    pm.close()
+    return projects * len(pm.default_stage_tasks) * tasks_per_stage
+
+
+def measure(path, **options):
+    started = time.perf_counter()
+    ProjectManager(path, **options).close()
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    pm = ProjectManager(path, **options)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    summary = pm.get_global_summary()
+    pm.close()
+    return size, elapsed, summary
+
+
+def main():
+    projects = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    tasks_per_stage = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    print("🧠 Project Manager memory benchmark")
+    print("=" * 50)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "projects.json")
+        task_count = build_data_file(path, projects, tasks_per_stage)
+        print(f"📦 {projects} projects, {task_count} tasks ({os.path.getsize(path) / 2**20:.1f} MiB on disk)")
+
+        regular_size, regular_time, regular_summary = measure(path, compact_models=False)
+        compact_size, compact_time, compact_summary = measure(path, compact_models=True)
+        lazy_size, lazy_time, lazy_summary = measure(path, lazy=True)
+        assert regular_summary == compact_summary == lazy_summary, "All variants must load the same data"
+
+    print(f"   Regular models: {regular_size / 2**20:7.1f} MiB, loaded in {regular_time:.2f}s")
+    print(f"   Compact models: {compact_size / 2**20:7.1f} MiB, loaded in {compact_time:.2f}s")
+    print(f"   Lazy loading:   {lazy_size / 2**20:7.1f} MiB, loaded in {lazy_time:.2f}s (no project touched yet)")
+    print(f"   Per task: {regular_size / task_count:.0f} -> {compact_size / task_count:.0f} bytes")
+    print(f"✅ Compact models use {1 - compact_size / regular_size:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
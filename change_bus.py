@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+In-process change notification bus for the Project Manager
+ProjectManager publishes an event for every recorded change; the web
+interface relays them to browsers as Server-Sent Events
+"""
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+class Subscription:
+    """Queue of events for one listener; see ChangeBus.subscribe()"""
+
+    def __init__(self, maxsize: int):
+        self._queue = queue.Queue(maxsize)
+        self.overflowed = False
+        self.closed = False
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Next event, or None if nothing arrived within timeout or the subscription was closed"""
+        if self.closed:
+            return None
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        """Wake a listener blocked in get(); it gets None from then on"""
+        self.closed = True
+        with self._queue.mutex:
+            self._queue.queue.clear()
+        self._queue.put_nowait(None)
+
+    def _put(self, event: Dict):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # A listener that fell this far behind has to reload everything
+            # anyway, so drop what it missed and tell it to resync
+            self.overflowed = True
+            with self._queue.mutex:
+                self._queue.queue.clear()
+            self._queue.put_nowait(_resync_event(event['id']))
+
+
+def _resync_event(event_id: int) -> Dict:
+    return {'id': event_id, 'type': 'resync', 'time': time.time()}
+
+
+class ChangeBus:
+    """Fans events out to subscribers and keeps the most recent ones for replay.
+
+    Every event gets an increasing id. A subscriber that reconnects with the
+    id of the last event it saw is sent what it missed, or a ``resync`` event
+    when that is no longer in the backlog.
+    """
+
+    def __init__(self, backlog: int = 256, queue_size: int = 256):
+        self.queue_size = queue_size
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._backlog = deque(maxlen=backlog)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event_type: str, **data) -> Dict:
+        with self._lock:
+            self._last_id = next(self._ids)
+            event = dict(data, id=self._last_id, type=event_type, time=time.time())
+            self._backlog.append(event)
+            # Delivered under the lock so every subscriber sees ids in order
+            for subscription in self._subscribers:
+                subscription._put(event)
+        return event
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            if last_event_id is not None and last_event_id != self._last_id:
+                # An id from the future means the events came from an earlier run
+                if last_event_id > self._last_id or self._backlog[0]['id'] > last_event_id + 1:
+                    subscription._put(_resync_event(self._last_id))
+                else:
+                    for event in self._backlog:
+                        if event['id'] > last_event_id:
+                            subscription._put(event)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
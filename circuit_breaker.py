@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Retries and circuit breakers for notification channels
+Failed sends are retried after a jittered, exponentially growing delay; a
+channel that keeps failing is cut off for a while so that notifications fail
+fast instead of each paying the full timeout
+"""
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Tracks the health of one channel.
+
+    After ``failure_threshold`` failed attempts in a row the breaker opens
+    and allow() returns False for ``reset_timeout`` seconds. Then a single
+    trial attempt is let through (half open): success closes the breaker,
+    failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether an attempt may be made now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state, self.failures, self.opened_at = CLOSED, 0, None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state, self.opened_at = OPEN, time.time()
+            self._trial_running = False
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            retry_at = self.opened_at + self.reset_timeout if self.state == OPEN else None
+            return {'state': self.state, 'failures': self.failures, 'opened_at': self.opened_at,
+                    'retry_at': retry_at}
+
+
+def send_with_retry(send: Callable[[List], List[bool]], items: List, breaker: CircuitBreaker,
+                    attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                    sleep: Callable[[float], None] = time.sleep) -> List[bool]:
+    """Send ``items`` with ``send(items) -> [success, ...]``, retrying the failed ones.
+
+    Retry ``n`` waits a random time up to ``base_delay * 2 ** n`` seconds
+    (capped at ``max_delay``), so senders that failed together don't retry
+    together. An attempt in which every item failed counts as a failure of
+    the channel; nothing is attempted while ``breaker`` is open.
+    """
+    results = [False] * len(items)
+    pending = list(range(len(items)))
+    for attempt in range(max(1, attempts)):
+        if attempt:
+            sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+        if not breaker.allow():
+            logging.warning(f"{breaker.name} channel is unavailable, failing {len(pending)} deliveries")
+            break
+        try:
+            outcome = send([items[i] for i in pending])
+        except Exception:
+            outcome = [False] * len(pending)
+        if any(outcome):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        for i, success in zip(pending, outcome):
+            results[i] = success
+        pending = [i for i, success in zip(pending, outcome) if not success]
+        if not pending:
+            break
+    return results
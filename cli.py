@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
+import argparse
 import sys
-from project_manager import ProjectManager, Task, TaskStatus, StageStatus
+import time
+from project_manager import ProjectManager, TaskStatus, StageStatus
+from project_import import PLURALS, import_ndjson, iter_lines
 
 # ANSI escape codes for colors
 class Colors:
@@ -184,9 +187,8 @@ class ProjectCLI:
             return
         name = args[0]
         description = " ".join(args[1:]) if len(args) > 1 else ""
-        from project_manager import Stage
-        self.current_project.add_stage(Stage(name, description))
-        self.manager.save_data()
+        self.current_project.add_stage(self.current_project.stage_class(name, description))
+        self.manager.save_project(self.current_project)
         print(f"{Colors.GREEN}✅ Added stage '{name}' to project.{Colors.ENDC}")
 
     def list_stages(self):
@@ -233,8 +235,8 @@ class ProjectCLI:
             print(f"{Colors.FAIL}Error: Task name required.{Colors.ENDC}")
             return
         name, desc, assignee = args[0], (args[1] if len(args) > 1 else ""), (args[2] if len(args) > 2 else "")
-        current_stage.add_task(Task(name, desc, assignee))
-        self.manager.save_data()
+        current_stage.add_task(current_stage.task_class(name, desc, assignee))
+        self.manager.save_project(self.current_project)
         print(f"{Colors.GREEN}✅ Added task '{name}' to stage '{current_stage.name}'.{Colors.ENDC}")
 
     def list_tasks(self):
@@ -268,7 +270,7 @@ class ProjectCLI:
             return
         task = matching[0]
         task.complete()
-        self.manager.save_data()
+        self.manager.save_project(self.current_project)
         print(f"{Colors.GREEN}✅ Completed task '{task.name}'.{Colors.ENDC}")
 
     def update_task(self, task_id, status_str):
@@ -292,7 +294,7 @@ class ProjectCLI:
         task.status = status
         if status == TaskStatus.COMPLETED:
             task.completed_at = datetime.now().isoformat()
-        self.manager.save_data()
+        self.manager.save_project(self.current_project)
         print(f"{Colors.GREEN}✅ Updated task '{task.name}' to {status.value}.{Colors.ENDC}")
 
     def show_task(self, task_id):
@@ -324,7 +326,7 @@ class ProjectCLI:
             print(f"{Colors.GREEN}✅ {message}{Colors.ENDC}")
         else:
             print(f"{Colors.FAIL}❌ {message}{Colors.ENDC}")
-        self.manager.save_data()
+        self.manager.save_project(self.current_project)
 
     def next_stage(self):
         if not self.current_project:
@@ -335,7 +337,7 @@ class ProjectCLI:
             print(f"{Colors.GREEN}✅ {message}{Colors.ENDC}")
         else:
             print(f"{Colors.FAIL}❌ {message}{Colors.ENDC}")
-        self.manager.save_data()
+        self.manager.save_project(self.current_project)
 
     def previous_stage(self):
         if not self.current_project:
@@ -346,7 +348,7 @@ class ProjectCLI:
             print(f"{Colors.GREEN}✅ {message}{Colors.ENDC}")
         else:
             print(f"{Colors.FAIL}❌ {message}{Colors.ENDC}")
-        self.manager.save_data()
+        self.manager.save_project(self.current_project)
 
     def delete_project(self, project_id):
         matching = [p for p in self.manager.projects.values() if p.id.startswith(project_id)]
@@ -378,12 +380,62 @@ class ProjectCLI:
     def _find_task(self, task_id):
         if not self.current_project:
             return None, None
+        # Full ids resolve through the manager's task index
+        found = self.manager.get_task(task_id)
+        if found and found[0] is self.current_project:
+            return found[2], found[1]
         for stage in self.current_project.stages:
             for task in stage.tasks:
                 if task.id.startswith(task_id):
                     return task, stage
         return None, None
 
+def bulk_import(argv):
+    """Non-interactive import of an NDJSON export (plain or .gz) into a project file.
+
+    Usage: cli.py import <export.ndjson[.gz]> [--data-file FILE] [--skip-invalid] [--compact]
+    """
+    parser = argparse.ArgumentParser(prog="cli.py import", description="Bulk import an NDJSON export")
+    parser.add_argument("export_file")
+    parser.add_argument("--data-file", default="projects.json", help="project file to import into")
+    parser.add_argument("--skip-invalid", action="store_true", help="import the valid records even if some are invalid")
+    parser.add_argument("--compact", action="store_true", help="use compact models to import very large exports")
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    manager = ProjectManager(args.data_file, compact_models=args.compact)
+    with open(args.export_file, 'rb') as f:
+        report = import_ndjson(manager, iter_lines(f), atomic=not args.skip_invalid)
+
+    for error in report.errors:
+        where = f"line {error['line']}" if error['line'] else "input"
+        print(f"{Colors.FAIL}❌ {where}: {error['error']}{Colors.ENDC}")
+    if report.error_count > len(report.errors):
+        print(f"{Colors.FAIL}... and {report.error_count - len(report.errors)} more errors{Colors.ENDC}")
+    if not report.committed:
+        print(f"{Colors.FAIL}Import rejected, {args.data_file} was not changed.{Colors.ENDC}")
+        return 1
+    counts = ", ".join(f"{n} {PLURALS[kind]}" for kind, n in report.imported.items())
+    print(f"{Colors.GREEN}✅ Imported {counts} into {args.data_file} in {time.time() - started:.1f}s{Colors.ENDC}")
+    return 0
+
+def deadline_daemon(argv):
+    """Send deadline reminders when they come due, without the web interface.
+
+    Usage: cli.py deadline-daemon [--data-file FILE] [--config FILE] [--once]
+    """
+    from deadline_scheduler import run_daemon
+    parser = argparse.ArgumentParser(prog="cli.py deadline-daemon", description="Send deadline reminders")
+    parser.add_argument("--data-file", default="projects.json", help="project file to watch")
+    parser.add_argument("--config", default="notification_config.json", help="notification settings")
+    parser.add_argument("--once", action="store_true", help="check once and exit (e.g. from cron)")
+    args = parser.parse_args(argv)
+    return run_daemon(args.data_file, args.config, once=args.once)
+
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["import"]:
+        sys.exit(bulk_import(sys.argv[2:]))
+    if sys.argv[1:2] == ["deadline-daemon"]:
+        sys.exit(deadline_daemon(sys.argv[2:]))
     cli = ProjectCLI()
     cli.run()
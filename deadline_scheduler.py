@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Scheduled deadline checks
+A timer heap holds the instants at which project deadlines cross a reminder
+threshold; the scheduler thread sleeps until the earliest one instead of
+rescanning the portfolio on a fixed interval
+"""
+import heapq
+import logging
+import signal
+import threading
+import time
+from typing import Callable, Iterable, Optional, Tuple
+
+from change_bus import ChangeBus
+from file_watcher import FileWatcher
+from notification_system import NotificationSystem
+from project_manager import ProjectManager
+from project_store import SQLITE_EXTENSIONS
+
+# Change events that can't move a deadline or complete a project
+_IGNORED_EVENTS = {'catalog_updated', 'categories_changed', 'templates_changed', 'metadata_changed',
+                   'write_conflict'}
+# Events after which every deadline is planned for again
+_RESYNC_EVENTS = {'data_reloaded', 'file_switched'}
+
+
+class DeadlineScheduler:
+    """Runs ``sweep()`` whenever a deadline reminder comes due.
+
+    ``deadlines()`` returns the (deadline, project id) pairs of the active
+    projects, ``deadline_of(project_id)`` the active deadline of one project
+    (None if it has none or is completed) and ``crossings(deadline)`` the
+    times (epoch seconds) at which a deadline crosses a reminder threshold.
+    The future crossings are kept in a heap. ``sweep()`` may return a time
+    at which it wants to run again, e.g. when reminders wait for the next
+    digest. A change event on ``bus`` re-plans only the project it names,
+    and sweeps only if its new deadline is already past a threshold.
+    """
+
+    def __init__(self, sweep: Callable[[], Optional[float]], deadlines: Callable[[], Iterable[Tuple[float, str]]],
+                 deadline_of: Callable[[str], Optional[float]], crossings: Callable[[float], Iterable[float]],
+                 bus: ChangeBus):
+        self.sweep = sweep
+        self.deadlines = deadlines
+        self.deadline_of = deadline_of
+        self.crossings = crossings
+        self.bus = bus
+        self.sweeps = 0
+        self.plans = 0
+        # (time, project id, deadline); the project id is None for times sweep()
+        # asked for. Entries of a deadline that has changed since are skipped.
+        self._heap = []
+        # Active deadline of each project as planned for
+        self._planned = {}
+        self._subscription = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def next_run(self) -> Optional[float]:
+        self._drop_stale()
+        heap = self._heap
+        return heap[0][0] if heap else None
+
+    def start(self):
+        self._subscription = self.bus.subscribe()
+        self._thread = threading.Thread(target=self._run, name="DeadlineScheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._subscription is not None:
+            self._subscription.close()
+            self.bus.unsubscribe(self._subscription)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        # Planned first: a change made after that is told apart by its event.
+        # Then reminders that came due while nothing was running go out.
+        self._replan()
+        self._sweep()
+        subscription = self._subscription
+        while True:
+            next_run = self.next_run
+            timeout = max(0.0, next_run - time.time()) if next_run is not None else None
+            event = subscription.get(timeout)
+            if subscription.closed:
+                return
+            if event is None:
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    while self._heap and self._heap[0][0] <= now:
+                        heapq.heappop(self._heap)
+                    self._sweep()
+                continue
+            # A burst of changes is handled at once
+            resync, changed = False, set()
+            while event is not None:
+                if event['type'] in _RESYNC_EVENTS or (event['type'] not in _IGNORED_EVENTS
+                                                       and not event.get('project_id')):
+                    resync = True
+                elif event['type'] not in _IGNORED_EVENTS:
+                    changed.add(event['project_id'])
+                event = subscription.get(timeout=0)
+            if subscription.closed:
+                return
+            if resync:
+                self._replan()
+                self._sweep()
+            elif any([self._update(project_id) for project_id in changed]):
+                # A new or moved deadline may already be past one of its thresholds
+                self._sweep()
+
+    def _sweep(self):
+        self.sweeps += 1
+        try:
+            again = self.sweep()
+        except Exception as e:
+            logging.error(f"Error checking deadlines: {e}")
+            return
+        if again is not None:
+            heapq.heappush(self._heap, (again, None, None))
+
+    def _replan(self):
+        """Plan for every active deadline again"""
+        self.plans += 1
+        try:
+            planned = {project_id: at for at, project_id in self.deadlines()}
+            now = time.time()
+            heap = [(at, project_id, deadline) for project_id, deadline in planned.items()
+                    for at in self.crossings(deadline) if at > now]
+        except Exception as e:
+            logging.error(f"Error planning deadline checks: {e}")
+            return
+        heap += [entry for entry in self._heap if entry[1] is None and entry[0] > now]
+        heapq.heapify(heap)
+        self._heap, self._planned = heap, planned
+
+    def _update(self, project_id: str) -> bool:
+        """Plan for one project whose deadline or state may have changed; True if a reminder is due now"""
+        try:
+            deadline = self.deadline_of(project_id)
+            if deadline == self._planned.get(project_id):
+                return False
+            crossings = list(self.crossings(deadline)) if deadline is not None else []
+        except Exception as e:
+            logging.error(f"Error planning deadline checks for {project_id}: {e}")
+            return False
+        if deadline is None:
+            self._planned.pop(project_id, None)
+        else:
+            self._planned[project_id] = deadline
+        now = time.time()
+        for at in crossings:
+            if at > now:
+                heapq.heappush(self._heap, (at, project_id, deadline))
+        return any(at <= now for at in crossings)
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap and heap[0][1] is not None and self._planned.get(heap[0][1]) != heap[0][2]:
+            heapq.heappop(heap)
+
+
+def run_daemon(data_file: str, config_file: str = "notification_config.json", once: bool = False) -> int:
+    """Send deadline reminders for data_file until interrupted (or one check with ``once``)"""
+    bus = ChangeBus()
+    notification_system = NotificationSystem(config_file)
+    holder = {'pm': ProjectManager(data_file, bus=bus)}
+
+    def sweep():
+        return notification_system.sweep_deadlines(holder['pm'])
+
+
+    if once:
+        sweep()
+        notification_system.dispatcher.join()
+        notification_system.close()
+        return 0
+
+    def reload(path):
+        pm = holder['pm']
+        if not pm.store.changed_externally():
+            return
+        if pm.store.supports_encoded_save:
+            pm.sync()  # Publishes data_reloaded when something changed
+            return
+        holder['pm'] = ProjectManager(data_file, bus=bus)
+        pm.close()
+        bus.publish('data_reloaded', file=data_file)
+
+    paths = [data_file] + ([data_file + "-wal"] if data_file.endswith(SQLITE_EXTENSIONS) else [])
+    watcher = FileWatcher(paths, reload).start()
+    notification_system.start_dispatcher()
+    scheduler = DeadlineScheduler(sweep, lambda: holder['pm'].active_deadlines(),
+                                  lambda project_id: holder['pm'].active_deadline(project_id),
+                                  notification_system.threshold_crossings, bus).start()
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+    print(f"⏰ Watching deadlines in {data_file} ({watcher.mode}); Ctrl+C to stop")
+    try:
+        while not stopped.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    scheduler.stop()
+    watcher.stop()
+    holder['pm'].close()
+    notification_system.close(timeout=5)
+    return 0
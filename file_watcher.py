@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+File change watcher for the Project Manager web interface
+Uses Linux inotify when available and falls back to polling os.stat()
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+
+# inotify event masks (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_inotify():
+    """Return libc when it provides inotify, otherwise None"""
+    library = ctypes.util.find_library('c')
+    if not library:
+        return None
+    try:
+        libc = ctypes.CDLL(library, use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def file_signature(path: str):
+    """Identity of a file's current contents: (inode, size, mtime) or None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class FileWatcher:
+    """Calls ``callback(path)`` from a background thread when a watched file changes.
+
+    Directories are watched rather than the files themselves so that files
+    replaced with ``os.replace`` (atomic saves) keep being tracked. Bursts of
+    events for the same file are debounced into a single callback.
+    """
+
+    def __init__(self, paths: Iterable[str], callback: Callable[[str], None],
+                 poll_interval: float = 1.0, debounce: float = 0.1, use_inotify: bool = True):
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self._libc = _load_inotify() if use_inotify else None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.mode = 'inotify' if self._libc else 'polling'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="FileWatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        if self._libc is not None:
+            try:
+                self._watch_inotify()
+                return
+            except OSError as e:
+                logging.warning(f"inotify unavailable ({e}), falling back to polling")
+                self.mode = 'polling'
+        self._watch_polling()
+
+    def _notify(self, path: str):
+        try:
+            self.callback(path)
+        except Exception as e:
+            logging.error(f"Error handling change to {path}: {e}")
+
+    def _watch_polling(self):
+        signatures = {path: file_signature(path) for path in self.paths}
+        while not self._stop.wait(self.poll_interval):
+            for path in self.paths:
+                signature = file_signature(path)
+                if signature != signatures[path]:
+                    signatures[path] = signature
+                    self._notify(path)
+
+    def _watch_inotify(self):
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        try:
+            directories = {}
+            mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            for path in self.paths:
+                directory = os.path.dirname(path)
+                if directory not in directories.values():
+                    wd = self._libc.inotify_add_watch(fd, directory.encode(), mask)
+                    if wd < 0:
+                        raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+                    directories[wd] = directory
+
+            while not self._stop.is_set():
+                readable, _, _ = select.select([fd], [], [], self.poll_interval)
+                if not readable:
+                    continue
+                changed = self._read_events(fd, directories)
+                # Let the writer finish its burst (write + rename) before reporting
+                deadline = time.monotonic() + self.debounce
+                remaining = self.debounce
+                while remaining > 0:
+                    if select.select([fd], [], [], remaining)[0]:
+                        changed |= self._read_events(fd, directories)
+                    remaining = deadline - time.monotonic()
+                for path in self.paths:
+                    if path in changed:
+                        self._notify(path)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read_events(fd: int, directories) -> set:
+        changed = set()
+        try:
+            buffer = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            wd, _, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            if wd in directories and name:
+                changed.add(os.path.join(directories[wd], name))
+        return changed
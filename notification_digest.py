@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Deadline digests for the notification system
+Approaching and overdue deadlines are collected into one message per
+recipient, and a persisted sent-log keeps the same reminder from going out twice
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+OVERDUE = 'overdue'
+
+
+def deadline_threshold(days_left: int, thresholds: Iterable[int]) -> Optional[str]:
+    """The reminder threshold a deadline ``days_left`` days away has crossed, if any.
+
+    ``thresholds`` are days before the deadline, e.g. ``[3, 1, 0]``: a
+    deadline 2 days away has crossed "3", one tomorrow "1", and one in
+    the past ``OVERDUE``.
+    """
+    if days_left < 0:
+        return OVERDUE
+    for threshold in sorted(thresholds):
+        if days_left <= threshold:
+            return str(threshold)
+    return None
+
+
+def reminder_times(deadlines: Iterable[float], thresholds: Iterable[int], now: float) -> List[float]:
+    """Times after ``now`` at which deadlines (timestamps) cross a reminder threshold.
+
+    Days left are rounded down, so threshold ``t`` is crossed once less than
+    ``t + 1`` days are left; a second is added to land past the boundary.
+    """
+    offsets = [(threshold + 1) * 86400 - 1 for threshold in set(thresholds)] + [-1]
+    return [at - offset for at in deadlines for offset in offsets if at - offset > now]
+
+
+class SentLog:
+    """Deadline reminders already sent, keyed by (project id, deadline, threshold).
+
+    A project is reminded once per threshold it crosses; moving its deadline
+    starts over. Entries older than ``retention_days`` are dropped on save.
+    """
+
+    def __init__(self, path: str, retention_days: int = 90):
+        self.path = path
+        self.retention_days = retention_days
+        self.sent: Dict[str, str] = {}
+        self.last_digest: Optional[str] = None
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def _key(key: Tuple[str, str, str]) -> str:
+        return json.dumps(list(key))
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.sent = data.get('sent', {})
+            self.last_digest = data.get('last_digest')
+        except (IOError, ValueError) as e:
+            logging.error(f"Error loading notification sent-log {self.path}: {e}")
+
+    def was_sent(self, key: Tuple[str, str, str]) -> bool:
+        with self._lock:
+            return self._key(key) in self.sent
+
+    def mark_sent(self, keys: List[Tuple[str, str, str]], digest: bool = False):
+        """Record reminders as sent (and a digest sent now) and save the log"""
+        now = datetime.now()
+        with self._lock:
+            for key in keys:
+                self.sent[self._key(key)] = now.isoformat()
+            if digest:
+                self.last_digest = now.isoformat()
+            cutoff = (now - timedelta(days=self.retention_days)).isoformat()
+            self.sent = {key: sent_at for key, sent_at in self.sent.items() if sent_at >= cutoff}
+            data = {'sent': self.sent, 'last_digest': self.last_digest}
+            temp_file = self.path + ".tmp"
+            try:
+                with open(temp_file, 'w') as f:
+                    json.dump(data, f, indent=2)
+                os.replace(temp_file, self.path)
+            except IOError as e:
+                logging.error(f"Error saving notification sent-log {self.path}: {e}")
+
+    def next_digest_at(self, period_hours: float) -> Optional[datetime]:
+        """When the next digest may go out; None if it may go out now"""
+        with self._lock:
+            if self.last_digest is None:
+                return None
+            next_digest = datetime.fromisoformat(self.last_digest) + timedelta(hours=period_hours)
+            return next_digest if next_digest > datetime.now() else None
+
+
+def _describe(item: Dict) -> str:
+    if item['days_left'] < 0:
+        return f"overdue by {-item['days_left']} day{'s' if item['days_left'] != -1 else ''}"
+    if item['days_left'] == 0:
+        return "due today"
+    return f"due in {item['days_left']} day{'s' if item['days_left'] != 1 else ''}"
+
+
+def build_digest(items: List[Dict]) -> Tuple[str, str, str, str]:
+    """Subject, text body, HTML body and SMS text of a digest.
+
+    ``items`` are dicts of ``name``, ``deadline`` and ``days_left``.
+    """
+    items = sorted(items, key=lambda item: item['days_left'])
+    overdue = sum(1 for item in items if item['days_left'] < 0)
+    counts = ", ".join(part for part in (f"{overdue} overdue" if overdue else "",
+                                         f"{len(items) - overdue} due soon" if len(items) > overdue else "") if part)
+    subject = f"⏰ Deadline Digest: {counts}"
+
+    lines = "\n".join(f"- {item['name']}: {_describe(item)} ({item['deadline']})" for item in items)
+    body = f"""
+Project Manager Deadline Digest
+
+{lines}
+
+Please ensure all tasks are completed on time.
+
+---
+Project Manager System
+"""
+
+    rows = "\n".join(
+        f"""        <tr><td style="padding: 6px;">{item['name']}</td><td style="padding: 6px;">{item['deadline']}</td>"""
+        f"""<td style="padding: 6px; color: {'#ef4444' if item['days_left'] < 0 else '#f59e0b'}; font-weight: bold;">"""
+        f"""{_describe(item)}</td></tr>"""
+        for item in items)
+    html_body = f"""
+<html>
+<body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+    <div style="background: linear-gradient(135deg, #f59e0b, #d97706); color: white; padding: 20px; text-align: center;">
+        <h2>⏰ Deadline Digest</h2>
+        <p>{counts}</p>
+    </div>
+    <div style="padding: 20px; background: #f8f9fa;">
+        <table style="width: 100%; border-collapse: collapse;">
+{rows}
+        </table>
+        <div style="text-align: center; margin-top: 20px;">
+            <a href="http://localhost:8083" style="background: #4f46e5; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">View Projects</a>
+        </div>
+    </div>
+    <div style="text-align: center; padding: 10px; color: #6b7280; font-size: 12px;">
+        Project Manager System
+    </div>
+</body>
+</html>
+"""
+
+    sms_message = f"Project Manager: {counts}: " + ", ".join(
+        f"{item['name']} ({_describe(item)})" for item in items)
+    if len(sms_message) > 160:
+        sms_message = sms_message[:157] + "..."
+    return subject, body, html_body, sms_message
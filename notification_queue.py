@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Asynchronous dispatch of notifications
+Deliveries are queued, written to a spool file and sent by a small pool of
+worker threads, so whoever triggers a notification never waits for SMTP or SMS
+"""
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Spools of several processes (and queues) sit side by side, see NotificationSpool
+try:
+    import fcntl
+    FILE_LOCKING_AVAILABLE = True
+except ImportError:
+    FILE_LOCKING_AVAILABLE = False
+
+_spool_numbers = itertools.count(1)
+
+
+class NotificationSpool:
+    """Append-only log of the deliveries one queue has taken on.
+
+    Each line is ``{"op": "put", "job": {...}}`` or ``{"op": "done", "id": ...}``.
+    Every queue writes its own file, ``<path>.<pid>-<n>``, and holds an
+    ``fcntl`` lock on it while running. A new queue claims the files whose
+    queue is gone and sends the jobs put there but not done. Without
+    ``fcntl`` the spool is ``path`` itself and only one process may use it.
+    """
+
+    def __init__(self, path: str):
+        self.base = path
+        if not FILE_LOCKING_AVAILABLE:
+            self.path = path
+            self._file = open(path, 'a')
+            return
+        self.path = f"{path}.{os.getpid()}-{next(_spool_numbers)}"
+        # Locked before it gets its name, so no other queue ever claims it
+        temp_file = self.path + ".tmp"
+        self._file = open(temp_file, 'a')
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        os.replace(temp_file, self.path)
+
+    def append(self, record: Dict, sync: bool = False):
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def truncate(self):
+        """Forget every record; called once all jobs put were done"""
+        self._file.truncate(0)
+
+    def close(self):
+        """Stop writing; the file is removed unless jobs are left in it"""
+        if not self._file.closed:
+            if not pending_jobs(self.path):
+                os.remove(self.path)
+            self._file.close()
+
+    def claim(self) -> List[Dict]:
+        """Take over the jobs pending in spools no queue is running on, oldest first"""
+        if not FILE_LOCKING_AVAILABLE:
+            jobs = pending_jobs(self.path)
+            self.truncate()
+            self._put(jobs)
+            return jobs
+        jobs = []
+        for path in self._leftovers():
+            try:
+                f = open(path, 'r')
+            except FileNotFoundError:
+                continue
+            with f:
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    continue  # Its queue is still running
+                # Another queue may have claimed and removed it in the meantime
+                try:
+                    if os.stat(path).st_ino != os.fstat(f.fileno()).st_ino:
+                        continue
+                except FileNotFoundError:
+                    continue
+                claimed = pending_jobs(path)
+                self._put(claimed)
+                os.remove(path)
+            jobs.extend(claimed)
+        return jobs
+
+    def _put(self, jobs: List[Dict]):
+        for job in jobs:
+            self.append({'op': 'put', 'job': job})
+        if jobs:
+            os.fsync(self._file.fileno())
+
+    def _leftovers(self) -> List[str]:
+        """Spool files of this base other than our own, including one from before spools were per queue"""
+        directory = os.path.dirname(self.base) or '.'
+        pattern = re.compile(re.escape(os.path.basename(self.base)) + r'(\.\d+-\d+)?$')
+        paths = [os.path.join(directory, name) for name in os.listdir(directory) if pattern.match(name)]
+        paths = [path for path in paths if path != self.path]
+        return sorted(paths, key=lambda path: os.stat(path).st_mtime if os.path.exists(path) else 0)
+
+
+def pending_jobs(path: str) -> List[Dict]:
+    """Jobs put in the spool file at path but never marked done, oldest first"""
+    jobs = {}
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                if record['op'] == 'put':
+                    jobs[record['job']['id']] = record['job']
+                elif record['op'] == 'done':
+                    jobs.pop(record['id'], None)
+            except (json.JSONDecodeError, KeyError, TypeError):
+                # A crash mid-append leaves a partial last line behind
+                logging.warning(f"Skipping corrupt spool record {line_number} in {path}")
+    return list(jobs.values())
+
+
+class NotificationQueue:
+    """Bounded queue of deliveries worked off by ``workers`` threads.
+
+    ``deliver(job)`` is called with dicts of ``id``, ``channel``, ``payload``
+    and ``queued_at`` (plus the ``meta`` given to submit(), if any), and
+    returns whether the delivery succeeded. Given
+    ``deliver_batch(jobs)``, workers instead take up to ``batch_size``
+    queued jobs of one channel at a time and get a list of results back.
+    At most ``max_pending`` deliveries wait at a time; submit() waits up to
+    ``full_timeout`` seconds for room and then drops the delivery.
+    """
+
+    def __init__(self, deliver: Callable[[Dict], bool], spool_file: Optional[str] = None,
+                 workers: int = 2, max_pending: int = 500, full_timeout: float = 1.0,
+                 deliver_batch: Optional[Callable[[List[Dict]], List[bool]]] = None, batch_size: int = 1):
+        self.deliver = deliver
+        self.deliver_batch = deliver_batch
+        self.batch_size = max(1, batch_size) if deliver_batch is not None else 1
+        self.spool = NotificationSpool(spool_file) if spool_file else None
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.full_timeout = full_timeout
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue = deque()
+        # Jobs taken by a worker and not handled yet, by id
+        self._sending: Dict[str, Dict] = {}
+        self._closed = False
+        self._threads = []
+        self._cond = threading.Condition()
+        if self.spool is not None:
+            # Deliveries left over by queues that stopped go out first
+            jobs = self.spool.claim()
+            self._queue.extend(jobs)
+            if jobs:
+                logging.info(f"Resuming {len(jobs)} spooled notifications in {self.spool.path}")
+                self._start_workers()
+
+    @property
+    def pending(self) -> int:
+        """Deliveries queued or being sent"""
+        with self._cond:
+            return len(self._queue) + len(self._sending)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {'pending': len(self._queue) + len(self._sending), 'workers': self.workers,
+                    'delivered': self.delivered, 'failed': self.failed, 'dropped': self.dropped}
+
+    def jobs(self) -> List[Dict]:
+        """The deliveries queued or being sent"""
+        with self._cond:
+            return list(self._sending.values()) + list(self._queue)
+
+    def submit(self, channel: str, meta: Optional[Dict] = None, **payload) -> bool:
+        """Queue a delivery on ``channel``; False if it was dropped.
+
+        ``meta`` is kept with the job (and spooled with it) for the deliver callbacks.
+        """
+        job = {'id': uuid.uuid4().hex, 'channel': channel, 'payload': payload,
+               'queued_at': datetime.now().isoformat()}
+        if meta is not None:
+            job['meta'] = meta
+        with self._cond:
+            has_room = self._cond.wait_for(
+                lambda: self._closed or len(self._queue) < self.max_pending, self.full_timeout)
+            if self._closed or not has_room:
+                self.dropped += 1
+                logging.warning(f"Notification queue full, dropping {channel} notification")
+                return False
+            if self.spool is not None:
+                try:
+                    self.spool.append({'op': 'put', 'job': job}, sync=True)
+                except (IOError, OSError) as e:
+                    logging.error(f"Error spooling notification to {self.spool.path}: {e}")
+            self._queue.append(job)
+            self._start_workers()
+            self._cond.notify_all()
+        return True
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued delivery was handled; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._sending, timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop the workers once their current delivery is done.
+
+        Deliveries still queued stay in the spool and are sent after the next start.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        # A worker still sending records the outcome when it is done
+        if self.spool is not None and not any(thread.is_alive() for thread in self._threads):
+            self.spool.close()
+
+    def _start_workers(self):
+        # Called with self._cond held
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < min(self.workers, len(self._queue) + len(self._sending)):
+            thread = threading.Thread(target=self._work, name=f"NotificationWorker-{len(self._threads) + 1}",
+                                      daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                jobs = [self._queue.popleft()]
+                while (len(jobs) < self.batch_size and self._queue
+                       and self._queue[0]['channel'] == jobs[0]['channel']):
+                    jobs.append(self._queue.popleft())
+                self._sending.update((job['id'], job) for job in jobs)
+                self._cond.notify_all()  # Room for a waiting submit()
+            results = self._deliver(jobs)
+            with self._cond:
+                for job in jobs:
+                    del self._sending[job['id']]
+                self.delivered += sum(1 for success in results if success)
+                self.failed += sum(1 for success in results if not success)
+                if self.spool is not None:
+                    try:
+                        if not self._queue and not self._sending:
+                            self.spool.truncate()
+                        else:
+                            # Not synced: losing them in a crash only means sending some jobs twice
+                            for job in jobs:
+                                self.spool.append({'op': 'done', 'id': job['id']})
+                    except (IOError, OSError) as e:
+                        logging.error(f"Error updating notification spool {self.spool.path}: {e}")
+                self._cond.notify_all()
+
+    def _deliver(self, jobs: List[Dict]) -> List[bool]:
+        try:
+            if len(jobs) > 1:
+                return self.deliver_batch(jobs)
+            return [self.deliver(jobs[0])]
+        except Exception as e:
+            logging.error(f"Error delivering {jobs[0]['channel']} notifications: {e}")
+            return [False] * len(jobs)
@@ -7,14 +7,20 @@ Handles notifications for deadlines, completions, and system issues
 import json
 import os
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
+from circuit_breaker import CircuitBreaker, send_with_retry
+from notification_digest import SentLog, build_digest, deadline_threshold, reminder_times
+from notification_queue import NotificationQueue
+
 # Import email modules with fallback
 try:
-    import smtplib
-    from email.mime.text import MimeText
-    from email.mime.multipart import MimeMultipart
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    from smtp_pool import SMTPConnectionPool
     EMAIL_AVAILABLE = True
 except ImportError:
     EMAIL_AVAILABLE = False
@@ -33,6 +39,23 @@ class NotificationSystem:
         self.config_file = config_file
         self.config = self.load_config()
         self.logger = logging.getLogger(__name__)
+        # Deliveries queued by the notify_* methods are written here until sent
+        self.spool_file = config_file + ".spool"
+        self._dispatcher = None
+        self._dispatcher_lock = threading.Lock()
+        self._smtp_pool = None
+        self._smtp_pool_settings = None
+        # Deadline reminders already sent, so each goes out once
+        self.sent_log = SentLog(config_file + ".sent")
+        self._deadline_lock = threading.Lock()
+        # Set while due reminders wait for the next digest period (a timestamp)
+        self.digest_held_until = None
+        # Set while reminders are being delivered, to check again whether they went out
+        self.reminders_recheck_at = None
+        retry = self.config['retry']
+        self.breakers = {channel: CircuitBreaker(channel, retry.get('failure_threshold', 5),
+                                                 retry.get('reset_timeout', 60))
+                         for channel in ('email', 'sms')}
         
     def load_config(self) -> Dict:
         """Load notification configuration from file"""
@@ -49,18 +72,34 @@ class NotificationSystem:
                 "notify_deadlines": True,
                 "notify_completion": True,
                 "notify_errors": True,
-                "deadline_warning_days": 3
+                "deadline_warning_days": 3,
+                "deadline_digest": True,      # One message listing every due project
+                "digest_period_hours": 24     # At most one digest per period
             },
             "smtp": {
                 "server": "smtp.gmail.com",
                 "port": 587,
                 "username": "",
                 "password": "",  # Use app-specific password for Gmail
-                "use_tls": True
+                "use_tls": True,
+                "idle_timeout": 60       # Seconds an unused session is kept open
             },
             "sms_service": {
                 "provider": "textbelt",  # Free SMS service
                 "api_key": "textbelt"    # Default free key
+            },
+            "queue": {
+                "workers": 2,            # Threads sending notifications
+                "max_pending": 500,      # Deliveries waiting at most
+                "batch_size": 20,        # Emails a worker sends over one session in a row
+                "full_timeout": 1.0      # Seconds to wait for room before dropping one
+            },
+            "retry": {
+                "attempts": 3,           # Tries per delivery
+                "base_delay": 1.0,       # Seconds; doubles per retry, randomized
+                "max_delay": 30.0,
+                "failure_threshold": 5,  # Failed attempts in a row that cut a channel off
+                "reset_timeout": 60      # Seconds before a cut-off channel is tried again
             }
         }
         
@@ -106,47 +145,57 @@ class NotificationSystem:
             self.logger.error(f"Error updating settings: {e}")
             return False
     
+    @property
+    def smtp_pool(self) -> 'SMTPConnectionPool':
+        """Pool of SMTP sessions, replaced when the SMTP settings change"""
+        smtp = self.config['smtp']
+        settings = (smtp['server'], smtp['port'], smtp['username'], smtp['password'], smtp['use_tls'])
+        with self._dispatcher_lock:
+            if self._smtp_pool_settings != settings:
+                if self._smtp_pool is not None:
+                    self._smtp_pool.close()
+                self._smtp_pool = SMTPConnectionPool(
+                    *settings, max_connections=self.config['queue'].get('workers', 2),
+                    idle_timeout=smtp.get('idle_timeout', 60))
+                self._smtp_pool_settings = settings
+            return self._smtp_pool
+
+    def build_email(self, subject: str, body: str, html_body: str = None) -> 'MIMEMultipart':
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.config['smtp']['username']
+        msg['To'] = self.config['email']['address']
+        
+        # Add plain text part
+        msg.attach(MIMEText(body, 'plain'))
+        
+        # Add HTML part if provided
+        if html_body:
+            msg.attach(MIMEText(html_body, 'html'))
+        return msg
+
     def send_email(self, subject: str, body: str, html_body: str = None) -> bool:
         """Send email notification"""
+        return self.send_emails([{'subject': subject, 'body': body, 'html_body': html_body}])[0]
+
+    def send_emails(self, emails: List[Dict]) -> List[bool]:
+        """Send several emails (dicts of subject, body, html_body) over one pooled SMTP session"""
         if not EMAIL_AVAILABLE:
             self.logger.warning("Email not available - skipping email notification")
-            return False
+            return [False] * len(emails)
             
         if not self.config['email']['enabled'] or not self.config['email']['address']:
-            return False
+            return [False] * len(emails)
         
         try:
-            # Create message
-            msg = MimeMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = self.config['smtp']['username']
-            msg['To'] = self.config['email']['address']
-            
-            # Add plain text part
-            text_part = MimeText(body, 'plain')
-            msg.attach(text_part)
-            
-            # Add HTML part if provided
-            if html_body:
-                html_part = MimeText(html_body, 'html')
-                msg.attach(html_part)
-            
-            # Send email
-            with smtplib.SMTP(self.config['smtp']['server'], self.config['smtp']['port']) as server:
-                if self.config['smtp']['use_tls']:
-                    server.starttls()
-                
-                if self.config['smtp']['username'] and self.config['smtp']['password']:
-                    server.login(self.config['smtp']['username'], self.config['smtp']['password'])
-                
-                server.send_message(msg)
-            
-            self.logger.info(f"Email sent successfully: {subject}")
-            return True
-            
+            results = self.smtp_pool.send([self.build_email(**email) for email in emails])
         except Exception as e:
             self.logger.error(f"Error sending email: {e}")
-            return False
+            return [False] * len(emails)
+        for email, sent in zip(emails, results):
+            if sent:
+                self.logger.info(f"Email sent successfully: {email['subject']}")
+        return results
     
     def send_sms(self, message: str) -> bool:
         """Send SMS notification using TextBelt service"""
@@ -180,8 +229,104 @@ class NotificationSystem:
             self.logger.error(f"Error sending SMS: {e}")
             return False
     
-    def notify_deadline_approaching(self, project_name: str, deadline: str, days_left: int):
-        """Send notification for approaching deadline"""
+    @property
+    def dispatcher(self) -> NotificationQueue:
+        """Queue the notify_* methods hand their deliveries to, started on first use"""
+        return self._dispatcher or self.start_dispatcher()
+
+    def start_dispatcher(self) -> NotificationQueue:
+        """Start the dispatcher now, resuming notifications spooled by an earlier run"""
+        with self._dispatcher_lock:
+            if self._dispatcher is None:
+                queue_config = self.config['queue']
+                self._dispatcher = NotificationQueue(
+                    self.deliver, spool_file=self.spool_file,
+                    workers=queue_config.get('workers', 2),
+                    max_pending=queue_config.get('max_pending', 500),
+                    full_timeout=queue_config.get('full_timeout', 1.0),
+                    deliver_batch=self.deliver_batch, batch_size=queue_config.get('batch_size', 20))
+            return self._dispatcher
+
+    def enabled_channels(self) -> List[str]:
+        """Channels that are switched on and have a recipient"""
+        channels = []
+        if self.config['email']['enabled'] and self.config['email']['address']:
+            channels.append('email')
+        if self.config['sms']['enabled'] and self.config['sms']['phone']:
+            channels.append('sms')
+        return channels
+
+    def dispatch(self, subject: str, body: str, html_body: str = None, sms_message: str = None,
+                 reminders: Optional[Dict] = None):
+        """Queue an email and an SMS for the enabled channels and return at once.
+
+        ``reminders`` (``{'keys': [...], 'digest': bool}``) are recorded in the
+        sent-log once either delivery succeeds.
+        """
+        channels = self.enabled_channels()
+        meta = {'reminders': reminders} if reminders else None
+        if 'email' in channels:
+            self.dispatcher.submit('email', meta=meta, subject=subject, body=body, html_body=html_body)
+        if sms_message and 'sms' in channels:
+            self.dispatcher.submit('sms', meta=meta, message=sms_message)
+
+    def deliver(self, job: Dict) -> bool:
+        """Send one queued delivery (runs in a dispatcher worker)"""
+        return self.deliver_batch([job])[0]
+
+    def deliver_batch(self, jobs: List[Dict]) -> List[bool]:
+        """Send queued deliveries of one channel, retrying failures while its breaker allows"""
+        channel = jobs[0]['channel']
+        if channel not in self.breakers:
+            self.logger.warning(f"Unknown notification channel: {channel}")
+            return [False] * len(jobs)
+        # A channel switched off meanwhile is not a failing one
+        if channel not in self.enabled_channels():
+            return [False] * len(jobs)
+        retry = self.config['retry']
+        results = send_with_retry(lambda payloads: self._send(channel, payloads),
+                                  [job['payload'] for job in jobs], self.breakers[channel],
+                                  attempts=retry.get('attempts', 3), base_delay=retry.get('base_delay', 1.0),
+                                  max_delay=retry.get('max_delay', 30.0))
+        for job, success in zip(jobs, results):
+            reminders = job.get('meta', {}).get('reminders')
+            if success and reminders:
+                self.sent_log.mark_sent([tuple(key) for key in reminders['keys']], digest=reminders['digest'])
+        return results
+
+    def _reminders_in_flight(self):
+        """Keys of the reminders queued or being sent, and whether a digest is among them"""
+        keys, digest = set(), False
+        for job in self.dispatcher.jobs():
+            reminders = job.get('meta', {}).get('reminders')
+            if reminders:
+                keys.update(tuple(key) for key in reminders['keys'])
+                digest = digest or reminders['digest']
+        return keys, digest
+
+    def _send(self, channel: str, payloads: List[Dict]) -> List[bool]:
+        if channel == 'sms':
+            return [self.send_sms(**payload) for payload in payloads]
+        if len(payloads) == 1:
+            return [self.send_email(**payloads[0])]
+        return self.send_emails(payloads)
+
+    def status(self) -> Dict:
+        """Queue depth and per-channel breaker state for /api/system-status"""
+        queue = self._dispatcher.stats() if self._dispatcher is not None else {'pending': 0}
+        return {'queue': queue, 'channels': {channel: breaker.snapshot()
+                                             for channel, breaker in self.breakers.items()}}
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop the dispatcher; undelivered notifications stay spooled for the next start"""
+        if self._dispatcher is not None:
+            self._dispatcher.close(timeout)
+        if self._smtp_pool is not None:
+            self._smtp_pool.close()
+
+    def notify_deadline_approaching(self, project_name: str, deadline: str, days_left: int,
+                                    reminder_key: Optional[tuple] = None):
+        """Send notification for approaching deadline; reminder_key is recorded as sent once delivered"""
         if not self.config['preferences']['notify_deadlines']:
             return
         
@@ -224,8 +369,8 @@ Project Manager System
         
         sms_message = f"Project Manager Alert: {project_name} deadline in {days_left} days ({deadline})"
         
-        self.send_email(subject, body, html_body)
-        self.send_sms(sms_message)
+        reminders = {'keys': [reminder_key], 'digest': False} if reminder_key else None
+        self.dispatch(subject, body, html_body, sms_message, reminders=reminders)
     
     def notify_project_completed(self, project_name: str, completion_date: str):
         """Send notification for project completion"""
@@ -273,8 +418,7 @@ Project Manager System
         
         sms_message = f"Project Manager: {project_name} completed successfully! 🎉"
         
-        self.send_email(subject, body, html_body)
-        self.send_sms(sms_message)
+        self.dispatch(subject, body, html_body, sms_message)
     
     def notify_system_error(self, error_type: str, error_message: str, timestamp: str):
         """Send notification for system errors"""
@@ -321,33 +465,92 @@ Project Manager System
         
         sms_message = f"Project Manager Error: {error_type} at {timestamp}"
         
-        self.send_email(subject, body, html_body)
-        self.send_sms(sms_message)
+        self.dispatch(subject, body, html_body, sms_message)
     
-    def check_deadlines(self, projects: List):
-        """Check for approaching deadlines and send notifications"""
-        if not self.config['preferences']['notify_deadlines']:
-            return
+    def deadline_thresholds(self) -> List[int]:
+        """Days before a deadline at which its project is reminded of"""
+        prefs = self.config['preferences']
+        return prefs.get('deadline_thresholds') or [prefs.get('deadline_warning_days', 3), 1, 0]
+
+    def reminder_times(self, deadlines) -> List[float]:
+        """Future times at which the given deadline timestamps cross a reminder threshold"""
+        return reminder_times(deadlines, self.deadline_thresholds(), time.time())
+
+    def threshold_crossings(self, deadline: float) -> List[float]:
+        """Every time, past or future, at which a deadline timestamp crosses a reminder threshold"""
+        return reminder_times([deadline], self.deadline_thresholds(), float('-inf'))
+
+    def sweep_deadlines(self, pm) -> Optional[float]:
+        """Check pm's overdue and upcoming projects; returns when to check again, if before the next threshold.
+
+        That is when held reminders can go out, or when reminders being sent
+        now are checked for whether they went out.
+        """
+        self.check_deadlines(pm.overdue_projects() + pm.upcoming_deadlines(max(self.deadline_thresholds()) + 1))
+        times = [at for at in (self.digest_held_until, self.reminders_recheck_at) if at is not None]
+        return min(times) if times else None
+
+    def check_deadlines(self, projects: List) -> int:
+        """Check for approaching and overdue deadlines and send notifications.
+
+        ``projects`` can be all projects or just the candidates, e.g.
+        ``ProjectManager.overdue_projects() + ProjectManager.upcoming_deadlines(warning_days + 1)``.
+        Each project is reminded once per threshold (``deadline_thresholds``,
+        by default the warning days, 1 and 0 days before, and overdue). In
+        digest mode all reminders due go out as one message, at most once per
+        ``digest_period_hours``. Reminders count as sent once delivered;
+        undelivered ones are queued again by a later check, which
+        ``reminders_recheck_at`` asks for. Returns the number of projects
+        reminded of.
+        """
+        prefs = self.config['preferences']
+        # Nothing is recorded as sent while there is no one to send it to
+        if not prefs['notify_deadlines'] or not self.enabled_channels():
+            return 0
         
-        warning_days = self.config['preferences'].get('deadline_warning_days', 3)
-        today = datetime.now()
+        thresholds = self.deadline_thresholds()
         
-        for project in projects:
-            if not project.deadline:
-                continue
+        with self._deadline_lock:
+            self.digest_held_until = self.reminders_recheck_at = None
+            in_flight, digest_in_flight = self._reminders_in_flight()
+            due = []
+            for project in projects:
+                try:
+                    days_left = project.days_until_deadline()
+                    if days_left is None or project.is_completed():
+                        continue
+                    
+                    threshold = deadline_threshold(days_left, thresholds)
+                    key = (project.id, project.deadline, threshold)
+                    if threshold is not None and key not in in_flight and not self.sent_log.was_sent(key):
+                        due.append({'key': key, 'name': project.name, 'deadline': project.deadline,
+                                    'days_left': days_left})
+                except Exception as e:
+                    self.logger.error(f"Error checking deadline for {project.name}: {e}")
+            recheck_at = time.time() + self.config['retry'].get('reset_timeout', 60)
+            if in_flight:
+                self.reminders_recheck_at = recheck_at
+            if not due:
+                return 0
             
-            try:
-                deadline_date = datetime.fromisoformat(project.deadline.replace('Z', '+00:00'))
-                days_left = (deadline_date - today).days
-                
-                if 0 <= days_left <= warning_days:
-                    self.notify_deadline_approaching(
-                        project.name,
-                        project.deadline,
-                        days_left
-                    )
-            except Exception as e:
-                self.logger.error(f"Error checking deadline for {project.name}: {e}")
+            if not prefs.get('deadline_digest', True):
+                for item in due:
+                    self.notify_deadline_approaching(item['name'], item['deadline'], item['days_left'],
+                                                     reminder_key=item['key'])
+                self.reminders_recheck_at = recheck_at
+                return len(due)
+            
+            # Reminders that come due within a period, or while a digest is
+            # still being sent, wait for the next digest
+            if digest_in_flight:
+                return 0
+            next_digest = self.sent_log.next_digest_at(prefs.get('digest_period_hours', 24))
+            if next_digest is not None:
+                self.digest_held_until = next_digest.timestamp()
+                return 0
+            self.dispatch(*build_digest(due), reminders={'keys': [item['key'] for item in due], 'digest': True})
+            self.reminders_recheck_at = recheck_at
+            return len(due)
     
     def test_notifications(self) -> Dict:
         """Test notification system"""
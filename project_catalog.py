@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Catalog of the project files in a directory for the web file switcher
+Project counts and metadata are cached per file and only re-read, in a
+background thread, when a file's size or modification time changes
+"""
+import glob
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+from file_watcher import file_signature
+from project_store import SQLITE_EXTENSIONS, StoreError, read_summary
+
+
+PROJECT_FILE_PATTERNS = ('*.json',) + tuple(f'*{ext}' for ext in SQLITE_EXTENSIONS)
+
+
+class ProjectFileCatalog:
+    """Cached summaries (see project_store.read_summary) of the project files in ``directory``.
+
+    ``entries()`` only lists and stats the files. Files that are new or whose
+    signature changed are summarized by a worker thread, which bumps
+    ``generation`` and calls ``on_update(generation)`` once the cache changed.
+    """
+
+    def __init__(self, directory: str = '.', on_update: Optional[Callable[[int], None]] = None):
+        self.directory = directory
+        self.on_update = on_update
+        self.generation = 0
+        # file name -> (signature, summary or {'error': ...})
+        self._cache: Dict[str, tuple] = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+
+    def file_names(self) -> List[str]:
+        names = set()
+        for pattern in PROJECT_FILE_PATTERNS:
+            names.update(os.path.basename(p) for p in glob.glob(os.path.join(self.directory, pattern)))
+        return sorted(names)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def signatures(self) -> tuple:
+        """(name, signature) of every project file; changes whenever a file does"""
+        return tuple((name, file_signature(self._path(name))) for name in self.file_names())
+
+    def entries(self, live: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+        """One dict per file: name, size, stale and the cached summary fields.
+
+        ``live`` maps file names to summaries that are already known (the open
+        file), which are used as they are. Files never summarized yet have
+        ``projects`` set to None until the worker has read them.
+        """
+        live = live or {}
+        entries, stale = [], []
+        with self._lock:
+            signatures = self.signatures()
+            for name in set(self._cache) - {name for name, _ in signatures}:
+                del self._cache[name]
+            for name, signature in signatures:
+                cached = self._cache.get(name)
+                if name in live:
+                    summary, is_stale = live[name], False
+                elif cached is None:
+                    summary, is_stale = {'projects': None}, True
+                else:
+                    summary, is_stale = cached[1], cached[0] != signature
+                if is_stale:
+                    stale.append(name)
+                entries.append(dict(summary, name=name, size=signature[1] if signature else 0,
+                                    stale=is_stale))
+            if stale:
+                self._pending.update(stale)
+                self._start_worker()
+                self._wake.notify()
+        return entries
+
+    def refresh(self, names: Optional[List[str]] = None) -> bool:
+        """Summarize the given files (all by default) now; True if the cache changed"""
+        changed = False
+        for name in names if names is not None else self.file_names():
+            path = self._path(name)
+            signature = file_signature(path)
+            if signature is None:
+                continue
+            with self._lock:
+                cached = self._cache.get(name)
+            if cached is not None and cached[0] == signature:
+                continue
+            try:
+                summary = read_summary(path)
+            except StoreError as e:
+                summary = {'projects': 0, 'error': str(e)}
+            # A file written while it was read is left stale for the next pass
+            if file_signature(path) != signature:
+                continue
+            with self._lock:
+                self._cache[name] = (signature, summary)
+            changed = True
+        if changed:
+            with self._lock:
+                self.generation += 1
+                generation = self.generation
+            if self.on_update is not None:
+                self.on_update(generation)
+        return changed
+
+    def _start_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="project-file-catalog", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wake.wait()
+                names = sorted(self._pending)
+                self._pending.clear()
+            try:
+                self.refresh(names)
+            except Exception as e:
+                logging.error(f"Error refreshing the project file catalog: {e}")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Bulk import of NDJSON exports (see web_app.export_records)
+Records are read, parsed and validated one line at a time; nothing is applied
+until the whole stream has been checked, and then everything is saved at once
+"""
+import json
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Longest record accepted, in bytes; guards against input without newlines
+MAX_RECORD_BYTES = 16 * 1024 * 1024
+# Errors listed in a report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+READ_SIZE = 64 * 1024
+RECORD_KINDS = ('category', 'template', 'project')
+# Names used for the counts in the export trailer and import reports
+PLURALS = {'category': 'categories', 'template': 'templates', 'project': 'projects'}
+
+
+class ImportReport:
+    """Outcome of an import: records seen per kind, errors by line number"""
+
+    def __init__(self):
+        self.counts = {kind: 0 for kind in RECORD_KINDS}
+        self.imported = {kind: 0 for kind in RECORD_KINDS}
+        self.skipped = 0
+        self.errors: List[Dict] = []
+        self.error_count = 0
+        self.committed = False
+
+    def error(self, line: Optional[int], message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'error': message})
+
+    def to_dict(self) -> Dict:
+        return {
+            'committed': self.committed,
+            'imported_counts': {PLURALS[kind]: n for kind, n in self.imported.items()},
+            'skipped': self.skipped,
+            'error_count': self.error_count,
+            'errors': self.errors
+        }
+
+
+def iter_lines(stream, read_size: int = READ_SIZE) -> Iterator[bytes]:
+    """Lines of a binary stream, gunzipped on the fly when it starts with the gzip magic"""
+    decompressor = None
+    pending = b''
+    first = True
+    while True:
+        chunk = stream.read(read_size)
+        if first:
+            first = False
+            if chunk[:2] == b'\x1f\x8b':
+                decompressor = zlib.decompressobj(31)
+        if not chunk:
+            break
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        pending += chunk
+        *lines, pending = pending.split(b'\n')
+        yield from lines
+        if len(pending) > MAX_RECORD_BYTES:
+            raise ValueError(f"Record longer than {MAX_RECORD_BYTES} bytes")
+    if decompressor is not None:
+        pending += decompressor.flush()
+        *lines, pending = pending.split(b'\n')
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _require(data: Dict, field: str, kind: type = str):
+    if not isinstance(data.get(field), kind):
+        raise ValueError(f"'{field}' must be a {kind.__name__}")
+
+
+def build_project(pm, data):
+    _require(data, 'id')
+    _require(data, 'name')
+    if not data['name'].strip():
+        raise ValueError("'name' must not be empty")
+    _require(data, 'stages', list)
+    for stage in data['stages']:
+        if not isinstance(stage, dict) or not isinstance(stage.get('tasks'), list):
+            raise ValueError("every stage needs a 'tasks' list")
+    return pm.project_class.from_dict(data)
+
+
+def build_category(pm, data):
+    _require(data, 'id')
+    _require(data, 'name')
+    return pm.category_class.from_dict(data)
+
+
+def build_template(pm, data):
+    _require(data, 'id')
+    _require(data, 'name')
+    _require(data, 'stages', list)
+    return data
+
+
+BUILDERS = {'project': build_project, 'category': build_category, 'template': build_template}
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, KeyError):
+        return f"missing field {error}"
+    return str(error)
+
+
+def import_ndjson(pm, lines: Iterable[bytes], kinds=RECORD_KINDS, atomic: bool = True) -> ImportReport:
+    """Validate NDJSON export records and apply them to pm with a single save.
+
+    Records of other kinds than ``kinds`` are skipped. With atomic set, any
+    error leaves pm untouched; otherwise the valid records are still applied.
+    """
+    report = ImportReport()
+    staged = []
+    header = expected = None
+    line_number = 0
+    try:
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                report.error(line_number, f"Invalid JSON: {e}")
+                continue
+            if isinstance(record, dict) and 'export' in record:
+                header = record
+                if record.get('format') != 1:
+                    report.error(line_number, f"Unsupported export format {record.get('format')!r}")
+                continue
+            if not isinstance(record, dict) or len(record) != 1:
+                report.error(line_number, "Expected an object with a single record key")
+                continue
+            (kind, data), = record.items()
+            if kind == 'end':
+                expected = data
+                continue
+            if kind not in BUILDERS:
+                report.error(line_number, f"Unknown record type '{kind}'")
+                continue
+            report.counts[kind] += 1
+            if kind not in kinds:
+                report.skipped += 1
+                continue
+            try:
+                if not isinstance(data, dict):
+                    raise ValueError("record must be an object")
+                staged.append((kind, BUILDERS[kind](pm, data)))
+            except (KeyError, TypeError, ValueError) as e:
+                report.error(line_number, f"Invalid {kind}: {_describe(e)}")
+    except (OSError, ValueError, zlib.error) as e:
+        report.error(line_number + 1, f"Could not read input: {e}")
+
+    # The trailer of an export tells whether the stream arrived complete
+    if header is not None and expected is None:
+        report.error(None, "Export is incomplete: its end record is missing")
+    if isinstance(expected, dict):
+        for kind in RECORD_KINDS:
+            want = expected.get(PLURALS[kind])
+            if want is not None and want != report.counts[kind]:
+                report.error(None, f"Expected {want} {kind} records, found {report.counts[kind]}")
+
+    if report.error_count and atomic:
+        return report
+    # Only applying needs the manager to itself; reading and validating didn't
+    with pm.lock.write():
+        for kind, item in staged:
+            if kind == 'project':
+                pm.register_project(item)
+            elif kind == 'category':
+                pm.categories[item.id] = item
+            else:
+                pm.templates[item['id']] = item
+            report.imported[kind] += 1
+        if staged:
+            pm.save_data()
+    report.committed = True
+    return report
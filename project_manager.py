@@ -1,11 +1,23 @@
 #!/usr/bin/env python3
+import bisect
+import itertools
 import json
+import math
 import os
-from datetime import datetime
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import List, Dict, Optional
+from fractions import Fraction
+from functools import lru_cache, wraps
+from typing import Any, List, Dict, Optional, Set, Tuple
 import uuid
 
+from change_bus import ChangeBus
+from project_store import ProjectStore, StoreError, open_store
+from rw_lock import RWLock
+
 
 class TaskStatus(Enum):
     TODO = "todo"
@@ -20,7 +32,70 @@ class StageStatus(Enum):
     COMPLETED = "completed"
 
 
-class Category:
+# Counter tuples of an empty stage/project, see Stage._counters() and Project._counters().
+# Progress is kept as an exact Fraction so that running totals never drift;
+# it is converted to float only when read.
+EMPTY_STAGE_COUNTERS = (0, 0, 0, Fraction(0))
+EMPTY_PROJECT_COUNTERS = (0, 0, 0, 0, 0, 0, Fraction(0))
+
+
+def project_sort_key(project) -> Tuple[str, str]:
+    """Stable listing order of projects: creation time, then id"""
+    return (project.created_at or '', project.id)
+
+
+def parse_deadline(deadline: Optional[str]) -> Optional[float]:
+    """Epoch seconds of an ISO deadline (naive values are local time), None if unset or invalid"""
+    if not deadline:
+        return None
+    try:
+        return datetime.fromisoformat(deadline.replace('Z', '+00:00')).timestamp()
+    except (ValueError, TypeError, AttributeError, OverflowError, OSError):
+        return None
+
+
+def stage_counters(total: int, completed: int, is_completed: bool) -> tuple:
+    """(total tasks, completed tasks, stage completed, progress) of one stage"""
+    if total:
+        progress = Fraction(completed, total)
+    else:
+        progress = Fraction(int(is_completed))
+    return total, completed, int(is_completed), progress
+
+
+def project_counters(stage_total: int, stage_completed: int, task_total: int,
+                     task_completed: int, progress_total: Fraction) -> tuple:
+    """Contribution of one project to the manager-wide summary"""
+    is_completed = stage_completed == stage_total
+    if stage_total:
+        progress = progress_total / stage_total
+    else:
+        progress = Fraction(int(is_completed))
+    return (1, int(is_completed), task_total, task_completed,
+            stage_total, stage_completed, progress)
+
+
+def raw_project_counters(data: Dict) -> tuple:
+    """project_counters() of a project given as its to_dict() dict"""
+    stage_completed = task_total = task_completed = 0
+    progress_total = Fraction(0)
+    for stage_data in data.get('stages', []):
+        tasks = stage_data['tasks']
+        completed = sum(1 for task_data in tasks if task_data['status'] == TaskStatus.COMPLETED.value)
+        _, _, stage_done, progress = stage_counters(
+            len(tasks), completed, stage_data['status'] == StageStatus.COMPLETED.value)
+        task_total += len(tasks)
+        task_completed += completed
+        stage_completed += stage_done
+        progress_total += progress
+    return project_counters(len(data.get('stages', [])), stage_completed,
+                            task_total, task_completed, progress_total)
+
+
+class BaseCategory:
+    """Category behaviour shared by Category and CompactCategory"""
+    __slots__ = ()
+
     def __init__(self, name: str, description: str = "", color: str = "#007bff"):
         self.id = str(uuid.uuid4())
         self.name = name
@@ -45,19 +120,71 @@ class Category:
         return category
 
 
-class Task:
+class Category(BaseCategory):
+    pass
+
+
+class BaseTask:
+    """Task behaviour shared by Task and CompactTask"""
+    __slots__ = ()
+
     def __init__(self, name: str, description: str = "", assignee: str = ""):
+        self._stage: Optional['Stage'] = None
         self.id = str(uuid.uuid4())
         self.name = name
         self.description = description
-        self.assignee = assignee
-        self.status = TaskStatus.TODO
+        self._assignee = intern_text(assignee)
+        self._status = TaskStatus.TODO
         self.created_at = datetime.now().isoformat()
         self.completed_at = None
+        self._dirty = True
+
+    def _get_manager(self) -> Optional['ProjectManager']:
+        stage = self._stage
+        project = stage._project if stage is not None else None
+        return project._manager if project is not None else None
+
+    @property
+    def assignee(self) -> str:
+        return self._assignee
+
+    @assignee.setter
+    def assignee(self, assignee: str):
+        old_assignee, self._assignee = self._assignee, intern_text(assignee)
+        if old_assignee == assignee:
+            return
+        self.mark_dirty()
+        manager = self._get_manager()
+        if manager is not None:
+            manager._task_field_changed(self, 'assignee', old_assignee, assignee)
+
+    @property
+    def status(self) -> TaskStatus:
+        return self._status
+
+    @status.setter
+    def status(self, status: TaskStatus):
+        old_status, self._status = self._status, status
+        if old_status == status:
+            return
+        self.mark_dirty()
+        # Keep the stage's completed-task counter in step
+        if self._stage is not None and TaskStatus.COMPLETED in (old_status, status):
+            self._stage._task_completion_changed(1 if status == TaskStatus.COMPLETED else -1)
+        manager = self._get_manager()
+        if manager is not None:
+            manager._task_field_changed(self, 'status', old_status, status)
+
+    def mark_dirty(self):
+        """Flag the task (and its stage and project) as changed since the last save"""
+        self._dirty = True
+        if self._stage is not None:
+            self._stage.mark_dirty()
 
     def complete(self):
         self.status = TaskStatus.COMPLETED
         self.completed_at = datetime.now().isoformat()
+        self.mark_dirty()
 
     def to_dict(self):
         return {
@@ -80,24 +207,82 @@ class Task:
         return task
 
 
-class Stage:
+class Task(BaseTask):
+    pass
+
+
+class BaseStage:
+    """Stage behaviour shared by Stage and CompactStage"""
+    __slots__ = ()
+    # Class used for the stage's tasks
+    task_class = None
+
     def __init__(self, name: str, description: str = "", default_tasks: List[str] = None):
         self.id = str(uuid.uuid4())
         self.name = name
         self.description = description
-        self.status = StageStatus.NOT_STARTED
+        self._status = StageStatus.NOT_STARTED
         self.tasks: List[Task] = []
         self.created_at = datetime.now().isoformat()
         self.started_at = None
         self.completed_at = None
+        self._project: Optional['Project'] = None
+        self._dirty = True
+        # Number of tasks in self.tasks with status COMPLETED
+        self._completed_tasks = 0
         
         if default_tasks:
             for task_name in default_tasks:
-                default_task = Task(task_name, f"Default task for {name} stage")
-                self.tasks.append(default_task)
+                default_task = self.task_class(task_name, f"Default task for {name} stage")
+                self.attach_task(default_task)
 
-    def add_task(self, task: Task):
+    @property
+    def status(self) -> StageStatus:
+        return self._status
+
+    @status.setter
+    def status(self, status: StageStatus):
+        if status == self._status:
+            return
+        before = self._counters()
+        self._status = status
+        self.mark_dirty()
+        self._counters_changed(before)
+
+    def mark_dirty(self):
+        self._dirty = True
+        if self._project is not None:
+            self._project.mark_dirty()
+
+    def _counters(self) -> tuple:
+        return stage_counters(len(self.tasks), self._completed_tasks, self._status == StageStatus.COMPLETED)
+
+    def _counters_changed(self, before: tuple):
+        if self._project is not None:
+            self._project._stage_counters_changed(before, self._counters())
+
+    def _task_completion_changed(self, delta: int):
+        before = self._counters()
+        self._completed_tasks += delta
+        self._counters_changed(before)
+
+    def _recount(self):
+        self._completed_tasks = sum(1 for task in self.tasks if task.status == TaskStatus.COMPLETED)
+
+    def attach_task(self, task: Task):
+        """Append a task without starting the stage"""
+        before = self._counters()
+        task._stage = self
         self.tasks.append(task)
+        if task.status == TaskStatus.COMPLETED:
+            self._completed_tasks += 1
+        self.mark_dirty()
+        self._counters_changed(before)
+        if self._project is not None:
+            self._project._task_attached(self, task)
+
+    def add_task(self, task: Task):
+        self.attach_task(task)
         if self.status == StageStatus.NOT_STARTED:
             self.start()
 
@@ -105,6 +290,7 @@ class Stage:
         if self.status == StageStatus.NOT_STARTED:
             self.status = StageStatus.IN_PROGRESS
             self.started_at = datetime.now().isoformat()
+            self.mark_dirty()
 
     def complete(self):
         incomplete_tasks = [t for t in self.tasks if t.status != TaskStatus.COMPLETED]
@@ -113,13 +299,11 @@ class Stage:
         
         self.status = StageStatus.COMPLETED
         self.completed_at = datetime.now().isoformat()
+        self.mark_dirty()
         return True, "Stage completed successfully"
 
     def get_progress(self):
-        if not self.tasks:
-            return 1.0 if self.status == StageStatus.COMPLETED else 0.0
-        completed = sum(1 for task in self.tasks if task.status == TaskStatus.COMPLETED)
-        return completed / len(self.tasks)
+        return float(self._counters()[3])
 
     def to_dict(self):
         return {
@@ -138,26 +322,115 @@ class Stage:
         stage = cls(data['name'], data['description'])
         stage.id = data['id']
         stage.status = StageStatus(data['status'])
-        stage.tasks = [Task.from_dict(task_data) for task_data in data['tasks']]
+        stage.tasks = [cls.task_class.from_dict(task_data) for task_data in data['tasks']]
+        for task in stage.tasks:
+            task._stage = stage
+        stage._recount()
         stage.created_at = data['created_at']
         stage.started_at = data['started_at']
         stage.completed_at = data['completed_at']
         return stage
 
 
-class Project:
+class Stage(BaseStage):
+    task_class = Task
+
+
+class BaseProject:
+    """Project behaviour shared by Project and CompactProject"""
+    __slots__ = ()
+    # Class used for the project's stages
+    stage_class = None
+
     def __init__(self, name: str, description: str = "", deadline: str = None, category_id: str = None):
+        self._manager: Optional['ProjectManager'] = None
         self.id = str(uuid.uuid4())
         self.name = name
         self.description = description
-        self.deadline = deadline
-        self.category_id = category_id
+        self._deadline = deadline
+        self._deadline_at = parse_deadline(deadline)
+        self._category_id = category_id
         self.stages: List[Stage] = []
         self.created_at = datetime.now().isoformat()
         self.completed_at = None
+        self._dirty = True
+        # Roll-up of the stages' counters, see _counters()
+        self._task_total = 0
+        self._task_completed = 0
+        self._stage_completed = 0
+        self._progress_total = Fraction(0)
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    @property
+    def deadline(self) -> Optional[str]:
+        return self._deadline
+
+    @deadline.setter
+    def deadline(self, deadline: Optional[str]):
+        old_deadline_at = self._deadline_at
+        self._deadline, self._deadline_at = deadline, parse_deadline(deadline)
+        self.mark_dirty()
+        if old_deadline_at != self._deadline_at and self._manager is not None:
+            self._manager._project_deadline_changed(self, old_deadline_at, self._deadline_at)
+
+    @property
+    def category_id(self) -> Optional[str]:
+        return self._category_id
+
+    @category_id.setter
+    def category_id(self, category_id: Optional[str]):
+        old_category_id, self._category_id = self._category_id, category_id
+        self.mark_dirty()
+        if old_category_id != category_id and self._manager is not None:
+            self._manager._project_category_changed(self, old_category_id, category_id)
+
+    def _counters(self) -> tuple:
+        return project_counters(len(self.stages), self._stage_completed, self._task_total,
+                                self._task_completed, self._progress_total)
+
+    def _apply_stage_counters(self, before: tuple, after: tuple):
+        self._task_total += after[0] - before[0]
+        self._task_completed += after[1] - before[1]
+        self._stage_completed += after[2] - before[2]
+        self._progress_total += after[3] - before[3]
+
+    def _stage_counters_changed(self, before: tuple, after: tuple):
+        project_before = self._counters()
+        self._apply_stage_counters(before, after)
+        if self._manager is not None:
+            self._manager._project_counters_changed(self.id, project_before, self._counters())
+
+    def _recount(self):
+        self._task_total = self._task_completed = self._stage_completed = 0
+        self._progress_total = Fraction(0)
+        for stage in self.stages:
+            stage._recount()
+            self._apply_stage_counters(EMPTY_STAGE_COUNTERS, stage._counters())
+
+    def _task_attached(self, stage: 'Stage', task: 'Task'):
+        if self._manager is not None:
+            self._manager._index_task(self, stage, task)
+
+    def clear_dirty(self):
+        """Reset the dirty flags of the project and everything it contains"""
+        self._dirty = False
+        for stage in self.stages:
+            stage._dirty = False
+            for task in stage.tasks:
+                task._dirty = False
 
     def add_stage(self, stage: Stage):
+        project_before = self._counters()
+        stage._project = self
         self.stages.append(stage)
+        self._apply_stage_counters(EMPTY_STAGE_COUNTERS, stage._counters())
+        if self._manager is not None:
+            self._manager._project_counters_changed(self.id, project_before, self._counters())
+        self.mark_dirty()
+        for task in stage.tasks:
+            self._task_attached(stage, task)
 
     def get_current_stage(self) -> Optional[Stage]:
         for stage in self.stages:
@@ -181,9 +454,12 @@ class Project:
         if current_index + 1 < len(self.stages):
             next_stage = self.stages[current_index + 1]
             next_stage.start()
+            self._announce('stage_advanced', stage=next_stage.name)
             return True, f"Advanced to stage: {next_stage.name}"
         else:
             self.completed_at = datetime.now().isoformat()
+            self.mark_dirty()
+            self._announce('project_completed')
             return True, "Project completed!"
 
     def go_back_to_previous_stage(self) -> tuple[bool, str]:
@@ -194,6 +470,8 @@ class Project:
                 last_stage.status = StageStatus.IN_PROGRESS
                 last_stage.completed_at = None
                 self.completed_at = None
+                self.mark_dirty()
+                self._announce('stage_reverted', stage=last_stage.name)
                 return True, f"Moved back to stage: {last_stage.name}"
             return False, "No active stage to go back from."
 
@@ -211,37 +489,35 @@ class Project:
         if self.completed_at:
             self.completed_at = None
         
+        self.mark_dirty()
+        self._announce('stage_reverted', stage=previous_stage.name)
         return True, f"Moved back to stage: {previous_stage.name}"
 
+    def _announce(self, event_type: str, **data):
+        """Queue a change event, published once the manager records the project"""
+        if self._manager is not None:
+            self._manager._queue_event(event_type, project_id=self.id, **data)
+
     def is_overdue(self) -> bool:
-        if not self.deadline:
-            return False
-        try:
-            deadline_date = datetime.fromisoformat(self.deadline.replace('Z', '+00:00'))
-            return datetime.now(deadline_date.tzinfo) > deadline_date and not self.is_completed()
-        except (ValueError, TypeError):
+        if self._deadline_at is None:
             return False
+        return time.time() > self._deadline_at and not self.is_completed()
 
     def days_until_deadline(self) -> Optional[int]:
-        if not self.deadline:
-            return None
-        try:
-            deadline_date = datetime.fromisoformat(self.deadline.replace('Z', '+00:00'))
-            delta = deadline_date - datetime.now(deadline_date.tzinfo)
-            return delta.days
-        except (ValueError, TypeError):
+        if self._deadline_at is None:
             return None
+        return math.floor((self._deadline_at - time.time()) / 86400)
 
     def get_project_summary(self) -> Dict:
-        total_tasks = sum(len(stage.tasks) for stage in self.stages)
-        completed_tasks = sum(1 for stage in self.stages for t in stage.tasks if t.status == TaskStatus.COMPLETED)
+        total_tasks = self._task_total
+        completed_tasks = self._task_completed
         
         current_stage_obj = self.get_current_stage()
         current_stage_name = current_stage_obj.name if current_stage_obj else ("Completed" if self.is_completed() else "Not Started")
 
         return {
             'total_stages': len(self.stages),
-            'completed_stages': len([s for s in self.stages if s.status == StageStatus.COMPLETED]),
+            'completed_stages': self._stage_completed,
             'total_tasks': total_tasks,
             'completed_tasks': completed_tasks,
             'overall_progress': self.get_overall_progress(),
@@ -254,18 +530,16 @@ class Project:
         }
 
     def get_overall_progress(self):
-        if not self.stages:
-            return 1.0 if self.is_completed() else 0.0
-        
-        total_progress = sum(stage.get_progress() for stage in self.stages)
-        return total_progress / len(self.stages)
+        return float(self._counters()[6])
 
     def is_completed(self):
         stages_completed = all(stage.status == StageStatus.COMPLETED for stage in self.stages)
         if stages_completed and not self.completed_at:
             self.completed_at = datetime.now().isoformat()
+            self.mark_dirty()
         elif not stages_completed and self.completed_at:
             self.completed_at = None
+            self.mark_dirty()
         return stages_completed
 
     def to_dict(self):
@@ -289,20 +563,427 @@ class Project:
             data.get('category_id')
         )
         project.id = data['id']
-        project.stages = [Stage.from_dict(stage_data) for stage_data in data.get('stages', [])]
+        project.stages = [cls.stage_class.from_dict(stage_data) for stage_data in data.get('stages', [])]
+        for stage in project.stages:
+            stage._project = project
+        project._recount()
         project.created_at = data.get('created_at')
         project.completed_at = data.get('completed_at')
         return project
 
 
+class Project(BaseProject):
+    stage_class = Stage
+
+
+# Compact model variants
+#
+# Same behaviour and the same to_dict()/from_dict() format as the classes
+# above, but without a per-instance __dict__: attributes live in __slots__,
+# uuid strings are held as 128-bit ints, ISO timestamps as integer
+# microseconds and task texts are interned (template tasks repeat the same
+# names and descriptions in every project). Values that would not convert
+# back to the identical string (custom ids, timestamps with a timezone, ...)
+# are stored unchanged.
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def pack_uuid(value):
+    """Canonical uuid string -> int, anything else unchanged"""
+    if isinstance(value, str) and len(value) == 36:
+        try:
+            packed = int(value.replace('-', ''), 16)
+        except ValueError:
+            return value
+        if unpack_uuid(packed) == value:
+            return packed
+    return value
+
+
+def unpack_uuid(value):
+    if not isinstance(value, int):
+        return value
+    digits = '%032x' % value
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+def pack_timestamp(value):
+    """Naive ISO timestamp -> microseconds since 1970-01-01, anything else unchanged"""
+    if isinstance(value, str):
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+        if moment.tzinfo is None:
+            packed = (moment - _EPOCH) // _MICROSECOND
+            if unpack_timestamp(packed) == value:
+                return packed
+    return value
+
+
+def unpack_timestamp(value):
+    return (_EPOCH + value * _MICROSECOND).isoformat() if isinstance(value, int) else value
+
+
+def intern_text(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _unchanged(value):
+    return value
+
+
+class _Packed:
+    """Attribute kept in another slot in packed form, e.g. ``id = _Packed('_id', pack_uuid, unpack_uuid)``"""
+    __slots__ = ('slot', 'pack', 'unpack')
+
+    def __init__(self, slot: str, pack, unpack):
+        self.slot = slot
+        self.pack = pack
+        self.unpack = unpack
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return self.unpack(getattr(obj, self.slot))
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, self.pack(value))
+
+
+class CompactCategory(BaseCategory):
+    __slots__ = ('_id', 'name', 'description', 'color', '_created_at')
+    id = _Packed('_id', pack_uuid, unpack_uuid)
+    created_at = _Packed('_created_at', pack_timestamp, unpack_timestamp)
+
+
+class CompactTask(BaseTask):
+    __slots__ = ('_id', '_name', '_description', '_assignee', '_status',
+                 '_created_at', '_completed_at', '_stage', '_dirty')
+    id = _Packed('_id', pack_uuid, unpack_uuid)
+    name = _Packed('_name', intern_text, _unchanged)
+    description = _Packed('_description', intern_text, _unchanged)
+    created_at = _Packed('_created_at', pack_timestamp, unpack_timestamp)
+    completed_at = _Packed('_completed_at', pack_timestamp, unpack_timestamp)
+
+
+class CompactStage(BaseStage):
+    __slots__ = ('_id', 'name', 'description', '_status', 'tasks', '_created_at',
+                 '_started_at', '_completed_at', '_project', '_dirty', '_completed_tasks')
+    task_class = CompactTask
+    id = _Packed('_id', pack_uuid, unpack_uuid)
+    created_at = _Packed('_created_at', pack_timestamp, unpack_timestamp)
+    started_at = _Packed('_started_at', pack_timestamp, unpack_timestamp)
+    completed_at = _Packed('_completed_at', pack_timestamp, unpack_timestamp)
+
+
+class CompactProject(BaseProject):
+    __slots__ = ('_id', 'name', 'description', '_deadline', '_deadline_at', '_category_id', 'stages',
+                 '_created_at', '_completed_at', '_manager', '_dirty', '_task_total',
+                 '_task_completed', '_stage_completed', '_progress_total')
+    stage_class = CompactStage
+    id = _Packed('_id', pack_uuid, unpack_uuid)
+    created_at = _Packed('_created_at', pack_timestamp, unpack_timestamp)
+    completed_at = _Packed('_completed_at', pack_timestamp, unpack_timestamp)
+
+
+def _raw_tasks(data: Dict) -> List[Tuple[str, str, TaskStatus]]:
+    """(id, assignee, status) of every task in a project's to_dict() dict"""
+    return [(task_data['id'], intern_text(task_data['assignee']), TaskStatus(task_data['status']))
+            for stage_data in data.get('stages', []) for task_data in stage_data['tasks']]
+
+
+def _add_to_index(index: Dict, value, key):
+    index.setdefault(value, set()).add(key)
+
+
+def _remove_from_index(index: Dict, value, key):
+    keys = index.get(value)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del index[value]
+
+
+class LazyProjects(dict):
+    """Project mapping of a lazily loaded ProjectManager.
+
+    Values start out as the projects' JSON text from the store and are
+    replaced by Project objects the first time they are looked up or
+    iterated over. ``dict.items(lazy)`` lists the stored values without
+    hydrating anything.
+    """
+
+    def __init__(self, hydrate):
+        super().__init__()
+        self._hydrate = hydrate
+
+    def __getitem__(self, project_id):
+        project = super().__getitem__(project_id)
+        if type(project) is str:
+            project = self._hydrate(project_id)
+        return project
+
+    def get(self, project_id, default=None):
+        return self[project_id] if project_id in self else default
+
+    def values(self):
+        return [self[project_id] for project_id in list(self)]
+
+    def items(self):
+        return [(project_id, self[project_id]) for project_id in list(self)]
+
+    def hydrated_count(self) -> int:
+        return sum(1 for project in super().values() if type(project) is not str)
+
+
+class ProjectJournal:
+    """Append-only log of mutations kept next to the data file.
+
+    Each line is one JSON record ``{"op": ..., ...}``. The log is replayed on
+    top of the snapshot when the data is loaded and is truncated whenever a
+    full snapshot is written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = 0
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.entries = sum(1 for line in f if line.strip())
+
+    def append(self, op: str, **payload):
+        record = dict(payload, op=op)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries += 1
+
+    def records(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves a partial last line behind
+                    print(f"Warning: skipping corrupt journal record {line_number} in {self.path}")
+
+    def truncate(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.entries = 0
+
+
+# Data versions are drawn from one process-wide counter, so a manager created
+# by a reload or file switch never reuses a version handed out before
+_data_versions = itertools.count(1)
+
+# Default for filters where None is a meaningful value
+_ANY = object()
+
+# Members of the data file besides 'projects'. Each category, template and
+# metadata key has its own revision; default_category_id has a single one.
+DOCUMENT_SECTIONS = ('categories', 'templates', 'default_category_id', 'metadata')
+KEYED_SECTIONS = ('categories', 'templates', 'metadata')
+# Items that two processes may both change without a conflict: the later value is kept
+_LATEST_WINS = {('metadata', 'last_modified')}
+_SECTION_EVENTS = {
+    'categories': 'categories_changed',
+    'templates': 'templates_changed',
+    'default_category_id': 'categories_changed',
+    'metadata': 'metadata_changed',
+}
+
+
+def _encode_member(value) -> str:
+    """A top-level member of the data file as it is indented there"""
+    return json.dumps(value, indent=2, default=str).replace('\n', '\n  ')
+
+
+def _encode_item(value) -> str:
+    """Compact JSON of one section item, to tell whether it changed"""
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _section_items(values: Dict) -> Dict:
+    """Encoded items of each section in values; default_category_id is a single item"""
+    return {name: {key: _encode_item(item) for key, item in value.items()} if name in KEYED_SECTIONS
+            else _encode_item(value) for name, value in values.items()}
+
+
+def _stored_section_revisions(data: Dict) -> Dict:
+    """The section revisions recorded in a data file, per item for keyed sections.
+
+    Files written before items had their own revisions give one revision per
+    section, which then applies to each of its items.
+    """
+    revisions = data.get('revisions') or {}
+    result = {}
+    for name in DOCUMENT_SECTIONS:
+        revision = revisions.get(name, 0)
+        if name in KEYED_SECTIONS:
+            result[name] = {key: revision.get(key, 0) if isinstance(revision, dict) else revision
+                            for key in data.get(name) or {}}
+        else:
+            result[name] = revision if isinstance(revision, int) else 0
+    return result
+
+
+# Project ids as JSON strings; every save lists the revision of every project
+_encode_key = lru_cache(maxsize=1 << 16)(json.dumps)
+
+
+def _encode_revision_map(revisions: Dict[str, int]) -> str:
+    if not revisions:
+        return '{}'
+    return '{\n' + ',\n'.join(f'      {_encode_key(key)}: {revision}' for key, revision in revisions.items()) + '\n    }'
+
+
+def _encode_revisions(section_revisions: Dict, project_revisions: Dict[str, int]) -> str:
+    """_encode_member() of the revisions, without the pure-Python indenting encoder"""
+    lines = [f'    {json.dumps(name)}: {_encode_revision_map(revision) if isinstance(revision, dict) else revision}'
+             for name, revision in section_revisions.items()]
+    lines.append(f'    "projects": {_encode_revision_map(project_revisions)}')
+    return '{\n' + ',\n'.join(lines) + '\n  }'
+
+
+# Event published on the change bus for each kind of recorded mutation
+_RECORD_EVENTS = {
+    'put_project': 'project_updated',
+    'delete_project': 'project_deleted',
+    'put_category': 'categories_changed',
+    'set_default_category': 'categories_changed',
+    'set_metadata': 'metadata_changed',
+    'put_template': 'templates_changed',
+    'delete_template': 'templates_changed',
+}
+
+
+def _reads(method):
+    """Run a ProjectManager method under its read lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        lock = self.lock
+        lock.acquire_read()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_read()
+    return wrapper
+
+
+def _writes(method):
+    """Run a ProjectManager method under its write lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        lock = self.lock
+        lock.acquire_write()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            lock.release_write()
+    return wrapper
+
+
 class ProjectManager:
-    def __init__(self, data_file: str = "projects.json"):
+    """Projects, categories and templates of one project file.
+
+    Methods that change the data hold ``lock`` for writing and queries hold
+    it for reading, so threads can share a manager. Code that changes
+    projects, stages or tasks directly and then calls save_project() must
+    hold ``lock.write()`` around the whole sequence.
+    """
+
+    def __init__(self, data_file: str = "projects.json", journal: bool = False,
+                 journal_compact_threshold: int = 500, store: Optional[ProjectStore] = None,
+                 write_behind: bool = False, flush_delay: float = 0.5,
+                 verify_counters: bool = False, compact_models: bool = False,
+                 lazy: bool = False, bus: Optional[ChangeBus] = None):
         self.data_file = data_file
+        # Readers share the data, writers get it to themselves (see RWLock)
+        self.lock = RWLock()
+        # The backend is picked from the file extension unless one is given
+        self.store = store if store is not None else open_store(data_file)
+        # In journal mode mutations append to <data_file>.journal instead of
+        # rewriting the whole snapshot; compact() folds the log back in.
+        # Incremental backends such as SQLite don't need a journal.
+        use_journal = journal and not self.store.supports_incremental
+        self.journal = ProjectJournal(data_file + ".journal") if use_journal else None
+        self.journal_compact_threshold = journal_compact_threshold
+        # Encoded JSON of each project as of the last save, see _encode_document()
+        self._fragment_cache: Dict[str, str] = {}
+        # Several processes may share a JSON data file. It carries a generation,
+        # bumped by every write, and the generation in which each project and
+        # section was last written. These hold what this manager last read or
+        # wrote, so a write can tell what other processes changed meanwhile
+        # (see _merge_external). _unsynced holds projects changed here since.
+        # Section revisions and encoded items are kept per item of the keyed
+        # sections, e.g. {'categories': {id: revision}, 'default_category_id': revision}.
+        self.generation = 0
+        self._project_revisions: Dict[str, int] = {}
+        self._section_revisions: Dict[str, Any] = {}
+        self._section_cache: Dict[str, Any] = {}
+        self._unsynced: Set[str] = set()
+        self._pending_revisions = None
+        # Projects and section items whose local change a merge discarded
+        self.write_conflicts: List[str] = []
+        # task_id -> (project, stage, task) for every task of every project
+        self._task_index: Dict[str, Tuple[Project, Stage, Task]] = {}
+        # Running totals of every project's _counters(), for get_global_summary()
+        self._totals = list(EMPTY_PROJECT_COUNTERS)
+        # Secondary indexes: category id -> project ids, completed project ids,
+        # and assignee / status -> task keys (see _task_key)
+        self._projects_by_category: Dict[Optional[str], Set[str]] = {}
+        self._completed_project_ids: Set[str] = set()
+        self._tasks_by_assignee: Dict[str, Set] = {}
+        self._tasks_by_status: Dict[TaskStatus, Set] = {}
+        # Sorted (deadline epoch, project id) pairs of projects with a valid deadline
+        self._deadlines: List[Tuple[float, str]] = []
+        # Sorted project_sort_key() of every project, and that key by project id
+        self._listing: List[Tuple[str, str]] = []
+        self._listing_keys: Dict[str, Tuple[str, str]] = {}
+        # Debug aid: cross-check the running totals against a full recount
+        self.verify_counters = verify_counters
+        # Slotted models with packed ids/timestamps for large data sets
+        self.compact_models = compact_models
+        self.project_class = CompactProject if compact_models else Project
+        self.category_class = CompactCategory if compact_models else Category
+        # In lazy mode projects are kept as JSON text until first used, see
+        # LazyProjects; _lazy_tasks maps their task keys to project ids
+        self.lazy = lazy
+        self._lazy_tasks: Dict[str, str] = {}
+        self._hydrate_lock = threading.Lock()
+        # In write-behind mode mutations only mark the data dirty; a background
+        # thread coalesces everything changed within flush_delay into one save.
+        self.write_behind = write_behind
+        self.flush_delay = flush_delay
+        self._flush_pending = False
+        self._flush_closed = False
+        self._flush_cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._flush_thread: Optional[threading.Thread] = None
         self.projects: Dict[str, Project] = {}
         self.categories: Dict[str, Category] = {}
         self.templates: Dict[str, Dict] = {}
         self.default_category_id: Optional[str] = None
         self.metadata: Dict = {}
+        # Bumped on every mutation; web clients use it as a cache validator
+        self.data_version = next(_data_versions)
+        self.data_modified_at = time.time()
+        # Every recorded change is announced on the bus. Events describing
+        # what happened (task_completed, ...) are held in _pending_events
+        # until the change is recorded and then go out ahead of the generic
+        # event for the record. A bus may be shared by successive managers.
+        self.bus = bus if bus is not None else ChangeBus()
+        self._pending_events: List[Tuple[str, Dict]] = []
         self.default_stage_tasks = {
             "Planning": ["Define requirements", "Create timeline", "Assign resources"],
             "Design": ["Create wireframes", "Design mockups", "Review design"],
@@ -314,55 +995,223 @@ class ProjectManager:
         self.load_data()
         self._ensure_default_category()
 
+    @_writes
     def create_project(self, name: str, description: str = "", stage_names: List[str] = None, 
                       deadline: str = None, category_id: str = None) -> Project:
         category_id = category_id if category_id is not None else self.default_category_id
-        project = Project(name, description, deadline, category_id)
+        project = self.project_class(name, description, deadline, category_id)
         
         stages_to_create = stage_names if stage_names else list(self.default_stage_tasks.keys())
         for stage_name in stages_to_create:
             default_tasks = self.default_stage_tasks.get(stage_name, [])
-            stage = Stage(stage_name, f"Stage for {stage_name}", default_tasks=default_tasks)
+            stage = project.stage_class(stage_name, f"Stage for {stage_name}", default_tasks=default_tasks)
             project.add_stage(stage)
         
         # Start the first stage automatically
         if project.stages:
             project.stages[0].start()
 
-        self.projects[project.id] = project
-        self.save_data()
+        self.register_project(project)
+        self._queue_event('project_created', project_id=project.id, name=project.name)
+        self._record('put_project', project=project.to_dict())
         return project
 
     def get_project(self, project_id: str) -> Optional[Project]:
         return self.projects.get(project_id)
 
+    @_writes
+    def register_project(self, project: Project):
+        """Add (or replace) a project object and index its tasks, without saving.
+
+        Used for imported or replayed projects; callers persist afterwards.
+        """
+        if project.id in self.projects:
+            self._unregister_project(project.id)
+        project._manager = self
+        self.projects[project.id] = project
+        self._project_counters_changed(project.id, EMPTY_PROJECT_COUNTERS, project._counters())
+        _add_to_index(self._projects_by_category, project.category_id, project.id)
+        self._index_deadline(project.id, None, project._deadline_at)
+        self._index_listing(project.id, project_sort_key(project))
+        for stage in project.stages:
+            for task in stage.tasks:
+                self._index_task(project, stage, task)
+
+    def _unregister_project(self, project_id: str) -> Optional[Project]:
+        project = self.projects.pop(project_id, None)
+        self._index_listing(project_id, None)
+        if type(project) is str:
+            # Never hydrated: forget its counters and index entries
+            data = json.loads(project)
+            self._project_counters_changed(project_id, raw_project_counters(data), EMPTY_PROJECT_COUNTERS)
+            _remove_from_index(self._projects_by_category, data.get('category_id'), project_id)
+            self._index_deadline(project_id, parse_deadline(data.get('deadline')), None)
+            for task_id, assignee, status in _raw_tasks(data):
+                key = self._task_key(task_id)
+                if self._lazy_tasks.get(key) == project_id:
+                    del self._lazy_tasks[key]
+                    _remove_from_index(self._tasks_by_assignee, assignee, key)
+                    _remove_from_index(self._tasks_by_status, status, key)
+            return None
+        if project is not None:
+            project._manager = None
+            self._project_counters_changed(project_id, project._counters(), EMPTY_PROJECT_COUNTERS)
+            _remove_from_index(self._projects_by_category, project.category_id, project_id)
+            self._index_deadline(project_id, project._deadline_at, None)
+            for stage in project.stages:
+                for task in stage.tasks:
+                    key = self._task_key_of(task)
+                    if self._task_index.get(key, (None,))[0] is project:
+                        del self._task_index[key]
+                        _remove_from_index(self._tasks_by_assignee, task.assignee, key)
+                        _remove_from_index(self._tasks_by_status, task.status, key)
+        return project
+
+    def _hydrate_project(self, project_id: str) -> Project:
+        """Replace the JSON text of a lazily loaded project by a Project"""
+        with self._hydrate_lock:
+            text = dict.get(self.projects, project_id)
+            if type(text) is not str:
+                return text  # Hydrated by another thread meanwhile
+            data = json.loads(text)
+            project = self.project_class.from_dict(data)
+            project.clear_dirty()
+            project._manager = self
+            dict.__setitem__(self.projects, project_id, project)
+            self._project_counters_changed(project_id, raw_project_counters(data), project._counters())
+            for stage in project.stages:
+                for task in stage.tasks:
+                    key = self._task_key_of(task)
+                    self._lazy_tasks.pop(key, None)
+                    self._task_index[key] = (project, stage, task)
+            return project
+
+    def _project_counters_changed(self, project_id: str, before: tuple, after: tuple):
+        totals = self._totals
+        for i, (old, new) in enumerate(zip(before, after)):
+            totals[i] += new - old
+        if before[1] != after[1]:
+            if after[1]:
+                self._completed_project_ids.add(project_id)
+            else:
+                self._completed_project_ids.discard(project_id)
+
+    def _project_category_changed(self, project: Project, old_category_id, new_category_id):
+        if self.projects.get(project.id) is project:
+            _remove_from_index(self._projects_by_category, old_category_id, project.id)
+            _add_to_index(self._projects_by_category, new_category_id, project.id)
+
+    def _project_deadline_changed(self, project: Project, old_deadline_at, new_deadline_at):
+        if self.projects.get(project.id) is project:
+            self._index_deadline(project.id, old_deadline_at, new_deadline_at)
+
+    def _index_deadline(self, project_id: str, old_deadline_at: Optional[float], new_deadline_at: Optional[float]):
+        deadlines = self._deadlines
+        if old_deadline_at is not None:
+            position = bisect.bisect_left(deadlines, (old_deadline_at, project_id))
+            if position < len(deadlines) and deadlines[position] == (old_deadline_at, project_id):
+                del deadlines[position]
+        if new_deadline_at is not None:
+            bisect.insort(deadlines, (new_deadline_at, project_id))
+
+    def _index_listing(self, project_id: str, key: Optional[Tuple[str, str]]):
+        old_key = self._listing_keys.pop(project_id, None)
+        if old_key is not None:
+            position = bisect.bisect_left(self._listing, old_key)
+            if position < len(self._listing) and self._listing[position] == old_key:
+                del self._listing[position]
+        if key is not None:
+            self._listing_keys[project_id] = key
+            bisect.insort(self._listing, key)
+
+    def _task_field_changed(self, task: Task, field: str, old_value, new_value):
+        key = self._task_key_of(task)
+        entry = self._task_index.get(key)
+        if entry is None or entry[2] is not task:
+            return
+        index = self._tasks_by_status if field == 'status' else self._tasks_by_assignee
+        _remove_from_index(index, old_value, key)
+        _add_to_index(index, new_value, key)
+        if field == 'status':
+            event_type = 'task_completed' if new_value == TaskStatus.COMPLETED else 'task_status_changed'
+            self._queue_event(event_type, project_id=entry[0].id, task_id=task.id, name=task.name, status=new_value.value)
+
+    def _task_key(self, task_id: str):
+        """Key of a task in _task_index; packed like the task ids of compact models"""
+        return pack_uuid(task_id) if self.compact_models else task_id
+
+    def _task_key_of(self, task: Task):
+        """_task_key() of a task, reusing the packed id the task already holds"""
+        if isinstance(task, CompactTask):
+            return task._id
+        return self._task_key(task.id)
+
+    def _index_task(self, project: Project, stage: Stage, task: Task):
+        key = self._task_key_of(task)
+        previous = self._task_index.get(key)
+        if previous is not None:
+            _remove_from_index(self._tasks_by_assignee, previous[2].assignee, key)
+            _remove_from_index(self._tasks_by_status, previous[2].status, key)
+        self._task_index[key] = (project, stage, task)
+        _add_to_index(self._tasks_by_assignee, task.assignee, key)
+        _add_to_index(self._tasks_by_status, task.status, key)
+
+    def get_task(self, task_id: str) -> Optional[Tuple[Project, Stage, Task]]:
+        """Find a task by id in O(1); returns (project, stage, task) or None"""
+        return self._get_task_entry(self._task_key(task_id))
+
+    def _get_task_entry(self, key) -> Optional[Tuple[Project, Stage, Task]]:
+        entry = self._task_index.get(key)
+        if entry is None and key in self._lazy_tasks:
+            self.projects.get(self._lazy_tasks[key])
+            entry = self._task_index.get(key)
+        if entry is None:
+            return None
+        project, stage, task = entry
+        if task._stage is not stage or stage._project is not project or self.projects.get(project.id) is not project:
+            # The task was moved or its project replaced behind the index's back
+            self._task_index.pop(key, None)
+            return None
+        return entry
+
+    @_reads
     def list_projects(self) -> List[Project]:
         return sorted(list(self.projects.values()), key=lambda p: p.created_at, reverse=True)
     
+    @_writes
+    def save_project(self, project: Project):
+        """Persist changes made directly to a project, its stages or tasks"""
+        project.mark_dirty()
+        self._record('put_project', project=project.to_dict())
+
+    @_writes
     def delete_project(self, project_id: str) -> bool:
         if project_id in self.projects:
-            del self.projects[project_id]
-            self.save_data()
+            self._unregister_project(project_id)
+            self._record('delete_project', id=project_id)
             return True
         return False
 
+    @_writes
     def create_category(self, name: str, description: str = "", color: str = "#007bff") -> Category:
-        category = Category(name, description, color)
+        category = self.category_class(name, description, color)
         self.categories[category.id] = category
-        self.save_data()
+        self._record('put_category', category=category.to_dict())
         return category
 
     def get_category(self, category_id: str) -> Optional[Category]:
         return self.categories.get(category_id)
 
+    @_reads
     def list_categories(self) -> List[Category]:
         return sorted(list(self.categories.values()), key=lambda c: c.name)
 
+    @_writes
     def delete_category(self, category_id: str) -> bool:
         if category_id in self.categories:
-            for project in self.projects.values():
-                if project.category_id == category_id:
-                    project.category_id = self.default_category_id if self.default_category_id != category_id else None
+            for project in self.get_projects_by_category(category_id):
+                project.category_id = self.default_category_id if self.default_category_id != category_id else None
+                project.mark_dirty()
             
             del self.categories[category_id]
             
@@ -374,18 +1223,21 @@ class ProjectManager:
             return True
         return False
 
+    @_writes
     def assign_project_to_category(self, project_id: str, category_id: Optional[str]) -> bool:
         project = self.get_project(project_id)
         if project and (category_id is None or self.get_category(category_id)):
             project.category_id = category_id
-            self.save_data()
+            project.mark_dirty()
+            self._record('put_project', project=project.to_dict())
             return True
         return False
 
+    @_writes
     def set_default_category(self, category_id: Optional[str]) -> bool:
         if category_id is None or self.get_category(category_id):
             self.default_category_id = category_id
-            self.save_data()
+            self._record('set_default_category', id=category_id)
             return True
         return False
 
@@ -405,10 +1257,203 @@ class ProjectManager:
         if needs_save:
             self.save_data()
 
-    def get_projects_by_category(self, category_id: str) -> List[Project]:
-        return [p for p in self.list_projects() if p.category_id == category_id]
+    @_reads
+    def get_projects_by_category(self, category_id: Optional[str]) -> List[Project]:
+        """Projects of a category (None: uncategorized), newest first"""
+        projects = [self.projects[pid] for pid in self._projects_by_category.get(category_id, ())]
+        return sorted(projects, key=lambda p: p.created_at, reverse=True)
+
+    @_reads
+    def count_projects_by_category(self, completed: Optional[bool] = None) -> Dict[Optional[str], int]:
+        """Number of projects per category id, optionally only completed (True) or active (False) ones"""
+        if completed is None:
+            return {cid: len(ids) for cid, ids in self._projects_by_category.items()}
+        if completed:
+            return {cid: len(ids & self._completed_project_ids) for cid, ids in self._projects_by_category.items()}
+        return {cid: len(ids - self._completed_project_ids) for cid, ids in self._projects_by_category.items()}
+
+    @_reads
+    def find_projects(self, category_id=_ANY, completed: Optional[bool] = None,
+                      overdue: Optional[bool] = None, search: Optional[str] = None) -> List[Project]:
+        """Projects matching every given filter, oldest first (ties broken by id).
+
+        category_id=None selects uncategorized projects. The category,
+        completion and overdue filters are answered from the indexes, so
+        only the remaining candidates are built and searched.
+        """
+        ids = self._filtered_ids(category_id, completed, overdue)
+        needle = search.casefold() if search else None
+        return [self.projects[pid] for pid in self._listed_ids(ids, needle)]
+
+    @_reads
+    def find_projects_page(self, limit: int, after: Optional[Tuple[str, str]] = None, category_id=_ANY,
+                           completed: Optional[bool] = None, overdue: Optional[bool] = None,
+                           search: Optional[str] = None) -> Tuple[List[Project], int, bool]:
+        """Keyset page of find_projects(): (up to limit projects whose
+        project_sort_key() follows after, number of matches, whether more follow).
+
+        Only the projects of the page are built; a lazily loaded project is
+        searched in its stored JSON instead.
+        """
+        ids = self._filtered_ids(category_id, completed, overdue)
+        needle = search.casefold() if search else None
+        page_ids = list(itertools.islice(self._listed_ids(ids, needle, after), limit + 1))
+        if needle:
+            total = sum(1 for _ in self._listed_ids(ids, needle))
+        else:
+            total = len(self.projects) if ids is None else len(ids)
+        return [self.projects[pid] for pid in page_ids[:limit]], total, len(page_ids) > limit
+
+    def _filtered_ids(self, category_id, completed: Optional[bool], overdue: Optional[bool]) -> Optional[Set[str]]:
+        """Ids of the projects passing the indexed filters, None for all projects"""
+        if category_id is _ANY:
+            if completed is None and overdue is None:
+                return None
+            ids = set(self._listing_keys)
+        else:
+            ids = set(self._projects_by_category.get(category_id, ()))
+        if completed is not None:
+            ids = ids & self._completed_project_ids if completed else ids - self._completed_project_ids
+        if overdue is not None:
+            end = bisect.bisect_left(self._deadlines, (time.time(),))
+            overdue_ids = {pid for _, pid in self._deadlines[:end]} - self._completed_project_ids
+            ids = ids & overdue_ids if overdue else ids - overdue_ids
+        return ids
+
+    def _listed_ids(self, ids: Optional[Set[str]], needle: Optional[str], after: Optional[Tuple[str, str]] = None):
+        """Ids from ids (None: all) matching needle, in listing order after the sort key after"""
+        if ids is None:
+            listing = self._listing
+        else:
+            listing = sorted(self._listing_keys[pid] for pid in ids)
+        start = bisect.bisect_right(listing, after) if after is not None else 0
+        for i in range(start, len(listing)):
+            pid = listing[i][1]
+            if needle is None or self._project_matches(pid, needle):
+                yield pid
+
+    def _project_matches(self, project_id: str, needle: str) -> bool:
+        project = dict.get(self.projects, project_id)
+        if type(project) is str:
+            data = json.loads(project)
+            name, description = data['name'], data.get('description')
+        else:
+            name, description = project.name, project.description
+        return needle in name.casefold() or needle in (description or '').casefold()
+
+    @_reads
+    def upcoming_deadlines(self, within_days: float) -> List[Project]:
+        """Active projects due from now to within_days days from now, soonest first"""
+        now = time.time()
+        start = bisect.bisect_left(self._deadlines, (now,))
+        end = bisect.bisect_left(self._deadlines, (now + within_days * 86400,))
+        return self._active_deadline_projects(self._deadlines[start:end])
+
+    @_reads
+    def overdue_projects(self) -> List[Project]:
+        """Active projects whose deadline has passed, most overdue first"""
+        end = bisect.bisect_left(self._deadlines, (time.time(),))
+        return self._active_deadline_projects(self._deadlines[:end])
+
+    @_reads
+    def active_deadlines(self) -> List[Tuple[float, str]]:
+        """(deadline timestamp, project id) of the active projects with a deadline, soonest first"""
+        return [(at, pid) for at, pid in self._deadlines if pid not in self._completed_project_ids]
+
+    @_reads
+    def active_deadline(self, project_id: str) -> Optional[float]:
+        """Deadline timestamp of project_id; None if it has none, is completed or doesn't exist"""
+        if project_id in self._completed_project_ids:
+            return None
+        project = self.get_project(project_id)
+        return project._deadline_at if project is not None else None
+
+    def _active_deadline_projects(self, deadlines: List[Tuple[float, str]]) -> List[Project]:
+        return [self.projects[pid] for _, pid in deadlines if pid not in self._completed_project_ids]
+
+    @_reads
+    def get_completed_projects(self) -> List[Project]:
+        return [self.projects[pid] for pid in list(self._completed_project_ids)]
+
+    @_reads
+    def get_active_projects(self) -> List[Project]:
+        return [self.projects[pid] for pid in list(self.projects) if pid not in self._completed_project_ids]
+
+    @_reads
+    def get_tasks_by_assignee(self, assignee: str) -> List[Tuple[Project, Stage, Task]]:
+        return self._get_task_entries(self._tasks_by_assignee.get(assignee, ()))
+
+    @_reads
+    def get_tasks_by_status(self, status: TaskStatus) -> List[Tuple[Project, Stage, Task]]:
+        return self._get_task_entries(self._tasks_by_status.get(status, ()))
+
+    def _get_task_entries(self, keys) -> List[Tuple[Project, Stage, Task]]:
+        entries = [self._get_task_entry(key) for key in list(keys)]
+        return [entry for entry in entries if entry is not None]
 
+    @_reads
     def get_global_summary(self) -> Dict:
+        """Portfolio-wide counts, produced in O(1) from the running totals.
+
+        With verify_counters set, the totals and the secondary indexes are
+        first checked against a full recount.
+        """
+        if self.verify_counters:
+            self._verify_counters()
+        if not self.projects:
+            return {'total_projects': 0, 'active_projects': 0, 'completed_projects': 0, 'total_tasks': 0, 'completed_tasks': 0, 'total_stages': 0, 'completed_stages': 0, 'overall_progress': 0.0}
+
+        total_projects, completed_projects, total_tasks, completed_tasks, total_stages, completed_stages, progress_sum = self._totals
+        return {
+            'total_projects': total_projects,
+            'active_projects': total_projects - completed_projects,
+            'completed_projects': completed_projects,
+            'total_tasks': total_tasks,
+            'completed_tasks': completed_tasks,
+            'total_stages': total_stages,
+            'completed_stages': completed_stages,
+            'overall_progress': float(progress_sum / total_projects)
+        }
+
+    def _verify_counters(self):
+        expected = self._recount_global_summary()
+        actual = dict(expected)
+        if self.projects:
+            total_projects, completed_projects = self._totals[0], self._totals[1]
+            actual.update({
+                'total_projects': total_projects,
+                'active_projects': total_projects - completed_projects,
+                'completed_projects': completed_projects,
+                'total_tasks': self._totals[2],
+                'completed_tasks': self._totals[3],
+                'total_stages': self._totals[4],
+                'completed_stages': self._totals[5],
+                'overall_progress': float(self._totals[6] / total_projects)
+            })
+        mismatched = [key for key in expected
+                      if abs(expected[key] - actual[key]) > 1e-9]
+        assert not mismatched, f"Summary counters out of sync for {mismatched}: {actual} != {expected}"
+
+        by_category, completed_ids, by_assignee, by_status = {}, set(), {}, {}
+        for pid, project in self.projects.items():
+            _add_to_index(by_category, project.category_id, pid)
+            if project.is_completed():
+                completed_ids.add(pid)
+            for stage in project.stages:
+                for task in stage.tasks:
+                    _add_to_index(by_assignee, task.assignee, self._task_key_of(task))
+                    _add_to_index(by_status, task.status, self._task_key_of(task))
+        assert by_category == self._projects_by_category, "Category index out of sync"
+        assert completed_ids == self._completed_project_ids, "Completed project index out of sync"
+        assert by_assignee == self._tasks_by_assignee, "Assignee index out of sync"
+        assert by_status == self._tasks_by_status, "Task status index out of sync"
+        deadlines = sorted((p._deadline_at, pid) for pid, p in self.projects.items() if p._deadline_at is not None)
+        assert deadlines == self._deadlines, "Deadline index out of sync"
+        listing = sorted(project_sort_key(p) for p in self.projects.values())
+        assert listing == self._listing == sorted(self._listing_keys.values()), "Listing index out of sync"
+
+    def _recount_global_summary(self) -> Dict:
+        """Reference implementation that walks every project, stage and task"""
         if not self.projects:
             return {'total_projects': 0, 'active_projects': 0, 'completed_projects': 0, 'total_tasks': 0, 'completed_tasks': 0, 'total_stages': 0, 'completed_stages': 0, 'overall_progress': 0.0}
         
@@ -434,66 +1479,529 @@ class ProjectManager:
             'overall_progress': overall_progress
         }
 
-    def save_data(self):
-        data = {
-            'projects': {pid: p.to_dict() for pid, p in self.projects.items()},
+    @_reads
+    def _stored_projects(self) -> List[Tuple[str, object]]:
+        """(id, Project or JSON text) pairs, without hydrating lazy projects"""
+        return list(dict.items(self.projects))
+
+    def iter_project_dicts(self):
+        """Yield the dict of each project in turn, without hydrating lazy projects"""
+        for _, project in self._stored_projects():
+            # Locked per project: the consumer may take its time between items
+            with self.lock.read():
+                data = json.loads(project) if type(project) is str else project.to_dict()
+            yield data
+
+    def _snapshot(self) -> Dict:
+        stored = self._stored_projects()
+        return {
+            'generation': self.generation,
+            'projects': {pid: json.loads(p) if type(p) is str else p.to_dict() for pid, p in stored},
+            'categories': {cid: c.to_dict() for cid, c in self.categories.items()},
+            'templates': self.templates,
+            'default_category_id': self.default_category_id,
+            'metadata': self.metadata,
+            'revisions': self._revisions_member([pid for pid, _ in stored])
+        }
+
+    def _encode_document(self, generation: Optional[int] = None) -> str:
+        """Encode the data file, re-encoding only projects changed since the last save.
+
+        The output is identical to ``json.dumps(self._snapshot(), indent=2)``;
+        unchanged projects are spliced in from the fragment cache. Projects and
+        sections changed since the last write get revision ``generation``
+        (default: the current one); _commit_revisions() adopts the new
+        revisions once the text has been written.
+        """
+        if generation is None:
+            generation = self.generation
+        cache = self._fragment_cache
+        fragments = []
+        stored = self._stored_projects()
+        for pid, project in stored:
+            fragment = cache.get(pid)
+            if type(project) is str:
+                # Never hydrated: written back as it was read
+                fragment = f'    {json.dumps(pid)}: ' + project
+            elif fragment is None or project._dirty:
+                if project._dirty or pid not in self._project_revisions:
+                    self._unsynced.add(pid)
+                # Clear first so a change made while encoding re-dirties the project
+                project.clear_dirty()
+                encoded = json.dumps(project.to_dict(), indent=2, default=str)
+                fragment = f'    {json.dumps(pid)}: ' + encoded.replace('\n', '\n    ')
+                cache[pid] = fragment
+            fragments.append(fragment)
+        if len(cache) > len(fragments):
+            for pid in [pid for pid in cache if pid not in self.projects]:
+                del cache[pid]
+
+        values = self._section_values()
+        sections = {name: _encode_member(value) for name, value in values.items()}
+        items = _section_items(values)
+        project_revisions = {pid: generation if pid in self._unsynced else self._project_revisions.get(pid, generation)
+                             for pid, _ in stored}
+        section_revisions = self._next_section_revisions(items, generation)
+        self._pending_revisions = (generation, project_revisions, section_revisions, items)
+
+        projects = '{\n' + ',\n'.join(fragments) + '\n  }' if fragments else '{}'
+        return (
+            '{\n'
+            f'  "generation": {generation},\n'
+            f'  "projects": {projects},\n'
+            f'  "categories": {sections["categories"]},\n'
+            f'  "templates": {sections["templates"]},\n'
+            f'  "default_category_id": {sections["default_category_id"]},\n'
+            f'  "metadata": {sections["metadata"]},\n'
+            f'  "revisions": {_encode_revisions(section_revisions, project_revisions)}\n'
+            '}'
+        )
+
+    def _section_values(self) -> Dict:
+        return {
             'categories': {cid: c.to_dict() for cid, c in self.categories.items()},
             'templates': self.templates,
             'default_category_id': self.default_category_id,
             'metadata': self.metadata
         }
+
+    def _next_section_revisions(self, items: Dict, generation: int) -> Dict:
+        """Section revisions for a write of items: ``generation`` for what changed since the last one"""
+        revisions = {}
+        for name, encoded in items.items():
+            cached, known = self._section_cache.get(name), self._section_revisions.get(name)
+            if name not in KEYED_SECTIONS:
+                revisions[name] = known if encoded == cached and known is not None else generation
+                continue
+            cached, known = cached or {}, known or {}
+            revisions[name] = {key: known[key] if key in known and text == cached.get(key) else generation
+                               for key, text in encoded.items()}
+        return revisions
+
+    def _revisions_member(self, project_ids) -> Dict:
+        """The 'revisions' member of the data file as last read or written"""
+        revisions = {name: dict(self._section_revisions.get(name) or {}) if name in KEYED_SECTIONS
+                     else self._section_revisions.get(name, self.generation) for name in DOCUMENT_SECTIONS}
+        revisions['projects'] = {pid: self._project_revisions.get(pid, self.generation) for pid in project_ids}
+        return revisions
+
+    def _commit_revisions(self):
+        """Adopt the generation and revisions of the document just written"""
+        generation, project_revisions, section_revisions, items = self._pending_revisions
+        self.generation = generation
+        self._project_revisions = project_revisions
+        self._section_revisions = section_revisions
+        self._section_cache = items
+        self._unsynced = set()
+        self._pending_revisions = None
+
+    def _queue_event(self, event_type: str, **data):
+        self._pending_events.append((event_type, data))
+
+    def _data_changed(self, event_type: str = 'data_changed', **data):
+        self.data_version = next(_data_versions)
+        self.data_modified_at = time.time()
+        pending, self._pending_events = self._pending_events, []
+        for pending_type, pending_data in pending:
+            self.bus.publish(pending_type, version=self.data_version, **pending_data)
+        self.bus.publish(event_type, version=self.data_version, **data)
+
+    @_writes
+    def save_data(self):
+        """Persist the data after changes made directly to the manager's dicts.
+
+        Returns False if the data could not be saved, or if another process
+        had changed the same items meanwhile and the changes made here were
+        discarded (see write_conflicts).
+        """
+        self._data_changed()
+        conflicts = len(self.write_conflicts)
+        return bool(self._write_snapshot()) and len(self.write_conflicts) == conflicts
+
+    def _write_snapshot(self, merge: bool = True):
+        """Write the whole document; True once written, False on errors.
+
+        JSON files are written under the store's cross-process lock and only
+        on top of the generation this manager last saw. Changes other
+        processes wrote since are merged in first, which changes the data, so
+        with merge false None is returned instead and nothing is written.
+        """
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-        except IOError as e:
+            if self.store.supports_encoded_save:
+                with self.store.locked():
+                    if self._stale():
+                        if not merge:
+                            return None
+                        self._merge_external(self.store.load() or {})
+                    self.store.save_encoded(self._encode_document(self.generation + 1))
+                    self._commit_revisions()
+            else:
+                self.store.save(self._snapshot())
+        except (IOError, ValueError, StoreError) as e:
             print(f"Error saving data to {self.data_file}: {e}")
+            return False
+        # The snapshot now contains everything the journal recorded
+        if self.journal is not None:
+            self.journal.truncate()
+        return True
+
+    def _stale(self) -> bool:
+        """True when another process has written the data file since this manager last read or wrote it"""
+        try:
+            header = self.store.read_header()
+        except StoreError as e:
+            print(f"Warning: {e}; it will be overwritten")
+            return False
+        if header is None:
+            return False
+        if 'generation' not in header:
+            # Written by a version without generations
+            return self.store.changed_externally()
+        return header['generation'] != self.generation
+
+    @_writes
+    def sync(self) -> bool:
+        """Merge what other processes wrote to the data file since the last load or write.
+
+        Only the projects and sections they changed are rebuilt. Returns True
+        if there was anything to merge.
+        """
+        if not self.store.supports_encoded_save or not self._stale():
+            return False
+        self._merge_external(self.store.load() or {})
+        return True
+
+    def _merge_external(self, data: Dict) -> List[str]:
+        """Adopt the projects and section items stored in data with a newer revision than our generation.
+
+        A local change to something another process changed as well is a
+        stale write: it is dropped in favour of the stored version, with a
+        warning and a write_conflict event. Returns the items concerned,
+        which are also added to write_conflicts.
+        """
+        base = self.generation
+        revisions = data.get('revisions') or {}
+        # Without a generation the file gives no clue what changed
+        versioned = 'generation' in data
+        project_revisions = revisions.get('projects') or {}
+        stored = data.get('projects') or {}
+        conflicts = []
+        for pid, project_data in stored.items():
+            if versioned and project_revisions.get(pid, 0) <= base:
+                continue
+            if self._changed_locally(pid):
+                conflicts.append(pid)
+            project = self.project_class.from_dict(project_data)
+            project.clear_dirty()
+            self.register_project(project)
+            self._fragment_cache.pop(pid, None)
+            self._unsynced.discard(pid)
+            self._queue_event('project_updated', project_id=pid, external=True)
+        for pid in [pid for pid in self._project_revisions if pid not in stored]:
+            if dict.get(self.projects, pid) is None:
+                continue  # Deleted here as well
+            if self._changed_locally(pid):
+                conflicts.append(pid)
+            self._unregister_project(pid)
+            self._fragment_cache.pop(pid, None)
+            self._unsynced.discard(pid)
+            self._queue_event('project_deleted', project_id=pid, external=True)
+
+        section_revisions = _stored_section_revisions(data)
+        local = _section_items(self._section_values())
+        for name in DOCUMENT_SECTIONS:
+            if name not in data:
+                continue
+            if name not in KEYED_SECTIONS:
+                if versioned and section_revisions[name] <= base:
+                    continue
+                stored_text = _encode_item(data[name])
+                if local[name] not in (self._section_cache.get(name), stored_text):
+                    conflicts.append(name)
+                setattr(self, name, data[name])
+                self._section_cache[name] = stored_text
+                self._queue_event(_SECTION_EVENTS[name], external=True)
+                continue
+            if self._merge_section(name, data[name] or {}, section_revisions[name] if versioned else None,
+                                   local[name], conflicts):
+                self._queue_event(_SECTION_EVENTS[name], external=True)
+
+        for item in conflicts:
+            print(f"Warning: '{item}' was changed by another process; the change made here was discarded")
+            self._queue_event('write_conflict', item=item)
+        self.write_conflicts.extend(conflicts)
+        self.generation = data.get('generation', 0)
+        self._project_revisions = {pid: project_revisions.get(pid, 0) for pid in stored}
+        self._section_revisions = section_revisions
+        self._data_changed('data_reloaded', file=self.data_file, generation=self.generation)
+        return conflicts
+
+    def _merge_section(self, name: str, stored: Dict, revisions: Optional[Dict[str, int]],
+                       local: Dict[str, str], conflicts: List[str]) -> bool:
+        """Merge the stored items of one keyed section (see _merge_external); True if any was adopted.
+
+        revisions is None for files without generations, whose items are all adopted.
+        """
+        target = getattr(self, name)
+        cached = self._section_cache.setdefault(name, {})
+        known = self._section_revisions.get(name) or {}
+        base = self.generation
+        changed = False
+        for key, value in stored.items():
+            if revisions is not None and revisions.get(key, 0) <= base:
+                continue
+            stored_text = _encode_item(value)
+            if local.get(key) not in (cached.get(key), stored_text):
+                if (name, key) in _LATEST_WINS and key in target and target[key] >= value:
+                    continue
+                if (name, key) not in _LATEST_WINS:
+                    conflicts.append(f"{name}.{key}")
+            target[key] = self.category_class.from_dict(value) if name == 'categories' else value
+            cached[key] = _encode_item(target[key].to_dict()) if name == 'categories' else stored_text
+            changed = True
+        for key in [key for key in known if key not in stored]:
+            if key not in target:
+                continue  # Deleted here as well
+            if local.get(key) != cached.get(key):
+                conflicts.append(f"{name}.{key}")
+            del target[key]
+            cached.pop(key, None)
+            changed = True
+        return changed
+
+    def _changed_locally(self, project_id: str) -> bool:
+        """True if project_id was created, changed or deleted here since the last load or write"""
+        project = dict.get(self.projects, project_id)
+        if project is None:
+            return project_id in self._project_revisions
+        if type(project) is str:
+            return False
+        return project._dirty or project_id in self._unsynced or project_id not in self._project_revisions
+
+    @_writes
+    def compact(self):
+        """Fold the journal back into a fresh snapshot of the data file"""
+        self._write_snapshot()
+
+    def _record(self, op: str, **payload):
+        """Persist a single mutation, incrementally when the backend allows it"""
+        if op in ('put_project', 'delete_project'):
+            project_id = payload['project']['id'] if op == 'put_project' else payload['id']
+            self._data_changed(_RECORD_EVENTS[op], project_id=project_id)
+        else:
+            self._data_changed(_RECORD_EVENTS[op])
+        if self.store.supports_incremental:
+            try:
+                self.store.apply(op, **payload)
+            except StoreError as e:
+                print(f"Error updating {self.data_file}: {e}")
+                self._write_snapshot()
+            return
+        if self.journal is None:
+            if self.write_behind and not self._flush_closed:
+                self._schedule_flush()
+            else:
+                self._write_snapshot()
+            return
+        try:
+            self.journal.append(op, **payload)
+        except IOError as e:
+            print(f"Error appending to journal {self.journal.path}: {e}")
+            self._write_snapshot()
+            return
+        if self.journal.entries >= self.journal_compact_threshold:
+            self.compact()
+
+    def _schedule_flush(self):
+        with self._flush_cond:
+            self._flush_pending = True
+            if self._flush_thread is None:
+                self._flush_thread = threading.Thread(target=self._flush_loop, name="ProjectManagerFlusher", daemon=True)
+                self._flush_thread.start()
+            self._flush_cond.notify()
+
+    def _flush_loop(self):
+        try:
+            while True:
+                with self._flush_cond:
+                    while not self._flush_pending and not self._flush_closed:
+                        self._flush_cond.wait()
+                    if self._flush_closed:
+                        return
+                # Let a burst of mutations pile up before paying for one save
+                time.sleep(self.flush_delay)
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"Error writing {self.data_file} in the background: {e}")
+        finally:
+            # Should the loop die anyway, the next change starts a new flusher
+            with self._flush_cond:
+                if self._flush_thread is threading.current_thread():
+                    self._flush_thread = None
+
+    def flush(self):
+        """Write out pending write-behind changes now.
+
+        Changes that could not be written stay pending and are tried again
+        with the next flush.
+        """
+        # The data lock is taken before _flush_lock, as writers calling flush() do
+        with self.lock.read(), self._flush_lock:
+            with self._flush_cond:
+                if not self._flush_pending:
+                    return
+                self._flush_pending = False
+            if self._flush_write(merge=False) is not None:
+                return
+        # Another process wrote meanwhile, and merging its changes needs the write lock
+        with self.lock.write(), self._flush_lock:
+            self._flush_write()
+
+    def _flush_write(self, merge: bool = True):
+        """_write_snapshot() for flush(), marking the changes pending again if they were not written"""
+        written = False
+        try:
+            written = self._write_snapshot(merge=merge)
+        finally:
+            if written is False:
+                with self._flush_cond:
+                    self._flush_pending = True
+        return written
+
+    def close(self):
+        """Flush pending changes and stop the background flusher"""
+        with self._flush_cond:
+            self._flush_closed = True
+            self._flush_cond.notify()
+        self.flush()
+        # A flusher waiting for the lock this thread holds would never finish;
+        # it finds nothing left to write once it gets the lock, and exits
+        if self._flush_thread is not None and not self.lock.held_by_current_thread():
+            self._flush_thread.join()
+        self._flush_thread = None
+
+    def _replay_journal(self):
+        """Apply journal records written since the last snapshot"""
+        if self.journal is None:
+            return
+        for record in self.journal.records():
+            op = record.get('op')
+            try:
+                if op == 'put_project':
+                    self.register_project(self.project_class.from_dict(record['project']))
+                elif op == 'delete_project':
+                    self._unregister_project(record['id'])
+                elif op == 'put_category':
+                    category = self.category_class.from_dict(record['category'])
+                    self.categories[category.id] = category
+                elif op == 'set_default_category':
+                    self.default_category_id = record['id']
+                elif op == 'put_template':
+                    self.templates[record['template']['id']] = record['template']
+                elif op == 'delete_template':
+                    self.templates.pop(record['id'], None)
+                elif op == 'set_metadata':
+                    self.metadata.update(record['metadata'])
+                else:
+                    print(f"Warning: unknown journal operation '{op}' in {self.journal.path}")
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Warning: could not replay journal record '{op}': {e}")
 
     def save_projects(self):
         """Alias for save_data() for backward compatibility"""
         self.save_data()
 
+    @_writes
     def load_data(self):
-        if not os.path.exists(self.data_file):
-            self.projects, self.categories, self.templates, self.default_category_id = {}, {}, {}, None
-            self.metadata = self._get_default_metadata()
-            self._create_default_templates()
-            return
+        self._load_snapshot()
+        self._replay_journal()
 
+    def _load_snapshot(self):
+        self._fragment_cache = {}
+        self.generation, self._project_revisions, self._section_revisions = 0, {}, {}
+        self._section_cache, self._unsynced = {}, set()
         try:
-            with open(self.data_file, 'r') as f:
-                content = f.read().strip()
-                if not content:
-                    # File exists but is empty - don't overwrite, just initialize
-                    print(f"Warning: {self.data_file} is empty. Initializing with defaults but not saving.")
-                    self.projects, self.categories, self.templates, self.default_category_id = {}, {}, {}, None
-                    self.metadata = self._get_default_metadata()
-                    self._create_default_templates()
-                    return
-                
-                data = json.loads(content)
-                self.projects = {pid: Project.from_dict(p_data) for pid, p_data in data.get('projects', {}).items()}
-                self.categories = {cid: Category.from_dict(c_data) for cid, c_data in data.get('categories', {}).items()}
-                self.templates = data.get('templates', {})
-                self.default_category_id = data.get('default_category_id')
-                self.metadata = data.get('metadata', self._get_default_metadata())
-                
-                # Ensure metadata has all required fields
-                default_metadata = self._get_default_metadata()
-                for key, value in default_metadata.items():
-                    if key not in self.metadata:
-                        self.metadata[key] = value
-                
-                if not self.templates:
-                    self._create_default_templates()
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            if self.lazy:
+                raw_projects = []
+
+                def add_raw_project(p_data, text):
+                    raw_projects.append((p_data['id'], text, raw_project_counters(p_data), p_data.get('category_id'),
+                                         parse_deadline(p_data.get('deadline')), p_data.get('created_at') or '',
+                                         _raw_tasks(p_data)))
+                data = self.store.load_lazy(add_raw_project)
+            else:
+                data = self.store.load()
+            if data is None:
+                self.projects, self.categories, self.templates, self.default_category_id = {}, {}, {}, None
+                self._reset_indexes()
+                self.metadata = self._get_default_metadata()
+                self._create_default_templates()
+                return
+
+            if not self.lazy:
+                projects = [self.project_class.from_dict(p_data) for p_data in data.get('projects', {}).values()]
+            self._reset_indexes()
+            if self.lazy:
+                # Projects are only built from their JSON text when first used
+                self.projects = LazyProjects(self._hydrate_project)
+                for project_id, text, counters, category_id, deadline_at, created_at, tasks in raw_projects:
+                    dict.__setitem__(self.projects, project_id, text)
+                    self._project_counters_changed(project_id, EMPTY_PROJECT_COUNTERS, counters)
+                    _add_to_index(self._projects_by_category, category_id, project_id)
+                    if deadline_at is not None:
+                        self._deadlines.append((deadline_at, project_id))
+                    self._listing_keys[project_id] = (created_at, project_id)
+                    for task_id, assignee, status in tasks:
+                        key = self._task_key(task_id)
+                        self._lazy_tasks[key] = project_id
+                        _add_to_index(self._tasks_by_assignee, assignee, key)
+                        _add_to_index(self._tasks_by_status, status, key)
+                self._deadlines.sort()
+                self._listing = sorted(self._listing_keys.values())
+            else:
+                self.projects = {}
+                for project in projects:
+                    project.clear_dirty()
+                    self.register_project(project)
+            self.categories = {cid: self.category_class.from_dict(c_data) for cid, c_data in data.get('categories', {}).items()}
+            self.templates = data.get('templates', {})
+            self.default_category_id = data.get('default_category_id')
+            self.metadata = data.get('metadata', self._get_default_metadata())
+
+            self.generation = data.get('generation', 0)
+            revisions = data.get('revisions') or {}
+            project_revisions = revisions.get('projects') or {}
+            self._project_revisions = {pid: project_revisions.get(pid, 0) for pid in dict.keys(self.projects)}
+            self._section_revisions = _stored_section_revisions(data)
+            self._section_cache = _section_items(self._section_values())
+
+            # Ensure metadata has all required fields
+            default_metadata = self._get_default_metadata()
+            for key, value in default_metadata.items():
+                if key not in self.metadata:
+                    self.metadata[key] = value
+
+            if not self.templates:
+                self._create_default_templates()
+        except (json.JSONDecodeError, KeyError, TypeError, StoreError) as e:
             print(f"Warning: Could not load or parse {self.data_file}. Error: {e}")
             # Don't automatically overwrite - preserve existing instance data if we have it
             if not hasattr(self, 'projects') or self.projects is None:
                 print(f"Initializing fresh data for {self.data_file}")
                 self.projects, self.categories, self.templates, self.default_category_id = {}, {}, {}, None
+                self._reset_indexes()
                 self.metadata = self._get_default_metadata()
                 self._create_default_templates()
 
+    def _reset_indexes(self):
+        self._task_index, self._lazy_tasks = {}, {}
+        self._totals = list(EMPTY_PROJECT_COUNTERS)
+        self._projects_by_category, self._completed_project_ids = {}, set()
+        self._tasks_by_assignee, self._tasks_by_status = {}, {}
+        self._deadlines = []
+        self._listing, self._listing_keys = [], {}
+
     def _get_default_metadata(self):
         """Get default metadata structure"""
         return {
@@ -503,13 +2011,14 @@ class ProjectManager:
             'last_modified': datetime.now().isoformat()
         }
 
+    @_writes
     def update_metadata(self, **kwargs):
         """Update metadata fields"""
         for key, value in kwargs.items():
             if key in ['subtitle', 'description']:
                 self.metadata[key] = value
         self.metadata['last_modified'] = datetime.now().isoformat()
-        self.save_data()
+        self._record('set_metadata', metadata=self.metadata)
 
     def get_subtitle(self):
         """Get the current subtitle"""
@@ -616,6 +2125,7 @@ class ProjectManager:
             "is_default": True
         }
 
+    @_reads
     def list_templates(self):
         """Get all project templates"""
         return list(self.templates.values())
@@ -624,6 +2134,7 @@ class ProjectManager:
         """Get a specific template by ID"""
         return self.templates.get(template_id)
 
+    @_writes
     def create_template(self, name: str, description: str, stages: List[Dict]) -> str:
         """Create a new project template"""
         import uuid
@@ -638,9 +2149,10 @@ class ProjectManager:
             "is_default": False
         }
         
-        self.save_data()
+        self._record('put_template', template=self.templates[template_id])
         return template_id
 
+    @_writes
     def update_template(self, template_id: str, name: str, description: str, stages: List[Dict]) -> bool:
         """Update an existing template"""
         if template_id not in self.templates:
@@ -656,9 +2168,10 @@ class ProjectManager:
             "stages": stages
         })
         
-        self.save_data()
+        self._record('put_template', template=self.templates[template_id])
         return True
 
+    @_writes
     def delete_template(self, template_id: str) -> bool:
         """Delete a template"""
         if template_id not in self.templates:
@@ -669,9 +2182,10 @@ class ProjectManager:
             return False
             
         del self.templates[template_id]
-        self.save_data()
+        self._record('delete_template', id=template_id)
         return True
 
+    @_writes
     def create_project_from_template(self, name: str, description: str = "", deadline: str = None, category_id: str = None, template_id: str = "standard") -> Project:
         """Create a new project using a template"""
         import uuid
@@ -680,29 +2194,30 @@ class ProjectManager:
         if not template:
             template = self.get_template("standard")  # Fallback to standard template
         
-        project = Project(name, description, deadline, category_id)
+        project = self.project_class(name, description, deadline, category_id)
         
         # Create stages and tasks from template
         for stage_template in template["stages"]:
-            stage = Stage(
+            stage = project.stage_class(
                 stage_template["name"],
                 stage_template.get("description", "")
             )
             
             # Add tasks from template
             for task_name in stage_template.get("tasks", []):
-                task = Task(
+                task = stage.task_class(
                     task_name,
                     f"Default task for {stage_template['name']} stage"
                 )
-                stage.tasks.append(task)
+                stage.attach_task(task)
             
-            project.stages.append(stage)
+            project.add_stage(stage)
         
         # Start the first stage automatically
         if project.stages:
             project.stages[0].start()
         
-        self.projects[project.id] = project
-        self.save_data()
+        self.register_project(project)
+        self._queue_event('project_created', project_id=project.id, name=project.name)
+        self._record('put_project', project=project.to_dict())
         return project
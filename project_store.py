@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+Storage backends for the Project Manager
+A JSON document store (the historical format) and an SQLite store with
+one row per project, stage, task, category and template
+"""
+import json
+import os
+import re
+import sqlite3
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from urllib.parse import quote
+
+from file_watcher import file_signature
+
+# Cross-process locking of JSON files needs fcntl (not available on Windows)
+try:
+    import fcntl
+    FILE_LOCKING_AVAILABLE = True
+except ImportError:
+    FILE_LOCKING_AVAILABLE = False
+
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+# Bytes read at first to find the members ahead of 'projects' in a JSON file
+HEADER_READ_SIZE = 4096
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class StoreError(Exception):
+    """Raised when a storage backend cannot read or write its data"""
+
+
+class ProjectStore:
+    """Persistence interface used by ProjectManager.
+
+    ``load()`` and ``save()`` exchange the same document shape that has
+    always been written to projects.json::
+
+        {'projects': {...}, 'categories': {...}, 'templates': {...},
+         'default_category_id': ..., 'metadata': {...}}
+
+    Backends that can persist a single change without rewriting everything
+    set ``supports_incremental`` and implement ``apply()``.
+    """
+
+    supports_incremental = False
+    supports_encoded_save = False
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> Optional[Dict]:
+        """Return the stored document, or None when there is nothing stored yet"""
+        raise NotImplementedError
+
+    def load_lazy(self, add_project: Callable[[Dict, str], None]) -> Optional[Dict]:
+        """Like load(), but pass each project to ``add_project(data, text)`` instead.
+
+        ``text`` is the project's JSON, which a lazy loader keeps in place of
+        the decoded dict. The returned document has no 'projects' key.
+        """
+        data = self.load()
+        if data is None:
+            return None
+        for project_data in data.pop('projects', {}).values():
+            add_project(project_data, json.dumps(project_data, default=str))
+        return data
+
+    def save(self, data: Dict):
+        """Replace the stored document"""
+        raise NotImplementedError
+
+    def save_encoded(self, text: str):
+        """Replace the stored document with already-encoded text"""
+        raise NotImplementedError
+
+    def apply(self, op: str, **payload):
+        """Persist a single mutation (same records as the ProjectManager journal)"""
+        raise NotImplementedError
+
+    def changed_externally(self) -> bool:
+        """True when another process has written the data since this store last read or wrote it"""
+        return False
+
+    def read_header(self) -> Optional[Dict]:
+        """The document members stored ahead of 'projects' (its 'generation'), if the backend keeps any"""
+        return None
+
+    @contextmanager
+    def locked(self):
+        """Keep other processes from writing while the block runs"""
+        yield
+
+    def count_projects(self) -> int:
+        data = self.load()
+        return len(data.get('projects', {})) if data else 0
+
+    def load_project(self, project_id: str) -> Optional[Dict]:
+        data = self.load()
+        return data.get('projects', {}).get(project_id) if data else None
+
+    def close(self):
+        pass
+
+
+class JSONFileStore(ProjectStore):
+    """The whole document as one indented JSON file"""
+
+    supports_encoded_save = True
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        # Signature of the file as this store last saw it, to tell our own
+        # writes apart from changes made by other processes
+        self._signature = None
+        self._signature_lock = threading.Lock()
+
+    def changed_externally(self) -> bool:
+        with self._signature_lock:
+            return file_signature(self.path) != self._signature
+
+    def _read(self) -> Optional[str]:
+        with self._signature_lock:
+            self._signature = file_signature(self.path)
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r') as f:
+            content = f.read().strip()
+        if not content:
+            # File exists but is empty - don't overwrite, just initialize
+            print(f"Warning: {self.path} is empty. Initializing with defaults but not saving.")
+            return None
+        return content
+
+    def load(self) -> Optional[Dict]:
+        content = self._read()
+        return json.loads(content) if content is not None else None
+
+    def read_header(self) -> Optional[Dict]:
+        # Usually the header fits in the first block; the rest is only read
+        # when it doesn't
+        try:
+            with open(self.path, 'r') as f:
+                content = f.read(HEADER_READ_SIZE)
+                if not content.strip():
+                    return None
+                try:
+                    return _read_header(content)
+                except ValueError:
+                    content += f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            return _read_header(content)
+        except ValueError as e:
+            raise StoreError(f"Could not read {self.path}: {e}") from e
+
+    @contextmanager
+    def locked(self):
+        # The data file itself is replaced on every save, so the lock is
+        # taken on a sibling file that stays put
+        if not FILE_LOCKING_AVAILABLE:
+            yield
+            return
+        with open(self.path + ".lock", 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def load_lazy(self, add_project: Callable[[Dict, str], None]) -> Optional[Dict]:
+        # The text handed out is the project's slice of the file, so it needs
+        # no re-encoding and can be written back unchanged
+        content = self._read()
+        if content is None:
+            return None
+        decoder = json.JSONDecoder()
+        data = {}
+
+        def add_member(key, start):
+            if key != 'projects':
+                data[key], end = decoder.raw_decode(content, start)
+                return end
+
+            def add_project_member(project_id, project_start):
+                project_data, project_end = decoder.raw_decode(content, project_start)
+                add_project(project_data, content[project_start:project_end])
+                return project_end
+            return _scan_object(content, start, add_project_member)
+
+        end = _WHITESPACE.match(content, _scan_object(content, 0, add_member)).end()
+        if end != len(content):
+            raise json.JSONDecodeError("Extra data", content, end)
+        return data
+
+    def save(self, data: Dict):
+        self.save_encoded(json.dumps(data, indent=2, default=str))
+
+    def save_encoded(self, text: str):
+        # Write a sibling temp file and rename it over the original so a
+        # crash mid-write never leaves a truncated projects.json behind
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(self.path)}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            mode = stat.S_IMODE(os.stat(self.path).st_mode) if os.path.exists(self.path) else 0o644
+            os.chmod(tmp_path, mode)
+            with self._signature_lock:
+                os.replace(tmp_path, self.path)
+                self._signature = file_signature(self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class _HeaderEnd(Exception):
+    """Stops _read_header() at the 'projects' member"""
+
+
+def _read_header(content: str) -> Dict:
+    """Decode the members of a JSON document that come before 'projects'"""
+    decoder = json.JSONDecoder()
+    header = {}
+
+    def add_member(key, start):
+        if key == 'projects':
+            raise _HeaderEnd
+        header[key], end = decoder.raw_decode(content, start)
+        return end
+    try:
+        _scan_object(content, _WHITESPACE.match(content).end(), add_member)
+    except _HeaderEnd:
+        pass
+    return header
+
+
+def _scan_object(content: str, index: int, on_member: Callable[[str, int], int]) -> int:
+    """Walk the JSON object starting at content[index] without decoding its values.
+
+    ``on_member(key, value_index)`` must decode the value and return the
+    index just past it. Returns the index just past the closing brace.
+    """
+    def expect(index, char):
+        index = _WHITESPACE.match(content, index).end()
+        if content[index:index + 1] != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", content, index)
+        return index + 1
+
+    index = expect(index, '{')
+    if content[_WHITESPACE.match(content, index).end():][:1] == '}':
+        return expect(index, '}')
+    while True:
+        key, index = json.decoder.scanstring(content, expect(index, '"'))
+        index = _WHITESPACE.match(content, expect(index, ':')).end()
+        index = _WHITESPACE.match(content, on_member(key, index)).end()
+        if content[index:index + 1] != ',':
+            return expect(index, '}')
+        index += 1
+
+
+class SQLiteStore(ProjectStore):
+    """Normalized SQLite database in WAL mode.
+
+    Projects, stages and tasks live in their own tables so a change to one
+    project only rewrites that project's rows, and counts or single-project
+    lookups run as indexed queries instead of parsing the whole portfolio.
+    """
+
+    supports_incremental = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS projects (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT,
+            deadline TEXT,
+            category_id TEXT,
+            created_at TEXT,
+            completed_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_projects_category ON projects(category_id);
+        CREATE INDEX IF NOT EXISTS idx_projects_deadline ON projects(deadline);
+
+        CREATE TABLE IF NOT EXISTS stages (
+            project_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT,
+            status TEXT NOT NULL,
+            created_at TEXT,
+            started_at TEXT,
+            completed_at TEXT,
+            PRIMARY KEY (project_id, position)
+        );
+
+        CREATE TABLE IF NOT EXISTS tasks (
+            project_id TEXT NOT NULL,
+            stage_position INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT,
+            assignee TEXT,
+            status TEXT NOT NULL,
+            created_at TEXT,
+            completed_at TEXT,
+            PRIMARY KEY (project_id, stage_position, position)
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_id ON tasks(id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks(assignee);
+        CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+
+        CREATE TABLE IF NOT EXISTS categories (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT,
+            color TEXT,
+            created_at TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS templates (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            body TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+            self._data_version = self._read_data_version()
+        except sqlite3.Error as e:
+            raise StoreError(f"Could not open {path}: {e}") from e
+
+    def _read_data_version(self) -> int:
+        # data_version only changes when *another* connection commits
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed_externally(self) -> bool:
+        with self._lock:
+            version = self._read_data_version()
+            changed = version != self._data_version
+            self._data_version = version
+        return changed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def load(self) -> Optional[Dict]:
+        try:
+            with self._lock:
+                return self._load_document()
+        except sqlite3.Error as e:
+            raise StoreError(f"Could not read {self.path}: {e}") from e
+
+    def save(self, data: Dict):
+        try:
+            with self._lock, self._conn:
+                for table in ('projects', 'stages', 'tasks', 'categories', 'templates', 'settings'):
+                    self._conn.execute(f"DELETE FROM {table}")
+                for project in data.get('projects', {}).values():
+                    self._put_project(project)
+                for category in data.get('categories', {}).values():
+                    self._put_category(category)
+                for template in data.get('templates', {}).values():
+                    self._put_template(template)
+                self._put_setting('default_category_id', data.get('default_category_id'))
+                self._put_setting('metadata', data.get('metadata', {}))
+        except sqlite3.Error as e:
+            raise StoreError(f"Could not write {self.path}: {e}") from e
+
+    def apply(self, op: str, **payload):
+        try:
+            with self._lock, self._conn:
+                if op == 'put_project':
+                    self._put_project(payload['project'])
+                elif op == 'delete_project':
+                    self._delete_project(payload['id'])
+                elif op == 'put_category':
+                    self._put_category(payload['category'])
+                elif op == 'set_default_category':
+                    self._put_setting('default_category_id', payload['id'])
+                elif op == 'put_template':
+                    self._put_template(payload['template'])
+                elif op == 'delete_template':
+                    self._conn.execute("DELETE FROM templates WHERE id = ?", (payload['id'],))
+                elif op == 'set_metadata':
+                    self._put_setting('metadata', payload['metadata'])
+                else:
+                    raise StoreError(f"Unknown operation '{op}'")
+        except sqlite3.Error as e:
+            raise StoreError(f"Could not apply '{op}' to {self.path}: {e}") from e
+
+    def count_projects(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+
+    def load_project(self, project_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, name, description, deadline, category_id, created_at, completed_at "
+                "FROM projects WHERE id = ?", (project_id,)).fetchone()
+            if row is None:
+                return None
+            return self._project_from_rows(row, *self._children(project_id))
+
+    def find_task_project(self, task_id: str) -> Optional[str]:
+        """Return the id of the project owning ``task_id`` (indexed lookup)"""
+        with self._lock:
+            row = self._conn.execute("SELECT project_id FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return row[0] if row else None
+
+    # Row <-> document mapping
+
+    def _load_document(self) -> Optional[Dict]:
+        settings = {key: json.loads(value) for key, value in
+                    self._conn.execute("SELECT key, value FROM settings")}
+        project_rows = self._conn.execute(
+            "SELECT id, name, description, deadline, category_id, created_at, completed_at "
+            "FROM projects ORDER BY rowid").fetchall()
+        category_rows = self._conn.execute(
+            "SELECT id, name, description, color, created_at FROM categories ORDER BY rowid").fetchall()
+        template_rows = self._conn.execute("SELECT id, body FROM templates ORDER BY rowid").fetchall()
+        if not (settings or project_rows or category_rows or template_rows):
+            return None
+
+        stages_by_project: Dict[str, list] = {}
+        for row in self._conn.execute(
+                "SELECT project_id, position, id, name, description, status, created_at, started_at, completed_at "
+                "FROM stages ORDER BY project_id, position"):
+            stages_by_project.setdefault(row[0], []).append(row)
+        tasks_by_stage: Dict[tuple, list] = {}
+        for row in self._conn.execute(
+                "SELECT project_id, stage_position, position, id, name, description, assignee, status, "
+                "created_at, completed_at FROM tasks ORDER BY project_id, stage_position, position"):
+            tasks_by_stage.setdefault((row[0], row[1]), []).append(row)
+
+        projects = {}
+        for row in project_rows:
+            stage_rows = stages_by_project.get(row[0], [])
+            task_rows = [t for s in stage_rows for t in tasks_by_stage.get((row[0], s[1]), [])]
+            projects[row[0]] = self._project_from_rows(row, stage_rows, task_rows)
+
+        return {
+            'projects': projects,
+            'categories': {r[0]: {'id': r[0], 'name': r[1], 'description': r[2], 'color': r[3], 'created_at': r[4]}
+                           for r in category_rows},
+            'templates': {r[0]: json.loads(r[1]) for r in template_rows},
+            'default_category_id': settings.get('default_category_id'),
+            'metadata': settings.get('metadata', {})
+        }
+
+    def _children(self, project_id: str):
+        stage_rows = self._conn.execute(
+            "SELECT project_id, position, id, name, description, status, created_at, started_at, completed_at "
+            "FROM stages WHERE project_id = ? ORDER BY position", (project_id,)).fetchall()
+        task_rows = self._conn.execute(
+            "SELECT project_id, stage_position, position, id, name, description, assignee, status, "
+            "created_at, completed_at FROM tasks WHERE project_id = ? ORDER BY stage_position, position",
+            (project_id,)).fetchall()
+        return stage_rows, task_rows
+
+    @staticmethod
+    def _project_from_rows(row, stage_rows, task_rows) -> Dict:
+        tasks_by_stage: Dict[int, list] = {}
+        for t in task_rows:
+            tasks_by_stage.setdefault(t[1], []).append({
+                'id': t[3], 'name': t[4], 'description': t[5], 'assignee': t[6],
+                'status': t[7], 'created_at': t[8], 'completed_at': t[9]
+            })
+        return {
+            'id': row[0],
+            'name': row[1],
+            'description': row[2],
+            'deadline': row[3],
+            'category_id': row[4],
+            'stages': [{
+                'id': s[2], 'name': s[3], 'description': s[4], 'status': s[5],
+                'tasks': tasks_by_stage.get(s[1], []),
+                'created_at': s[6], 'started_at': s[7], 'completed_at': s[8]
+            } for s in stage_rows],
+            'created_at': row[5],
+            'completed_at': row[6]
+        }
+
+    def _put_project(self, project: Dict):
+        self._conn.execute(
+            "INSERT INTO projects (id, name, description, deadline, category_id, created_at, completed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+            "name = excluded.name, description = excluded.description, deadline = excluded.deadline, "
+            "category_id = excluded.category_id, created_at = excluded.created_at, "
+            "completed_at = excluded.completed_at",
+            (project['id'], project['name'], project.get('description', ''), project.get('deadline'),
+             project.get('category_id'), project.get('created_at'), project.get('completed_at')))
+        self._conn.execute("DELETE FROM stages WHERE project_id = ?", (project['id'],))
+        self._conn.execute("DELETE FROM tasks WHERE project_id = ?", (project['id'],))
+        for stage_position, stage in enumerate(project.get('stages', [])):
+            self._conn.execute(
+                "INSERT INTO stages (project_id, position, id, name, description, status, created_at, "
+                "started_at, completed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (project['id'], stage_position, stage['id'], stage['name'], stage['description'],
+                 stage['status'], stage['created_at'], stage['started_at'], stage['completed_at']))
+            self._conn.executemany(
+                "INSERT INTO tasks (project_id, stage_position, position, id, name, description, assignee, "
+                "status, created_at, completed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(project['id'], stage_position, position, task['id'], task['name'], task['description'],
+                  task['assignee'], task['status'], task['created_at'], task['completed_at'])
+                 for position, task in enumerate(stage['tasks'])])
+
+    def _delete_project(self, project_id: str):
+        self._conn.execute("DELETE FROM tasks WHERE project_id = ?", (project_id,))
+        self._conn.execute("DELETE FROM stages WHERE project_id = ?", (project_id,))
+        self._conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+
+    def _put_category(self, category: Dict):
+        self._conn.execute(
+            "INSERT INTO categories (id, name, description, color, created_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET name = excluded.name, description = excluded.description, "
+            "color = excluded.color, created_at = excluded.created_at",
+            (category['id'], category['name'], category.get('description', ''),
+             category.get('color', '#007bff'), category.get('created_at')))
+
+    def _put_template(self, template: Dict):
+        self._conn.execute(
+            "INSERT INTO templates (id, name, body) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET name = excluded.name, body = excluded.body",
+            (template['id'], template.get('name'), json.dumps(template, default=str)))
+
+    def _put_setting(self, key: str, value):
+        self._conn.execute(
+            "INSERT INTO settings (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value, default=str)))
+
+
+def read_summary(path: str) -> Dict:
+    """Project and category counts and the metadata of a project file.
+
+    Unlike opening a store this never writes: JSON files are only parsed and
+    SQLite databases are opened read-only, without creating the schema.
+    """
+    try:
+        if path.lower().endswith(SQLITE_EXTENSIONS):
+            return _read_sqlite_summary(path)
+        with open(path, 'r') as f:
+            content = f.read().strip()
+        data = json.loads(content) if content else {}
+    except (OSError, ValueError) as e:
+        raise StoreError(f"Could not read {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise StoreError(f"{path} is not a project file")
+    metadata = data.get('metadata')
+    return {
+        'projects': len(data.get('projects') or {}),
+        'categories': len(data.get('categories') or {}),
+        'metadata': metadata if isinstance(metadata, dict) else {}
+    }
+
+
+def _read_sqlite_summary(path: str) -> Dict:
+    try:
+        conn = sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True)
+    except sqlite3.Error as e:
+        raise StoreError(f"Could not open {path}: {e}") from e
+    try:
+        row = conn.execute("SELECT value FROM settings WHERE key = 'metadata'").fetchone()
+        return {
+            'projects': conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0],
+            'categories': conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0],
+            'metadata': json.loads(row[0]) if row else {}
+        }
+    except (sqlite3.Error, ValueError) as e:
+        raise StoreError(f"{path} is not a project database: {e}") from e
+    finally:
+        conn.close()
+
+
+def open_store(path: str) -> ProjectStore:
+    """Pick a backend from the file extension (.db/.sqlite use SQLite)"""
+    if path.lower().endswith(SQLITE_EXTENSIONS):
+        return SQLiteStore(path)
+    return JSONFileStore(path)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Reader-writer lock guarding a ProjectManager's data
+Any number of threads may read at once; a writer has the data to itself
+"""
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class RWLock:
+    """Shared (read) / exclusive (write) lock, re-entrant for both kinds.
+
+    Writers are preferred: once one is waiting, threads asking for a new
+    read lock wait behind it, so a stream of readers cannot starve writes.
+    A thread holding the write lock may also take read locks. Upgrading a
+    read lock to a write lock raises RuntimeError, because two threads
+    doing that at once would wait for each other forever.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        # thread id -> read depth of every thread holding a read lock
+        self._readers: Dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer != me and me not in self._readers:
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+            self._readers[me] = self._readers.get(me, 0) + 1
+
+    def release_read(self):
+        me = threading.get_ident()
+        with self._cond:
+            depth = self._readers[me] - 1
+            if depth:
+                self._readers[me] = depth
+                return
+            del self._readers[me]
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        with self._cond:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Write lock released by a thread that does not hold it")
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def held_by_current_thread(self) -> bool:
+        me = threading.get_ident()
+        return self._writer == me or me in self._readers
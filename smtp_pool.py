@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Pool of authenticated SMTP sessions for notification emails
+Sessions are kept open between messages, so a burst of notifications pays
+for one connect, STARTTLS and login instead of one per message
+"""
+import logging
+import smtplib
+import threading
+import time
+from typing import List
+
+
+# Errors after which a session can't be trusted any more; others, such as a
+# refused recipient, only concern the message being sent
+_BROKEN_SESSION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPHeloError, OSError)
+
+
+class SMTPConnectionPool:
+    """Up to ``max_connections`` SMTP sessions shared by the notification workers.
+
+    A session unused for ``idle_timeout`` seconds is closed instead of being
+    reused. A message whose session turns out to be broken is retried once
+    on a fresh connection. Waiting for a session while all of them are in use
+    gives up after ``timeout`` seconds.
+    """
+
+    def __init__(self, host: str, port: int, username: str = '', password: str = '', use_tls: bool = True,
+                 max_connections: int = 2, idle_timeout: float = 60.0, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.max_connections = max(1, max_connections)
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.connects = 0
+        # (session, time it was returned), most recently used last
+        self._idle = []
+        self._open = 0
+        self._cond = threading.Condition()
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            self._quit(smtp)
+            raise
+        with self._cond:
+            self.connects += 1
+        return smtp
+
+    @staticmethod
+    def _quit(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    def _checkout(self, fresh: bool = False) -> smtplib.SMTP:
+        """An idle session, or a new one; ``fresh`` closes the idle ones first"""
+        expired = []
+        deadline = time.monotonic() + self.timeout
+        try:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    while self._idle and (fresh or now - self._idle[0][1] > self.idle_timeout):
+                        expired.append(self._idle.pop(0)[0])
+                        self._open -= 1
+                    if self._idle:
+                        return self._idle.pop()[0]
+                    if self._open < self.max_connections:
+                        self._open += 1
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise TimeoutError(f"all {self.max_connections} SMTP sessions are busy")
+                    self._cond.wait(remaining)
+        finally:
+            for smtp in expired:
+                self._quit(smtp)
+        try:
+            return self._connect()
+        except Exception:
+            self._discard()
+            raise
+
+    def _checkin(self, smtp: smtplib.SMTP):
+        with self._cond:
+            self._idle.append((smtp, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, smtp: smtplib.SMTP = None):
+        if smtp is not None:
+            smtp.close()
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def send(self, messages: List) -> List[bool]:
+        """Send email.message.Message objects over one session; success of each"""
+        results = []
+        smtp = None
+        try:
+            for message in messages:
+                for attempt in (1, 2):
+                    if smtp is None:
+                        try:
+                            # A server that dropped a session has likely dropped the idle ones too
+                            smtp = self._checkout(fresh=attempt == 2)
+                        except Exception as e:
+                            logging.error(f"Error connecting to SMTP server {self.host}:{self.port}: {e}")
+                            return results + [False] * (len(messages) - len(results))
+                    try:
+                        smtp.send_message(message)
+                        results.append(True)
+                        break
+                    except _BROKEN_SESSION_ERRORS as e:
+                        self._discard(smtp)
+                        smtp = None
+                        if attempt == 2:
+                            logging.error(f"Error sending email '{message['Subject']}': {e}")
+                            results.append(False)
+                            break
+                        logging.info(f"SMTP session lost ({e}), reconnecting")
+                    except smtplib.SMTPException as e:
+                        logging.error(f"Error sending email '{message['Subject']}': {e}")
+                        results.append(False)
+                        break
+                    except Exception as e:
+                        # E.g. a header that can't be encoded; the session may be
+                        # left in the middle of a command, so it is not reused
+                        logging.error(f"Error sending email '{message['Subject']}': {e}")
+                        self._discard(smtp)
+                        smtp = None
+                        results.append(False)
+                        break
+        finally:
+            if smtp is not None:
+                self._checkin(smtp)
+        return results
+
+    def close(self):
+        """Close the idle sessions"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for smtp, _ in idle:
+            self._quit(smtp)
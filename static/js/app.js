@@ -9,14 +9,20 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
-    // Auto-refresh data every 30 seconds if on project detail page
+    // Refresh the project detail page when the project changes
     if (window.location.pathname.includes('/project/')) {
-        setInterval(function() {
+        const projectId = currentProjectId();
+        const refresh = debounce(function() {
             // Only refresh if no modals are open
             if (!document.querySelector('.modal.show')) {
                 refreshProjectData();
             }
-        }, 30000);
+        }, 250);
+        subscribeToChanges(event => {
+            if (!event.project_id || event.project_id === projectId) {
+                refresh();
+            }
+        }, refresh);
     }
 });
 
@@ -84,6 +90,78 @@ async function apiCall(url, options = {}) {
     }
 }
 
+// Conditional GET for polled endpoints: the server tags responses with the
+// data version, so unchanged data comes back as an empty 304 and the last
+// body is reused. Resolves to {data, changed}.
+const validatorCache = new Map();
+
+async function fetchJSON(url) {
+    const cached = validatorCache.get(url);
+    const response = await fetch(url, {
+        cache: 'no-store',
+        headers: cached ? { 'If-None-Match': cached.etag } : {}
+    });
+    
+    if (response.status === 304 && cached) {
+        return { data: cached.data, changed: false };
+    }
+    
+    const data = await response.json();
+    if (!response.ok) {
+        throw new Error(data.error || 'Request failed');
+    }
+    
+    const etag = response.headers.get('ETag');
+    if (etag) {
+        validatorCache.set(url, { etag: etag, data: data });
+    }
+    return { data: data, changed: true };
+}
+
+// Change feed: calls onEvent for every event from /api/events. While the
+// stream is unavailable, fallback is polled every interval milliseconds
+// instead, and run once more when the stream comes back.
+function subscribeToChanges(onEvent, fallback, interval = 30000) {
+    let pollTimer = null;
+    const startPolling = () => {
+        if (!pollTimer) {
+            pollTimer = setInterval(fallback, interval);
+        }
+    };
+    
+    if (typeof EventSource === 'undefined') {
+        startPolling();
+        return null;
+    }
+    
+    const source = new EventSource('/api/events');
+    source.onmessage = message => onEvent(JSON.parse(message.data));
+    source.onopen = () => {
+        if (pollTimer) {
+            clearInterval(pollTimer);
+            pollTimer = null;
+            fallback();
+        }
+    };
+    // EventSource reconnects by itself unless the server refused the stream
+    source.onerror = startPolling;
+    return source;
+}
+
+// Collapse a burst of calls (e.g. the events of one batch operation) into one
+function debounce(fn, delay) {
+    let timer = null;
+    return function() {
+        clearTimeout(timer);
+        timer = setTimeout(fn, delay);
+    };
+}
+
+function currentProjectId() {
+    const pathParts = window.location.pathname.split('/');
+    return pathParts[pathParts.length - 1];
+}
+
 // Project management functions
 async function createProject(name, description) {
     try {
@@ -159,12 +237,12 @@ async function advanceStage(projectId) {
 async function refreshProjectData() {
     try {
         // Get current project ID from URL
-        const pathParts = window.location.pathname.split('/');
-        const projectId = pathParts[pathParts.length - 1];
+        const projectId = currentProjectId();
         
         if (!projectId || projectId === 'project') return;
         
-        const projectData = await apiCall(`/api/project/${projectId}`);
+        const { data: projectData, changed } = await fetchJSON(`/api/project/${projectId}`);
+        if (!changed) return;
         
         // Update progress bars
         updateProgressBars(projectData);
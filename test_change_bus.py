@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the change bus and the /api/events stream
+"""
+import json
+import os
+import tempfile
+
+import web_app
+from change_bus import ChangeBus
+from project_manager import ProjectManager
+
+
+def _drain(subscription):
+    events = []
+    while True:
+        event = subscription.get(timeout=0)
+        if event is None:
+            return events
+        events.append(event)
+
+
+def test_bus_replay_and_overflow():
+    print("📣 Testing change bus")
+    print("=" * 50)
+
+    bus = ChangeBus(backlog=3, queue_size=2)
+    for i in range(4):
+        bus.publish('ping', n=i)
+    assert [e['n'] for e in _drain(bus.subscribe(last_event_id=2))] == [2, 3]
+    assert [e['type'] for e in _drain(bus.subscribe(last_event_id=0))] == ['resync']
+    assert [e['type'] for e in _drain(bus.subscribe(last_event_id=99))] == ['resync']
+    print("   ✅ Reconnecting subscribers get missed events or a resync")
+
+    slow = bus.subscribe()
+    for i in range(3):
+        bus.publish('ping', n=i)
+    assert [e['type'] for e in _drain(slow)] == ['resync'] and slow.overflowed
+    print("   ✅ Subscribers that fall behind are told to resync")
+
+
+def test_manager_events():
+    with tempfile.TemporaryDirectory() as tmp:
+        pm = ProjectManager(os.path.join(tmp, "projects.json"))
+        subscription = pm.bus.subscribe()
+        project = pm.create_project("Evented")
+        for task in project.stages[0].tasks:
+            task.complete()
+        project.advance_to_next_stage()
+        pm.save_project(project)
+        pm.delete_project(project.id)
+
+        events = _drain(subscription)
+        assert [e['type'] for e in events] == (
+            ['project_created', 'project_updated'] + ['task_completed'] * 3 +
+            ['stage_advanced', 'project_updated', 'project_deleted'])
+        assert events[5]['stage'] == project.stages[1].name
+        assert all(e['project_id'] == project.id for e in events)
+        assert events[-2]['version'] < events[-1]['version'] == pm.data_version
+        print("   ✅ Events are published once changes are recorded")
+
+
+def test_event_stream():
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = web_app._pm_instance
+        web_app._pm_instance = pm = ProjectManager(os.path.join(tmp, "projects.json"), bus=web_app._change_bus)
+        try:
+            response = web_app.app.test_client().get('/api/events')
+            assert response.mimetype == 'text/event-stream'
+            chunks = iter(response.response)
+            assert next(chunks) == b"retry: 3000\n\n"
+            project = pm.create_project("Streamed")
+            lines = next(chunks).decode().splitlines()
+            event = json.loads(lines[1][len("data: "):])
+            assert lines[0] == f"id: {event['id']}"
+            assert event['type'] == 'project_created' and event['project_id'] == project.id
+            response.close()
+            assert web_app._change_bus.subscriber_count == 0
+            print("   ✅ /api/events streams events and unsubscribes on disconnect")
+        finally:
+            web_app._pm_instance = previous
+
+
+if __name__ == "__main__":
+    test_bus_replay_and_overflow()
+    test_manager_events()
+    test_event_stream()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for notification retries with backoff and per-channel circuit breakers
+"""
+import os
+import tempfile
+import time
+
+import notification_system as notification_module
+import web_app
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, send_with_retry
+from notification_system import NotificationSystem
+from project_manager import ProjectManager
+
+
+def test_retry_with_backoff():
+    print("🔁 Testing retries and circuit breakers")
+    print("=" * 50)
+
+    calls, delays = [], []
+    outcomes = iter([[True, False, False], [False, True], [True]])
+
+    def send(items):
+        calls.append(items)
+        return next(outcomes)
+
+    breaker = CircuitBreaker('email', failure_threshold=2)
+    results = send_with_retry(send, ["a", "b", "c"], breaker, attempts=3, base_delay=1.0, max_delay=3.0,
+                              sleep=delays.append)
+    assert results == [True, True, True]
+    assert calls == [["a", "b", "c"], ["b", "c"], ["b"]]
+    assert len(delays) == 2 and 0 <= delays[0] <= 2.0 and 0 <= delays[1] <= 3.0
+    assert breaker.state == CLOSED
+    print("   ✅ Only failed items are retried, after jittered, capped delays")
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker('sms', failure_threshold=3, reset_timeout=0.05)
+    calls = []
+
+    def failing(items):
+        calls.append(items)
+        return [False] * len(items)
+
+    assert send_with_retry(failing, ["x"], breaker, attempts=5, sleep=lambda delay: None) == [False]
+    assert len(calls) == 3 and breaker.state == OPEN
+    assert send_with_retry(failing, ["y"], breaker, sleep=lambda delay: None) == [False]
+    assert len(calls) == 3
+    print("   ✅ An open breaker fails deliveries without trying the channel")
+
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # One trial at a time
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    time.sleep(0.06)
+    assert send_with_retry(lambda items: [True] * len(items), ["z"], breaker) == [True]
+    assert breaker.snapshot() == {'state': CLOSED, 'failures': 0, 'opened_at': None, 'retry_at': None}
+    print("   ✅ After the reset timeout one trial decides whether the channel is back")
+
+
+def test_system_status():
+    with tempfile.TemporaryDirectory() as tmp:
+        ns = NotificationSystem(os.path.join(tmp, "notification_config.json"))
+        ns.config['sms'].update(phone="+15550100", enabled=True)
+        ns.config['retry'].update(attempts=2, base_delay=0.001)
+        attempts = []
+        ns.send_sms = lambda message: attempts.append(message) and False
+        ns.breakers['sms'].failure_threshold = 2
+        previous = notification_module.notification_system, web_app._pm_instance
+        notification_module.notification_system = ns
+        web_app._pm_instance = ProjectManager(os.path.join(tmp, "projects.json"))
+        try:
+            for i in range(5):
+                ns.notify_system_error("Disk", f"Disk full {i}", "2026-10-17T10:00:00")
+            assert ns.dispatcher.join(5) and ns.breakers['sms'].state == OPEN
+            tried = len(attempts)
+            for i in range(5):
+                ns.notify_system_error("Disk", f"Still full {i}", "2026-10-17T10:05:00")
+            assert ns.dispatcher.join(5) and len(attempts) == tried
+            status = web_app.app.test_client().get('/api/system-status').json['notifications']
+            assert status['channels']['sms']['state'] == OPEN and status['channels']['email']['state'] == CLOSED
+            assert status['queue']['pending'] == 0 and status['queue']['failed'] == 10
+            print("   ✅ /api/system-status reports breaker states and queue depth")
+        finally:
+            ns.close()
+            notification_module.notification_system, web_app._pm_instance = previous
+
+
+if __name__ == "__main__":
+    test_retry_with_backoff()
+    test_circuit_breaker()
+    test_system_status()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact (slotted) model classes
+"""
+import os
+import tempfile
+
+from project_manager import ProjectManager, CompactProject, CompactTask
+
+
+def test_compact_models_round_trip():
+    print("🗜️  Testing compact models")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file)
+        project = pm.create_project("Round Trip", deadline="2030-01-01")
+        pm.create_project_from_template("Templated", template_id="agile")
+        project.stages[0].tasks[0].complete()
+        odd = project.stages[1].tasks[0]
+        odd.id, odd.created_at = "legacy-task-1", "2024-01-01T00:00:00.000000+00:00"
+        pm.save_project(project)
+        with open(data_file) as f:
+            original = f.read()
+
+        compact = ProjectManager(data_file, compact_models=True)
+        loaded = compact.get_project(project.id)
+        assert isinstance(loaded, CompactProject)
+        assert not hasattr(loaded.stages[0].tasks[0], '__dict__')
+        assert compact._encode_document() == original
+        print("   ✅ Compact models encode to the identical file")
+
+        assert compact.get_task("legacy-task-1")[2].created_at == "2024-01-01T00:00:00.000000+00:00"
+        assert compact.get_task(loaded.stages[0].tasks[0].id)[0] is loaded
+        print("   ✅ Ids and timestamps that don't pack are kept verbatim")
+
+        created = compact.create_project("Compact Created")
+        task = created.stages[0].tasks[0]
+        assert isinstance(task, CompactTask)
+        task.complete()
+        created.stages[0].add_task(created.stages[0].task_class("Extra", "", "Dana"))
+        compact.save_project(created)
+        reloaded = ProjectManager(data_file)
+        assert reloaded.get_project(created.id).to_dict() == created.to_dict()
+        assert reloaded.get_global_summary() == compact.get_global_summary()
+        print("   ✅ Projects created with compact models load as regular ones")
+
+
+if __name__ == "__main__":
+    test_compact_models_round_trip()
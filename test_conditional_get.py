@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for the data version and ETag / 304 handling of GET endpoints
+"""
+import os
+import tempfile
+
+import web_app
+from project_manager import ProjectManager
+
+
+def test_data_version():
+    print("🏷️  Testing data version")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file, write_behind=True, flush_delay=0.05)
+        version = pm.data_version
+        project = pm.create_project("Versioned")
+        assert pm.data_version > version
+        version = pm.data_version
+
+        pm.flush()
+        assert pm.data_version == version, "Writing out queued changes is not a change"
+        project.stages[0].tasks[0].complete()
+        pm.save_project(project)
+        assert pm.data_version > version
+        pm.close()
+
+        assert ProjectManager(data_file).data_version > pm.data_version
+        print("   ✅ Mutations bump the version, flushes and reloads never reuse one")
+
+
+def test_conditional_get():
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = web_app._pm_instance
+        web_app._pm_instance = pm = ProjectManager(os.path.join(tmp, "projects.json"))
+        try:
+            client = web_app.app.test_client()
+            project = pm.create_project("Cached")
+            response = client.get(f'/api/project/{project.id}')
+            etag = response.headers['ETag']
+            assert response.status_code == 200 and response.headers['Cache-Control'] == 'no-cache'
+
+            response = client.get(f'/api/project/{project.id}', headers={'If-None-Match': etag})
+            assert response.status_code == 304 and not response.data
+            print("   ✅ Unchanged data is answered with 304")
+
+            project.stages[0].tasks[0].complete()
+            pm.save_project(project)
+            response = client.get(f'/api/project/{project.id}', headers={'If-None-Match': etag})
+            assert response.status_code == 200 and response.json['stages'][0]['tasks'][0]['status'] == 'completed'
+            assert client.get('/api/project/missing').status_code == 404
+            print("   ✅ Changes and errors are served in full")
+        finally:
+            web_app._pm_instance = previous
+
+
+if __name__ == "__main__":
+    test_data_version()
+    test_conditional_get()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for deadline digests and the persisted sent-log
+"""
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+from notification_system import NotificationSystem
+from project_manager import ProjectManager
+
+
+def _in_days(days):
+    return (datetime.now() + timedelta(days=days, hours=1)).isoformat()
+
+
+def _notification_system(tmp, sent):
+    ns = NotificationSystem(os.path.join(tmp, "notification_config.json"))
+    ns.config['email'].update(address="team@example.com", enabled=True)
+
+    def dispatch(*message, reminders=None):
+        sent.append(message)
+        # As a successful delivery does
+        ns.sent_log.mark_sent(reminders['keys'], digest=reminders['digest'])
+    ns.dispatch = dispatch
+    return ns
+
+
+def _candidates(pm):
+    return pm.overdue_projects() + pm.upcoming_deadlines(4)
+
+
+def test_digest():
+    print("📰 Testing deadline digests")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pm = ProjectManager(os.path.join(tmp, "projects.json"))
+        pm.create_project("Late", deadline=_in_days(-3))
+        today = pm.create_project("Today", deadline=_in_days(0))
+        pm.create_project("Soon", deadline=_in_days(2))
+        later = pm.create_project("Later", deadline=_in_days(10))
+        sent = []
+        ns = _notification_system(tmp, sent)
+
+        assert ns.check_deadlines(_candidates(pm)) == 3
+        assert len(sent) == 1
+        subject, body, html_body, sms_message = sent[0]
+        assert subject == "⏰ Deadline Digest: 1 overdue, 2 due soon"
+        assert body.index("Late: overdue by 3 days") < body.index("Today: due today") < body.index("Soon: due in 2")
+        assert "Later" not in body and len(sms_message) <= 160
+        print("   ✅ Approaching and overdue deadlines go out as one message")
+
+        for _ in range(100):
+            ns.check_deadlines(_candidates(pm))
+        assert len(sent) == 1
+        assert _notification_system(tmp, sent).check_deadlines(_candidates(pm)) == 0
+        print("   ✅ 100 more sweeps, and a restart, send nothing new (300 messages before)")
+
+        later.deadline = _in_days(1)
+        assert ns.check_deadlines(_candidates(pm)) == 0
+        ns.sent_log.last_digest = (datetime.now() - timedelta(hours=25)).isoformat()
+        assert ns.check_deadlines(_candidates(pm)) == 1 and "Later: due in 1 day" in sent[-1][1]
+        print("   ✅ New reminders wait for the next digest period")
+
+        today.deadline = _in_days(-1)
+        ns.config['preferences']['deadline_digest'] = False
+        notified = []
+        ns.notify_deadline_approaching = lambda *args, reminder_key=None: notified.append(args)
+        assert ns.check_deadlines(_candidates(pm)) == 1 and notified[0][0] == "Today"
+        print("   ✅ Without digests each reminder is sent on its own, still only once")
+
+
+def test_reminders_recorded_on_delivery():
+    with tempfile.TemporaryDirectory() as tmp:
+        pm = ProjectManager(os.path.join(tmp, "projects.json"))
+        project = pm.create_project("Late", deadline=_in_days(-2))
+        ns = NotificationSystem(os.path.join(tmp, "notification_config.json"))
+        ns.config['email'].update(address="team@example.com", enabled=True)
+        ns.config['retry'].update(attempts=1)
+        release, outcomes, attempts = threading.Event(), [False, True], []
+
+        def send_email(**payload):
+            release.wait(5)
+            attempts.append(payload['subject'])
+            return outcomes[len(attempts) - 1]
+        ns.send_email = send_email
+        key = (project.id, project.deadline, 'overdue')
+        try:
+            assert ns.check_deadlines(_candidates(pm)) == 1
+            assert ns.check_deadlines(_candidates(pm)) == 0 and ns.reminders_recheck_at is not None
+            release.set()
+            assert ns.dispatcher.join(5) and len(attempts) == 1
+            assert not ns.sent_log.was_sent(key) and ns.sent_log.last_digest is None
+            print("   ✅ A reminder being sent is not queued twice, nor recorded before it went out")
+
+            assert ns.check_deadlines(_candidates(pm)) == 1
+            assert ns.dispatcher.join(5) and len(attempts) == 2
+            assert ns.sent_log.was_sent(key) and ns.sent_log.last_digest is not None
+            assert ns.check_deadlines(_candidates(pm)) == 0 and ns.reminders_recheck_at is None
+            print("   ✅ A failed reminder goes out with the next check and is recorded then")
+        finally:
+            ns.close()
+
+
+if __name__ == "__main__":
+    test_digest()
+    test_reminders_recorded_on_delivery()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the deadline index and the overdue / upcoming queries
+"""
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from project_manager import ProjectManager, Task
+
+
+def _in_days(days):
+    return (datetime.now() + timedelta(days=days)).isoformat()
+
+
+def test_deadline_queries():
+    print("⏰ Testing deadline index")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file, verify_counters=True)
+        late = pm.create_project("Late", deadline=_in_days(-2))
+        later = pm.create_project("Very late", deadline=_in_days(-10))
+        soon = pm.create_project("Soon", deadline=_in_days(1.5))
+        far = pm.create_project("Far", deadline="2999-01-01")
+        pm.create_project("No deadline")
+        pm.create_project("Bad deadline", deadline="someday")
+
+        assert pm.overdue_projects() == [later, late]
+        assert pm.upcoming_deadlines(3) == [soon]
+        assert pm.upcoming_deadlines(400000) == [soon, far]
+        assert late.is_overdue() and soon.days_until_deadline() == 1
+        print("   ✅ overdue_projects() and upcoming_deadlines()")
+
+        soon.deadline = _in_days(-1)
+        far.deadline = None
+        assert pm.overdue_projects() == [later, late, soon]
+        assert pm.upcoming_deadlines(400000) == []
+        done = pm.create_project("Done late", stage_names=["Only"], deadline=_in_days(-1))
+        done.stages[0].add_task(Task("Finish"))
+        done.stages[0].tasks[0].complete()
+        done.stages[0].complete()
+        assert done not in pm.overdue_projects()
+        pm.get_global_summary()
+        print("   ✅ Deadline edits and completed projects update the queries")
+
+        pm.save_data()
+        pm.delete_project(late.id)
+        for options in ({}, {'lazy': True}, {'compact_models': True}):
+            reloaded = ProjectManager(data_file, verify_counters=True, **options)
+            assert [p.name for p in reloaded.overdue_projects()] == ["Very late", "Soon"]
+            reloaded.get_global_summary()
+        print("   ✅ Deadline index rebuilt on load (eager, lazy and compact)")
+
+
+if __name__ == "__main__":
+    test_deadline_queries()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for the deadline scheduler and its timer heap
+"""
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from change_bus import ChangeBus
+from deadline_scheduler import DeadlineScheduler
+from notification_digest import reminder_times
+from notification_system import NotificationSystem
+from project_manager import ProjectManager
+
+DAY = 86400
+
+
+def test_reminder_times():
+    print("⏲️ Testing the deadline scheduler")
+    print("=" * 50)
+
+    now = 1_000_000.0
+    deadline = now + 2.5 * DAY
+    assert sorted(reminder_times([deadline], [3, 1, 0], now)) == [
+        deadline - 2 * DAY + 1, deadline - DAY + 1, deadline + 1]
+    assert reminder_times([now - DAY], [3, 1, 0], now) == []
+    print("   ✅ Threshold crossings are computed from the deadlines")
+
+
+def _wait_for(condition, timeout=3):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_scheduler_wakes_when_due():
+    bus = ChangeBus()
+    swept, looked_up = [], []
+    deadlines = {"p1": time.time() + 0.2}
+
+    def deadline_of(project_id):
+        looked_up.append(project_id)
+        return deadlines.get(project_id)
+
+    scheduler = DeadlineScheduler(lambda: swept.append(time.time()),
+                                  lambda: [(at, pid) for pid, at in deadlines.items()],
+                                  deadline_of, lambda deadline: [deadline - 30, deadline], bus).start()
+    try:
+        assert _wait_for(lambda: len(swept) == 2) and swept[1] >= deadlines["p1"]
+        assert scheduler.next_run is None and scheduler.plans == 1
+        print("   ✅ Sleeps until the next instant, with nothing to poll in between")
+
+        bus.publish('metadata_changed')
+        bus.publish('task_completed', project_id="p1")
+        assert _wait_for(lambda: looked_up == ["p1"])
+        time.sleep(0.05)
+        assert scheduler.plans == 1 and len(swept) == 2
+        print("   ✅ Changes that leave the deadlines alone neither sweep nor re-plan")
+
+        deadlines["p1"] = time.time() + 60
+        bus.publish('project_updated', project_id="p1")
+        assert _wait_for(lambda: scheduler.next_run == deadlines["p1"] - 30)
+        deadlines["p2"] = time.time() + 10  # Already past its first threshold
+        bus.publish('project_created', project_id="p2")
+        assert _wait_for(lambda: len(swept) == 3) and scheduler.next_run == deadlines["p2"]
+        del deadlines["p2"]
+        bus.publish('project_deleted', project_id="p2")
+        assert _wait_for(lambda: scheduler.next_run == deadlines["p1"] - 30)
+        assert scheduler.plans == 1 and len(swept) == 3
+        print("   ✅ Only the changed project is planned for, and swept if already due")
+
+        bus.publish('data_reloaded')
+        assert _wait_for(lambda: scheduler.plans == 2) and len(swept) == 4
+        print("   ✅ A reload plans for every deadline again")
+    finally:
+        scheduler.stop()
+    assert scheduler._thread is None
+
+
+def test_reminder_sent_at_crossing():
+    with tempfile.TemporaryDirectory() as tmp:
+        bus = ChangeBus()
+        pm = ProjectManager(os.path.join(tmp, "projects.json"), bus=bus)
+        ns = NotificationSystem(os.path.join(tmp, "notification_config.json"))
+        ns.config['email'].update(address="team@example.com", enabled=True)
+        ns.config['preferences']['deadline_digest'] = False
+        notified = []
+
+        def notify(name, deadline, days_left, reminder_key=None):
+            notified.append((name, days_left))
+            ns.sent_log.mark_sent([reminder_key])  # As a successful delivery does
+        ns.notify_deadline_approaching = notify
+        crossed = threading.Event()
+
+        def sweep():
+            held_until = ns.sweep_deadlines(pm)
+            if len(notified) == 2:
+                crossed.set()
+            return held_until
+
+        scheduler = DeadlineScheduler(sweep, pm.active_deadlines, pm.active_deadline, ns.threshold_crossings,
+                                      bus).start()
+        try:
+            # Tomorrow's threshold is crossed at once, the deadline day's 0.3s later
+            # (plus the second reminder_times() adds)
+            pm.create_project("Launch", deadline=datetime.fromtimestamp(time.time() + DAY + 0.3).isoformat())
+            assert crossed.wait(5)
+            assert notified == [("Launch", 1), ("Launch", 0)]
+            print("   ✅ A reminder goes out when its threshold is crossed")
+        finally:
+            scheduler.stop()
+
+
+if __name__ == "__main__":
+    test_reminder_times()
+    test_scheduler_wakes_when_due()
+    test_reminder_sent_at_crossing()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for dirty tracking and the incremental save cache
+"""
+import json
+import os
+import tempfile
+
+from project_manager import ProjectManager, Project, Task
+
+
+def test_dirty_flags_propagate():
+    print("🧹 Testing dirty tracking")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pm = ProjectManager(os.path.join(tmp, "projects.json"))
+        project = pm.create_project("Tracked Project")
+        assert not project._dirty, "A saved project should be clean"
+
+        task = project.stages[0].tasks[0]
+        task.complete()
+        assert task._dirty and project.stages[0]._dirty and project._dirty
+        print("   ✅ Task.complete() marks the task, stage and project dirty")
+
+        pm.save_data()
+        assert not task._dirty and not project._dirty
+        project.stages[1].add_task(Task("New task"))
+        assert project._dirty
+        for stage_task in project.stages[0].tasks:
+            stage_task.complete()
+        pm.save_data()
+        success, _ = project.advance_to_next_stage()
+        assert success and project._dirty
+        print("   ✅ Stage.add_task() and advance_to_next_stage() mark the project dirty")
+
+
+def test_incremental_save_matches_full_encode():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file)
+        projects = [pm.create_project(f"Project {i}", deadline="2030-01-01") for i in range(5)]
+
+        encoded = []
+        original_to_dict = Project.to_dict
+
+        def counting_to_dict(self):
+            encoded.append(self.id)
+            return original_to_dict(self)
+
+        Project.to_dict = counting_to_dict
+        try:
+            projects[2].stages[0].tasks[0].complete()
+            pm.save_data()
+        finally:
+            Project.to_dict = original_to_dict
+
+        assert encoded == [projects[2].id], f"Only the changed project should be re-encoded, got {encoded}"
+        with open(data_file) as f:
+            assert f.read() == json.dumps(pm._snapshot(), indent=2, default=str)
+        print("   ✅ Only changed projects are re-encoded and the file format is unchanged")
+
+
+if __name__ == "__main__":
+    test_dirty_flags_propagate()
+    test_incremental_save_matches_full_encode()
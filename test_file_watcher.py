@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script for the project file watcher
+Verifies external changes are detected and our own saves are recognised
+"""
+import os
+import tempfile
+import threading
+
+from file_watcher import FileWatcher
+from project_manager import ProjectManager
+
+
+def _wait_for_change(use_inotify):
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        ProjectManager(data_file).save_data()
+
+        changed = threading.Event()
+        watcher = FileWatcher([data_file], lambda path: changed.set(),
+                              poll_interval=0.1, use_inotify=use_inotify).start()
+        try:
+            other_process = ProjectManager(data_file)
+            other_process.create_project("Written elsewhere")
+            assert changed.wait(5), f"Change not detected in {watcher.mode} mode"
+        finally:
+            watcher.stop()
+        return watcher.mode
+
+
+def test_watcher_detects_external_writes():
+    print("👀 Testing file watcher")
+    print("=" * 50)
+    mode = _wait_for_change(use_inotify=True)
+    print(f"   ✅ Change detected ({mode})")
+    assert _wait_for_change(use_inotify=False) == 'polling'
+    print("   ✅ Change detected (polling fallback)")
+
+
+def test_store_tells_own_writes_apart():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file)
+        pm.create_project("Own write")
+        assert not pm.store.changed_externally()
+
+        ProjectManager(data_file).create_project("External write")
+        assert pm.store.changed_externally()
+    print("   ✅ Own saves are not mistaken for external changes")
+
+
+if __name__ == "__main__":
+    test_watcher_detects_external_writes()
+    test_store_tells_own_writes_apart()
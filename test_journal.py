@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for journal mode persistence
+Verifies mutations are appended to the journal and replayed on load
+"""
+import os
+import tempfile
+
+from project_manager import ProjectManager, Task
+
+
+def test_journal_replay():
+    print("📓 Testing journal mode")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file, journal=True)
+        pm.compact()
+        snapshot_size = os.path.getsize(data_file)
+
+        project = pm.create_project("Journaled Project", "Written through the journal")
+        project.stages[0].add_task(Task("Journaled task", "", "Alice"))
+        pm.save_project(project)
+        doomed = pm.create_project("Short-lived Project")
+        pm.delete_project(doomed.id)
+
+        assert os.path.getsize(data_file) == snapshot_size, "Snapshot should not be rewritten"
+        assert pm.journal.entries == 4
+        print(f"   ✅ {pm.journal.entries} records appended, snapshot untouched")
+
+        reloaded = ProjectManager(data_file, journal=True)
+        assert set(reloaded.projects) == {project.id}
+        task_names = [t.name for t in reloaded.get_project(project.id).stages[0].tasks]
+        assert "Journaled task" in task_names
+        print("   ✅ Snapshot + journal replayed on load")
+
+        reloaded.compact()
+        assert not os.path.exists(reloaded.journal.path)
+        assert set(ProjectManager(data_file).projects) == {project.id}
+        print("   ✅ Compaction folded the journal into the snapshot")
+
+
+def test_journal_compaction_threshold():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file, journal=True, journal_compact_threshold=3)
+        for i in range(5):
+            pm.create_project(f"Project {i}")
+
+        assert pm.journal.entries < 3
+        assert len(ProjectManager(data_file, journal=True).projects) == 5
+        print("   ✅ Journal compacts automatically at the threshold")
+
+
+if __name__ == "__main__":
+    test_journal_replay()
+    test_journal_compaction_threshold()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for lazy (on-demand) project hydration
+"""
+import os
+import tempfile
+
+from project_manager import ProjectManager, Project
+
+
+def test_lazy_load_hydrates_on_demand():
+    print("💤 Testing lazy loading")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file)
+        projects = [pm.create_project(f"Project {i}") for i in range(5)]
+        for task in projects[1].stages[0].tasks:
+            task.complete()
+        pm.save_project(projects[1])
+        with open(data_file) as f:
+            original = f.read()
+
+        lazy = ProjectManager(data_file, lazy=True, verify_counters=False)
+        assert len(lazy.projects) == 5 and lazy.projects.hydrated_count() == 0
+        assert lazy.get_global_summary() == pm.get_global_summary()
+        assert lazy._encode_document() == original
+        print("   ✅ Summary and saves work without building any project")
+
+        project = lazy.get_project(projects[2].id)
+        assert isinstance(project, Project) and lazy.projects.hydrated_count() == 1
+        assert lazy.get_project(projects[2].id) is project
+        task_id = projects[3].stages[0].tasks[0].id
+        assert lazy.get_task(task_id)[0].id == projects[3].id
+        assert lazy.projects.hydrated_count() == 2
+        print("   ✅ get_project() and get_task() hydrate only what they touch")
+
+        project.stages[0].tasks[0].complete()
+        lazy.save_project(project)
+        lazy.delete_project(projects[4].id)
+        lazy.verify_counters = True
+        assert len(lazy.list_projects()) == 4
+        lazy.get_global_summary()
+        reloaded = ProjectManager(data_file)
+        assert reloaded.get_project(project.id).stages[0].tasks[0].status.value == "completed"
+        assert projects[4].id not in reloaded.projects
+        print("   ✅ Changes to lazily loaded data are saved")
+
+
+def test_lazy_load_from_sqlite_with_compact_models():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.db")
+        pm = ProjectManager(data_file)
+        project = pm.create_project("SQLite Project")
+        pm.close()
+
+        lazy = ProjectManager(data_file, lazy=True, compact_models=True)
+        task_id = project.stages[0].tasks[0].id
+        assert lazy.get_task(task_id)[2].name == project.stages[0].tasks[0].name
+        assert lazy.get_project(project.id).to_dict() == project.to_dict()
+        lazy.close()
+    print("   ✅ Lazy loading works with the SQLite store and compact models")
+
+
+if __name__ == "__main__":
+    test_lazy_load_hydrates_on_demand()
+    test_lazy_load_from_sqlite_with_compact_models()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for asynchronous notification dispatch (worker pool, backpressure, spool)
+"""
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from notification_queue import FILE_LOCKING_AVAILABLE, NotificationQueue, pending_jobs
+from notification_system import NotificationSystem
+
+
+def _notification_system(tmp):
+    ns = NotificationSystem(os.path.join(tmp, "notification_config.json"))
+    ns.config['email'].update(address="team@example.com", enabled=True)
+    ns.config['sms'].update(phone="+15550100", enabled=True)
+    return ns
+
+
+def test_notify_returns_immediately():
+    print("📬 Testing notification dispatch")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ns = _notification_system(tmp)
+        sent = []
+
+        def slow_send(channel):
+            def send(**payload):
+                time.sleep(0.2)
+                sent.append((channel, payload))
+                return True
+            return send
+        ns.send_email, ns.send_sms = slow_send('email'), slow_send('sms')
+
+        started = time.monotonic()
+        ns.notify_project_completed("Launch", "2026-10-17")
+        ns.notify_system_error("Disk", "Disk full", "2026-10-17T10:00:00")
+        assert time.monotonic() - started < 0.1
+        assert ns.dispatcher.join(5)
+        assert sorted(channel for channel, _ in sent) == ['email', 'email', 'sms', 'sms']
+        assert any(payload.get('subject') == "🎉 Project Completed: Launch" for _, payload in sent)
+        assert ns.dispatcher.stats()['delivered'] == 4
+        assert not os.path.exists(ns.spool_file)
+        ns.close()
+        print("   ✅ notify_* queue their deliveries and return at once")
+
+
+def test_backpressure():
+    sending, release = threading.Event(), threading.Event()
+    queue = NotificationQueue(lambda job: sending.set() or release.wait(5), workers=1, max_pending=2,
+                              full_timeout=0.05)
+    try:
+        assert queue.submit('sms', message="0") and sending.wait(5)
+        assert queue.submit('sms', message="1") and queue.submit('sms', message="2")
+        assert not queue.submit('sms', message="overflow")
+        assert queue.stats()['dropped'] == 1 and queue.pending == 3
+        print("   ✅ A full queue drops deliveries after a bounded wait")
+    finally:
+        release.set()
+    assert queue.join(5) and queue.stats()['delivered'] == 3
+    queue.close()
+
+
+def test_spool_survives_restart():
+    with tempfile.TemporaryDirectory() as tmp:
+        spool_file = os.path.join(tmp, "notification_config.json.spool")
+        sending = threading.Event()
+        queue = NotificationQueue(lambda job: sending.set() or time.sleep(0.2) or True,
+                                  spool_file=spool_file, workers=1)
+        for i in range(3):
+            queue.submit('sms', message=f"Reminder {i}")
+        assert sending.wait(5)
+        queue.close()  # Stops after the delivery in progress
+
+        delivered = []
+        resumed = NotificationQueue(lambda job: delivered.append(job['payload']['message']) or True,
+                                    spool_file=spool_file)
+        assert resumed.join(5)
+        assert delivered == ["Reminder 1", "Reminder 2"]
+        resumed.close()
+        assert os.listdir(tmp) == []
+        print("   ✅ Undelivered notifications are sent after a restart")
+
+
+def test_spool_per_process():
+    with tempfile.TemporaryDirectory() as tmp:
+        spool_file = os.path.join(tmp, "notification_config.json.spool")
+        release = threading.Event()
+        first_sent, second_sent = [], []
+        first = NotificationQueue(lambda job: release.wait(5) and first_sent.append(job['id']) or True,
+                                  spool_file=spool_file, workers=1)
+        jobs = [first.submit('sms', message=f"First {i}") for i in range(3)]
+        second = NotificationQueue(lambda job: second_sent.append(job['id']) or True, spool_file=spool_file)
+        second.submit('sms', message="Second")
+        try:
+            assert second.join(5) and len(second_sent) == 1
+            assert first.spool.path != second.spool.path and len(os.listdir(tmp)) == 2
+            assert len(pending_jobs(first.spool.path)) == 3, "A running queue's spool is never replayed or truncated"
+        finally:
+            release.set()
+        assert first.join(5) and len(first_sent) == 3 and all(jobs)
+        first.close()
+        second.close()
+        assert os.listdir(tmp) == []
+        print("   ✅ Each queue keeps its own spool and leaves the others' alone")
+
+        if not FILE_LOCKING_AVAILABLE:
+            return
+        # A worker process that dies mid-delivery leaves its spool for the next queue
+        process = multiprocessing.get_context('fork').Process(target=_crash_while_sending, args=(spool_file,))
+        process.start()
+        process.join(10)
+        assert len(os.listdir(tmp)) == 1
+        resumed_sent = []
+        resumed = NotificationQueue(lambda job: resumed_sent.append(job['payload']['message']) or True,
+                                    spool_file=spool_file)
+        assert resumed.join(5) and sorted(resumed_sent) == ["Crashed 0", "Crashed 1"]
+        resumed.close()
+        assert os.listdir(tmp) == []
+        print("   ✅ The spool of a process that died is claimed by the next one")
+
+
+def _crash_while_sending(spool_file):
+    submitted = threading.Event()
+    queue = NotificationQueue(lambda job: submitted.wait(5) and os._exit(0), spool_file=spool_file, workers=1)
+    queue.submit('sms', message="Crashed 0")
+    queue.submit('sms', message="Crashed 1")
+    submitted.set()
+    time.sleep(5)
+
+
+if __name__ == "__main__":
+    test_notify_returns_immediately()
+    test_backpressure()
+    test_spool_survives_restart()
+    test_spool_per_process()
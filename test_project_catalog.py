@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the project file catalog behind /api/project-files
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+
+import project_catalog
+import web_app
+from file_watcher import file_signature
+from project_catalog import ProjectFileCatalog
+from project_manager import ProjectManager
+from project_store import StoreError, open_store, read_summary
+
+
+def test_read_summary_has_no_side_effects():
+    print("🗂️ Testing project file catalog")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = os.path.join(tmp, "work.json")
+        pm = ProjectManager(json_file)
+        pm.create_project("One")
+        pm.create_project("Two")
+        pm.set_subtitle("Work")
+        signature = file_signature(json_file)
+        summary = read_summary(json_file)
+        assert summary['projects'] == 2 and summary['categories'] == 1
+        assert summary['metadata']['subtitle'] == "Work"
+        assert file_signature(json_file) == signature
+
+        db_file = os.path.join(tmp, "work.db")
+        store = open_store(db_file)
+        store.save(open_store(json_file).load())
+        store.close()
+        assert read_summary(db_file)['projects'] == 2
+
+        other = os.path.join(tmp, "other.db")
+        conn = sqlite3.connect(other)
+        conn.execute("CREATE TABLE notes (text TEXT)")
+        conn.commit()
+        conn.close()
+        try:
+            read_summary(other)
+            assert False, "not a project database"
+        except StoreError:
+            pass
+        conn = sqlite3.connect(other)
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        conn.close()
+        assert tables == ['notes']
+        print("   ✅ Summaries are read without writing to the files")
+
+
+def test_catalog_refresh():
+    with tempfile.TemporaryDirectory() as tmp:
+        ProjectManager(os.path.join(tmp, "a.json")).create_project("A")
+        with open(os.path.join(tmp, "broken.json"), 'w') as f:
+            f.write("{not json")
+
+        updated = threading.Event()
+        catalog = ProjectFileCatalog(tmp, on_update=lambda generation: updated.set())
+        entries = {e['name']: e for e in catalog.entries()}
+        assert entries['a.json']['projects'] is None and entries['a.json']['stale']
+        assert updated.wait(5)
+        entries = {e['name']: e for e in catalog.entries()}
+        assert entries['a.json']['projects'] == 1 and not entries['a.json']['stale']
+        assert 'error' in entries['broken.json']
+        assert catalog.generation == 1
+        print("   ✅ New files are summarized in the background")
+
+        reads = []
+        original = project_catalog.read_summary
+        project_catalog.read_summary = lambda path: reads.append(path) or original(path)
+        try:
+            assert not catalog.refresh()
+            os.remove(os.path.join(tmp, "broken.json"))
+            ProjectManager(os.path.join(tmp, "a.json")).create_project("B")
+            assert [e['stale'] for e in catalog.entries()] == [True]
+            catalog.refresh()
+        finally:
+            project_catalog.read_summary = original
+        assert reads == [os.path.join(tmp, "a.json")] * len(reads) and reads
+        assert catalog.entries()[0]['projects'] == 2
+        print("   ✅ Only changed files are read again")
+
+
+def test_project_files_api():
+    with tempfile.TemporaryDirectory() as tmp:
+        ProjectManager(os.path.join(tmp, "other.json")).create_project("Elsewhere")
+        previous = web_app._pm_instance, web_app._file_catalog, web_app._current_project_file
+        web_app._pm_instance = pm = ProjectManager(os.path.join(tmp, "current.json"))
+        web_app._file_catalog = catalog = ProjectFileCatalog(tmp)
+        web_app._current_project_file = "current.json"
+        try:
+            client = web_app.app.test_client()
+            catalog.refresh()
+            pm.create_project("Open")
+            files = client.get('/api/project-files').json['files']
+            assert [(f['name'], f['projects'], f['is_current']) for f in files] == [
+                ("current.json", 1, True), ("other.json", 1, False)]
+            print("   ✅ /api/project-files combines the catalog with the open file")
+        finally:
+            web_app._pm_instance, web_app._file_catalog, web_app._current_project_file = previous
+
+
+if __name__ == "__main__":
+    test_read_summary_has_no_side_effects()
+    test_catalog_refresh()
+    test_project_files_api()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for filtering, field projection and pagination of /api/projects
+"""
+import os
+import tempfile
+
+import web_app
+from project_manager import ProjectManager, Project
+
+
+def test_project_listing():
+    print("📄 Testing /api/projects listing")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = web_app._pm_instance
+        web_app._pm_instance = pm = ProjectManager(os.path.join(tmp, "projects.json"))
+        try:
+            client = web_app.app.test_client()
+            work = pm.create_category("Work")
+            projects = [pm.create_project(f"Project {i}", category_id=work.id if i % 2 else None,
+                                          deadline="2000-01-01" if i == 3 else None) for i in range(7)]
+            done = projects[5]
+            for stage in done.stages:
+                for task in stage.tasks:
+                    task.complete()
+                done.advance_to_next_stage()
+            pm.save_project(done)
+
+            assert client.get('/api/projects').json == [p.to_dict() for p in pm.list_projects()]
+            print("   ✅ Without arguments the full listing is unchanged")
+
+            names = lambda response: [p['name'] for p in response.json]
+            assert names(client.get(f'/api/projects?category={work.id}')) == ["Project 1", "Project 3", "Project 5"]
+            assert names(client.get(f'/api/projects?category={work.id}&status=active')) == ["Project 1", "Project 3"]
+            assert names(client.get('/api/projects?overdue=true')) == ["Project 3"]
+            assert names(client.get('/api/projects?q=PROJECT 6')) == ["Project 6"]
+            assert client.get('/api/projects?status=paused').status_code == 400
+            print("   ✅ Category, status, overdue and text filters")
+
+            summary = client.get('/api/projects?fields=summary&status=completed').json
+            assert len(summary) == 1 and 'stages' not in summary[0]
+            assert summary[0]['is_completed'] and summary[0]['completed_tasks'] == summary[0]['task_count']
+            assert client.get('/api/projects?fields=id,name').json[0] == {'id': projects[0].id, 'name': "Project 0"}
+            assert client.get('/api/projects?fields=tasks').status_code == 400
+            print("   ✅ Field projection and summary listing")
+
+            seen, cursor = [], None
+            while True:
+                page = client.get('/api/projects', query_string={'limit': 3, 'fields': 'id', 'cursor': cursor or ''}).json
+                assert page['total'] == 7
+                seen += [p['id'] for p in page['projects']]
+                cursor = page['next_cursor']
+                if cursor is None:
+                    break
+                if len(seen) == 3:
+                    # Projects added or removed meanwhile don't shift the next page
+                    pm.delete_project(projects[1].id)
+                    late = Project("Late")
+                    pm.register_project(late)
+            assert seen == [p.id for p in projects] + [late.id]
+            assert client.get('/api/projects?cursor=bogus').status_code == 400
+            print("   ✅ Keyset pagination with cursors")
+
+            tags = {url: client.get(url).headers['ETag'] for url in
+                    ('/api/projects', '/api/projects?overdue=true', '/api/projects?fields=id,days_until_deadline')}
+            clock = web_app.deadline_clock
+            web_app.deadline_clock = lambda: clock() + 1
+            try:
+                status = {url: client.get(url, headers={'If-None-Match': tag}).status_code for url, tag in tags.items()}
+            finally:
+                web_app.deadline_clock = clock
+            assert status == {'/api/projects': 304, '/api/projects?overdue=true': 200,
+                              '/api/projects?fields=id,days_until_deadline': 200}
+            print("   ✅ Listings that depend on the time are not served from a stale ETag")
+        finally:
+            web_app._pm_instance = previous
+
+
+def test_listing_pages_hydrate_only_the_page():
+    print("📄 Testing /api/projects pages of a lazily loaded portfolio")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file)
+        projects = [pm.create_project(f"Project {i}", description="needle" if i % 3 == 0 else "")
+                    for i in range(10)]
+        pm.save_data()
+
+        previous = web_app._pm_instance
+        web_app._pm_instance = lazy = ProjectManager(data_file, lazy=True, verify_counters=False)
+        try:
+            client = web_app.app.test_client()
+            page = client.get('/api/projects?limit=3&fields=id').json
+            assert [p['id'] for p in page['projects']] == [p.id for p in projects[:3]]
+            assert page['total'] == 10 and lazy.projects.hydrated_count() == 3
+            page = client.get('/api/projects', query_string={'limit': 3, 'fields': 'id', 'cursor': page['next_cursor']}).json
+            assert [p['id'] for p in page['projects']] == [p.id for p in projects[3:6]]
+            assert lazy.projects.hydrated_count() == 6
+            print("   ✅ A page builds only its own projects")
+
+            page = client.get('/api/projects?limit=2&fields=name&q=NEEDLE').json
+            assert [p['name'] for p in page['projects']] == ["Project 0", "Project 3"]
+            assert page['total'] == 4 and page['next_cursor']
+            page = client.get('/api/projects', query_string={'limit': 2, 'fields': 'name', 'q': 'needle',
+                                                             'cursor': page['next_cursor']}).json
+            assert [p['name'] for p in page['projects']] == ["Project 6", "Project 9"]
+            assert page['next_cursor'] is None and lazy.projects.hydrated_count() == 8
+            print("   ✅ Text search pages skip non-matching projects without building them")
+        finally:
+            web_app._pm_instance = previous
+
+
+if __name__ == "__main__":
+    test_project_listing()
+    test_listing_pages_hydrate_only_the_page()
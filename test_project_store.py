@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the pluggable storage backends
+Verifies the JSON and SQLite stores hold the same data
+"""
+import os
+import tempfile
+
+from project_manager import ProjectManager, Task
+from project_store import JSONFileStore, SQLiteStore, open_store
+
+
+def test_open_store_by_extension():
+    with tempfile.TemporaryDirectory() as tmp:
+        assert isinstance(open_store(os.path.join(tmp, "projects.json")), JSONFileStore)
+        store = open_store(os.path.join(tmp, "projects.db"))
+        assert isinstance(store, SQLiteStore)
+        store.close()
+    print("   ✅ Backend picked from the file extension")
+
+
+def test_sqlite_round_trip():
+    print("🗄️  Testing SQLite storage backend")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(json_file)
+        category = pm.create_category("Research", "R&D", "#ffc107")
+        project = pm.create_project("Stored Project", "Round trip", deadline="2030-01-01", category_id=category.id)
+        project.stages[0].add_task(Task("Extra task", "Added later", "Carol"))
+        project.stages[0].tasks[0].complete()
+        pm.save_project(project)
+        pm.create_template("Custom", "Custom template", [{"name": "Only", "tasks": ["One"]}])
+        pm.set_subtitle("Stored subtitle")
+
+        db_file = os.path.join(tmp, "projects.db")
+        store = open_store(db_file)
+        store.save(JSONFileStore(json_file).load())
+        store.close()
+
+        db_pm = ProjectManager(db_file)
+        assert db_pm.store.supports_incremental
+        assert db_pm.get_project(project.id).to_dict() == project.to_dict()
+        assert db_pm.get_category(category.id).to_dict() == category.to_dict()
+        assert db_pm.templates == pm.templates
+        assert db_pm.default_category_id == pm.default_category_id
+        assert db_pm.get_subtitle() == "Stored subtitle"
+        print("   ✅ JSON document round-trips through SQLite")
+
+        second = db_pm.create_project("Second Project")
+        db_pm.delete_project(project.id)
+        db_pm.store.close()
+
+        reloaded = ProjectManager(db_file)
+        assert set(reloaded.projects) == {second.id}
+        assert reloaded.store.count_projects() == 1
+        assert reloaded.store.load_project(second.id)['name'] == "Second Project"
+        task_id = second.stages[0].tasks[0].id
+        assert reloaded.store.find_task_project(task_id) == second.id
+        reloaded.store.close()
+        print("   ✅ Incremental updates and indexed lookups work")
+
+
+if __name__ == "__main__":
+    test_open_store_by_extension()
+    test_sqlite_round_trip()
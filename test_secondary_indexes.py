@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for the category, completion, assignee and task status indexes
+"""
+import os
+import tempfile
+
+from project_manager import ProjectManager, Project, Task, TaskStatus
+
+
+def test_secondary_indexes():
+    print("🗂️  Testing secondary indexes")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file, verify_counters=True)
+        web = pm.create_category("Web")
+        mobile = pm.create_category("Mobile")
+        site = pm.create_project("Site", category_id=web.id)
+        app = pm.create_project("App", category_id=mobile.id)
+        done = pm.create_project("Done", stage_names=["Only"], category_id=web.id)
+        done.stages[0].add_task(Task("Ship it", "", "Dana"))
+        done.stages[0].tasks[0].complete()
+        done.stages[0].complete()
+
+        assert [p.name for p in pm.get_projects_by_category(web.id)] == ["Done", "Site"]
+        assert pm.count_projects_by_category()[web.id] == 2
+        assert pm.count_projects_by_category(completed=True)[web.id] == 1
+        assert pm.get_completed_projects() == [done]
+        assert {p.name for p in pm.get_active_projects()} == {"Site", "App"}
+        pm.get_global_summary()
+        print("   ✅ Category and completion indexes")
+
+        pm.assign_project_to_category(app.id, web.id)
+        site.category_id = mobile.id
+        assert {p.name for p in pm.get_projects_by_category(web.id)} == {"Done", "App"}
+        pm.delete_category(mobile.id)
+        assert site not in pm.get_projects_by_category(mobile.id)
+        pm.get_global_summary()
+        print("   ✅ Category changes and deletions update the index")
+
+        task = app.stages[0].tasks[0]
+        task.assignee = "Lee"
+        task.status = TaskStatus.BLOCKED
+        assert pm.get_tasks_by_assignee("Lee") == [(app, app.stages[0], task)]
+        assert [entry[2] for entry in pm.get_tasks_by_status(TaskStatus.BLOCKED)] == [task]
+        assert [entry[2].name for entry in pm.get_tasks_by_assignee("Dana")] == ["Ship it"]
+        pm.save_project(app)
+        print("   ✅ Assignee and task status indexes")
+
+        for options in ({}, {'lazy': True}, {'compact_models': True}):
+            reloaded = ProjectManager(data_file, **options)
+            assert reloaded.count_projects_by_category() == pm.count_projects_by_category()
+            assert [entry[2].id for entry in reloaded.get_tasks_by_status(TaskStatus.BLOCKED)] == [task.id]
+            assert reloaded.get_tasks_by_assignee("Lee")[0][0].id == app.id
+            reloaded.verify_counters = True
+            reloaded.get_global_summary()
+        print("   ✅ Indexes rebuilt on load (eager, lazy and compact)")
+
+        pm.register_project(Project.from_dict(app.to_dict()))
+        pm.delete_project(app.id)
+        assert pm.get_tasks_by_assignee("Lee") == []
+        pm.get_global_summary()
+        print("   ✅ Replaced and deleted projects leave the indexes")
+
+
+if __name__ == "__main__":
+    test_secondary_indexes()
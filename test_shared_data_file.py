@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test script for several processes sharing one data file (generations and merges)
+"""
+import json
+import multiprocessing
+import os
+import tempfile
+
+import web_app
+from project_manager import ProjectManager
+from project_store import FILE_LOCKING_AVAILABLE
+
+
+def _events(pm):
+    subscription = pm.bus.subscribe()
+    events = []
+
+    def drain():
+        while True:
+            event = subscription.get(timeout=0)
+            if event is None:
+                return events
+            events.append(event)
+    return drain
+
+
+def test_merge_between_managers():
+    print("🤝 Testing shared data files")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        setup = ProjectManager(data_file)
+        kept, edited, removed = (setup.create_project(name).id for name in ("Kept", "Edited", "Removed"))
+
+        a, b = ProjectManager(data_file), ProjectManager(data_file)
+        untouched = b.get_project(kept)
+        a.get_project(edited).name = "Edited in A"
+        a.save_project(a.get_project(edited))
+        a.delete_project(removed)
+        a.create_category("From A")
+        created = b.create_project("From B").id
+
+        with open(data_file) as f:
+            stored = json.load(f)
+        assert stored['generation'] == b.generation > a.generation
+        assert stored['revisions']['projects'][created] == b.generation
+        assert stored['revisions']['projects'][kept] < a.generation
+        assert {p['name'] for p in stored['projects'].values()} == {"Kept", "Edited in A", "From B"}
+        assert "From A" in {c['name'] for c in stored['categories'].values()}
+        print("   ✅ A stale write merges the other process's changes instead of overwriting them")
+
+        assert b.get_project(kept) is untouched
+        assert b.get_project(edited).name == "Edited in A" and b.get_project(removed) is None
+        assert any(c.name == "From A" for c in b.list_categories())
+        assert a.sync() and a.get_project(created).name == "From B"
+        assert not a.sync()
+        print("   ✅ Only the projects that changed elsewhere are reloaded")
+
+
+def test_conflicting_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        project_id = ProjectManager(data_file).create_project("Shared").id
+        a, b = ProjectManager(data_file), ProjectManager(data_file)
+        drain = _events(b)
+
+        a.get_project(project_id).name = "First"
+        a.save_project(a.get_project(project_id))
+        b.get_project(project_id).description = "Second"
+        b.save_project(b.get_project(project_id))
+
+        stored = ProjectManager(data_file).get_project(project_id)
+        assert (stored.name, stored.description) == ("First", "")
+        assert b.get_project(project_id).name == "First"
+        assert any(e['type'] == 'write_conflict' and e['item'] == project_id for e in drain())
+        print("   ✅ Conflicting stale writes are rejected; the first writer wins")
+
+
+def test_section_items_merge():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        ProjectManager(data_file)
+        a, b = ProjectManager(data_file), ProjectManager(data_file)
+        a.create_category("Cat A")
+        b.create_category("Cat B")
+        a.update_metadata(subtitle="Subtitle from A")
+        b.update_metadata(description="Description from B")
+        a.create_template("Template A", "", [])
+        assert b.create_template("Template B", "", []) and not b.write_conflicts
+
+        stored = ProjectManager(data_file)
+        assert {"Cat A", "Cat B"} <= {c.name for c in stored.list_categories()}
+        assert (stored.metadata['subtitle'], stored.metadata['description']) == ("Subtitle from A", "Description from B")
+        assert {"Template A", "Template B"} <= {t['name'] for t in stored.templates.values()}
+        print("   ✅ Categories, templates and metadata keys added by two processes are all kept")
+
+        a.sync()
+        category = next(c for c in a.list_categories() if c.name == "Cat A")
+        category.color = "#ff0000"
+        assert a.save_data()
+        b.categories[category.id].color = "#00ff00"
+        assert b.save_data() is False and b.write_conflicts == [f"categories.{category.id}"]
+        assert ProjectManager(data_file).categories[category.id].color == "#ff0000"
+        print("   ✅ A stale change to the same category is discarded and reported")
+
+
+def test_conflict_answers_409():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        project_id = ProjectManager(data_file).create_project("Shared").id
+        other, pm = ProjectManager(data_file), ProjectManager(data_file)
+        previous = web_app._pm_instance
+        web_app._pm_instance = pm
+        try:
+            client = web_app.app.test_client()
+            other.get_project(project_id).name = "Renamed elsewhere"
+            other.save_project(other.get_project(project_id))
+            response = client.post(f'/api/project/{project_id}/update', json={'name': "Renamed here"})
+            assert response.status_code == 409 and response.json['conflicts'] == [project_id]
+            assert pm.get_project(project_id).name == "Renamed elsewhere"
+            response = client.post(f'/api/project/{project_id}/update', json={'name': "Renamed here"})
+            assert response.status_code == 200
+            print("   ✅ A request whose change was discarded gets 409 Conflict")
+        finally:
+            web_app._pm_instance = previous
+
+
+def _create_projects(data_file, worker, count):
+    pm = ProjectManager(data_file)
+    for i in range(count):
+        pm.create_project(f"Worker {worker} #{i}")
+
+
+def test_concurrent_processes():
+    if not FILE_LOCKING_AVAILABLE:
+        print("   ⏭️ fcntl not available, skipping the multi-process test")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        ProjectManager(data_file)
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=_create_projects, args=(data_file, n, 10)) for n in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+            assert worker.exitcode == 0
+        names = {p.name for p in ProjectManager(data_file).projects.values()}
+        assert names == {f"Worker {n} #{i}" for n in range(4) for i in range(10)}
+        print("   ✅ Four processes writing at once lose no changes")
+
+
+if __name__ == "__main__":
+    test_merge_between_managers()
+    test_conflicting_writes()
+    test_section_items_merge()
+    test_conflict_answers_409()
+    test_concurrent_processes()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test script for pooled SMTP sessions, run against a local stand-in SMTP server
+"""
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from email.mime.text import MIMEText
+
+from notification_system import NotificationSystem
+from smtp_pool import SMTPConnectionPool
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO, AUTH PLAIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections.append(self.connection)
+        self.reply("220 stand-in ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250-stand-in\r\n250 AUTH PLAIN")
+            elif command.startswith("AUTH"):
+                with server.lock:
+                    server.logins += 1
+                self.reply("235 2.7.0 Authentication successful")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b".\r\n", b""):
+                        break
+                    lines.append(data.decode())
+                with server.lock:
+                    server.messages.append("".join(lines))
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class _StandInSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.connections, self.messages, self.logins = [], [], 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def drop_connections(self):
+        """Hang up on every client, as a server restart would"""
+        with self.lock:
+            connections, self.connections = self.connections, []
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self.drop_connections()
+
+
+def _message(subject):
+    msg = MIMEText("body")
+    msg['Subject'], msg['From'], msg['To'] = subject, "pm@example.com", "team@example.com"
+    return msg
+
+
+def test_pool_reuses_sessions():
+    print("📮 Testing pooled SMTP sessions")
+    print("=" * 50)
+
+    server = _StandInSMTPServer()
+    pool = SMTPConnectionPool('127.0.0.1', server.server_address[1], "pm", "secret", use_tls=False)
+    try:
+        assert pool.send([_message(f"Reminder {i}") for i in range(5)]) == [True] * 5
+        assert pool.send([_message("Another")]) == [True]
+        assert len(server.messages) == 6 and pool.connects == 1 and server.logins == 1
+        print("   ✅ One login serves a batch and the messages after it")
+
+        server.drop_connections()
+        assert pool.send([_message("After restart")]) == [True]
+        assert pool.connects == 2 and "Subject: After restart" in server.messages[-1]
+        print("   ✅ A dropped session is replaced and the message resent")
+
+        pool.idle_timeout = 0.05
+        time.sleep(0.1)
+        assert pool.send([_message("Later")]) == [True] and pool.connects == 3
+        print("   ✅ Idle sessions expire")
+    finally:
+        pool.close()
+        server.stop()
+    assert pool.send([_message("Server gone")]) == [False]
+
+
+class _UnencodableMessage(dict):
+    """Stands in for a message that fails to serialize with an error smtplib doesn't wrap"""
+
+
+def test_failed_messages_release_sessions():
+    server = _StandInSMTPServer()
+    pool = SMTPConnectionPool('127.0.0.1', server.server_address[1], use_tls=False, max_connections=1, timeout=0.5)
+    try:
+        broken = _UnencodableMessage(Subject="Broken")
+        for _ in range(3):
+            assert pool.send([broken, _message("After broken")]) == [False, True]
+        assert pool._open == 1 and len(server.messages) == 3
+        print("   ✅ A message failing with an unexpected error doesn't leak its session")
+
+        held = pool._checkout()
+        started = time.monotonic()
+        assert pool.send([_message("Pool busy")]) == [False]
+        assert time.monotonic() - started < 2
+        pool._checkin(held)
+        assert pool.send([_message("Pool free")]) == [True]
+        print("   ✅ Waiting for a busy pool gives up after the timeout")
+    finally:
+        pool.close()
+        server.stop()
+
+
+def test_notifications_batch_emails():
+    server = _StandInSMTPServer()
+    with tempfile.TemporaryDirectory() as tmp:
+        ns = NotificationSystem(os.path.join(tmp, "notification_config.json"))
+        ns.config['email'].update(address="team@example.com", enabled=True)
+        ns.config['smtp'].update(server='127.0.0.1', port=server.server_address[1], username="pm@example.com",
+                                 password="secret", use_tls=False)
+        ns.config['queue']['workers'] = 1
+        try:
+            for i in range(30):
+                ns.notify_deadline_approaching(f"Project {i}", "2026-10-20", 3)
+            assert ns.dispatcher.join(10)
+            assert len(server.messages) == 30 and ns.smtp_pool.connects == 1
+            assert ns.dispatcher.stats()['delivered'] == 30
+            print("   ✅ A deadline sweep's emails share one SMTP session")
+        finally:
+            ns.close()
+            server.stop()
+
+
+if __name__ == "__main__":
+    test_pool_reuses_sessions()
+    test_failed_messages_release_sessions()
+    test_notifications_batch_emails()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the streamed NDJSON exports
+"""
+import gzip
+import json
+import os
+import tempfile
+
+import web_app
+from project_manager import ProjectManager
+
+
+def _records(body):
+    return [json.loads(line) for line in body.decode().splitlines()]
+
+
+def test_streaming_export():
+    print("🚚 Testing streamed exports")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file)
+        pm.create_category("Work")
+        created = [pm.create_project(f"Project {i}").to_dict() for i in range(3)]
+
+        previous = web_app._pm_instance
+        # Lazy mode: projects never hydrated must be exported from their text
+        web_app._pm_instance = lazy = ProjectManager(data_file, lazy=True)
+        try:
+            client = web_app.app.test_client()
+            response = client.get('/api/export/all?format=ndjson')
+            assert response.is_streamed and response.mimetype == 'application/x-ndjson'
+            records = _records(response.data)
+            assert records[0]['export'] == 'all'
+            assert [r['project'] for r in records if 'project' in r] == created
+            assert records[-1] == {'end': {'projects': 3, 'categories': 2, 'templates': 3}}
+            assert lazy.projects.hydrated_count() == 0
+            print("   ✅ One record per line, lazy projects stay unhydrated")
+
+            response = client.get('/api/export/projects?format=ndjson&gzip=1')
+            assert response.mimetype == 'application/gzip'
+            assert 'projects-export-' in response.headers['Content-Disposition']
+            records = _records(gzip.decompress(response.data))
+            assert len(records) == 5 and records[-1] == {'end': {'projects': 3}}
+            print("   ✅ Gzip compressed on the fly")
+
+            assert 'projects' in client.get('/api/export/projects').json
+            print("   ✅ Plain JSON export unchanged")
+        finally:
+            web_app._pm_instance = previous
+
+
+def test_chunking():
+    lines = [f"{i:09d}\n" for i in range(1000)]
+    chunks = list(web_app.chunked(iter(lines), size=1000))
+    assert len(chunks) == 10 and b''.join(chunks).decode() == ''.join(lines)
+    assert gzip.decompress(b''.join(web_app.gzipped(iter(chunks)))) == b''.join(chunks)
+    print("   ✅ Output is written in bounded chunks")
+
+
+if __name__ == "__main__":
+    test_streaming_export()
+    test_chunking()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for streamed NDJSON imports (web API and CLI bulk import)
+"""
+import gzip
+import json
+import os
+import tempfile
+
+import web_app
+from cli import bulk_import
+from project_manager import ProjectManager
+
+
+def _export(pm):
+    return ''.join(web_app.export_records(pm, 'all')).encode()
+
+
+def test_streaming_import():
+    print("📥 Testing streamed imports")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = ProjectManager(os.path.join(tmp, "source.json"))
+        source.create_category("Imported category")
+        projects = [source.create_project(f"Project {i}").to_dict() for i in range(4)]
+        export = _export(source)
+
+        previous = web_app._pm_instance
+        web_app._pm_instance = target = ProjectManager(os.path.join(tmp, "target.json"))
+        try:
+            client = web_app.app.test_client()
+            response = client.post('/api/import/all', data=gzip.compress(export), content_type='application/gzip')
+            assert response.status_code == 200, response.json
+            assert response.json['imported_counts']['projects'] == 4
+            assert [target.get_project(p['id']).to_dict() for p in projects] == projects
+            assert any(c.name == "Imported category" for c in target.list_categories())
+            assert ProjectManager(os.path.join(tmp, "target.json")).get_project(projects[0]['id']) is not None
+            print("   ✅ Gzipped export round-trips through /api/import/all")
+
+            lines = export.decode().splitlines()
+            bad = dict(projects[1], id="bad-project", stages=[{'name': 'Broken', 'tasks': [{'name': 'x'}]}])
+            lines.insert(-1, json.dumps({'project': bad}))
+            lines.insert(-1, "{not json")
+            body = '\n'.join(lines).encode()
+            before = target.data_version
+            response = client.post('/api/import/projects', data=body, content_type='application/x-ndjson')
+            assert response.status_code == 422 and not response.json['committed']
+            errors = response.json['errors']
+            assert [e['line'] for e in errors[:2]] == [len(lines) - 2, len(lines) - 1]
+            assert "missing field 'description'" in errors[0]['error']
+            assert "Expected 4 project records, found 5" in errors[2]['error']
+            assert target.data_version == before and target.get_project("bad-project") is None
+            print("   ✅ Invalid records are reported by line and nothing is applied")
+
+            response = client.post('/api/import/projects?on_error=skip', data=body, content_type='application/x-ndjson')
+            assert response.status_code == 200 and response.json['imported_counts']['projects'] == 4
+            assert response.json['skipped'] == 5  # categories and templates
+            print("   ✅ on_error=skip imports the valid records")
+        finally:
+            web_app._pm_instance = previous
+
+
+def test_cli_bulk_import():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = ProjectManager(os.path.join(tmp, "source.json"))
+        ids = [source.create_project(f"Bulk {i}").id for i in range(20)]
+        export_file = os.path.join(tmp, "export.ndjson.gz")
+        with open(export_file, 'wb') as f:
+            f.write(gzip.compress(_export(source)))
+
+        data_file = os.path.join(tmp, "migrated.json")
+        assert bulk_import([export_file, "--data-file", data_file]) == 0
+        assert sorted(ProjectManager(data_file).projects) == sorted(ids)
+
+        with open(export_file, 'wb') as f:
+            f.write(_export(source).rsplit(b'\n', 3)[0])
+        assert bulk_import([export_file, "--data-file", os.path.join(tmp, "other.json")]) == 1
+        assert not ProjectManager(os.path.join(tmp, "other.json")).projects
+    print("   ✅ CLI bulk import, truncated input rejected")
+
+
+if __name__ == "__main__":
+    test_streaming_import()
+    test_cli_bulk_import()
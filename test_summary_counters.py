@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the incrementally maintained global summary counters
+"""
+import os
+import tempfile
+
+from project_manager import ProjectManager, Project, Task, TaskStatus
+
+
+def test_counters_track_mutations():
+    print("🧮 Testing summary counters")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file, verify_counters=True)
+        assert pm.get_global_summary()['total_projects'] == 0
+
+        project = pm.create_project("Counted Project")
+        templated = pm.create_project_from_template("Templated Project", template_id="agile")
+        empty = pm.create_project("Empty Stage Project", stage_names=["Backlog"])
+        bare = Project("Stageless Project")
+        pm.register_project(bare)
+        pm.get_global_summary()
+        print("   ✅ Counters match a full recount after creating projects")
+
+        for task in project.stages[0].tasks:
+            task.complete()
+        project.advance_to_next_stage()
+        project.stages[1].add_task(Task("Extra task"))
+        templated.stages[0].tasks[0].status = TaskStatus.IN_PROGRESS
+        templated.stages[0].tasks[1].complete()
+        templated.stages[0].tasks[1].status = TaskStatus.TODO
+        project.go_back_to_previous_stage()
+        summary = pm.get_global_summary()
+        assert summary['completed_tasks'] == len(project.stages[0].tasks)
+        print("   ✅ Task and stage transitions keep the counters in sync")
+
+        pm.register_project(Project.from_dict(dict(project.to_dict(), name="Imported copy")))
+        pm.delete_project(empty.id)
+        pm.delete_project(bare.id)
+        pm.save_data()
+        pm.get_global_summary()
+        print("   ✅ Imports and deletions keep the counters in sync")
+
+        reloaded = ProjectManager(data_file, verify_counters=True)
+        expected, actual = pm.get_global_summary(), reloaded.get_global_summary()
+        assert abs(expected.pop('overall_progress') - actual.pop('overall_progress')) < 1e-9
+        assert actual == expected
+        print("   ✅ Counters rebuilt on load")
+
+
+def test_progress_does_not_drift():
+    print("🧮 Testing progress after repeated toggles")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pm = ProjectManager(os.path.join(tmp, "projects.json"))
+        project = pm.create_project("Toggled Project", stage_names=["Plan", "Build", "Ship"])
+        for stage in project.stages:
+            for i in range(7):
+                stage.add_task(Task(f"{stage.name} task {i}"))
+        other = pm.create_project("Other Project")
+
+        tasks = [task for stage in project.stages for task in stage.tasks]
+        for i in range(2000):
+            task = tasks[i * 5 % len(tasks)]
+            if task.status == TaskStatus.COMPLETED:
+                task.status = TaskStatus.TODO
+            else:
+                task.complete()
+
+        maintained = project._counters()
+        totals = list(pm._totals)
+        project._recount()
+        assert project._counters() == maintained
+        assert project.get_overall_progress() == float(maintained[6])
+        fresh = [sum(column) for column in zip(project._counters(), other._counters())]
+        assert totals == fresh
+        print("   ✅ Maintained progress equals a fresh recount exactly")
+
+        for task in tasks:
+            task.complete()
+        assert project.get_overall_progress() == 1.0
+        assert pm.get_global_summary()['overall_progress'] == (1.0 + other.get_overall_progress()) / 2
+        print("   ✅ A fully completed project reports exactly 1.0")
+
+
+if __name__ == "__main__":
+    test_counters_track_mutations()
+    test_progress_does_not_drift()
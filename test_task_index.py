@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script for the task id index on ProjectManager
+"""
+import os
+import tempfile
+
+from project_manager import ProjectManager, Project, Task
+
+
+def test_task_index():
+    print("🔎 Testing task index")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file)
+        project = pm.create_project("Indexed Project")
+        templated = pm.create_project_from_template("Templated Project", template_id="agile")
+
+        default_task = project.stages[0].tasks[0]
+        assert pm.get_task(default_task.id) == (project, project.stages[0], default_task)
+        assert pm.get_task(templated.stages[1].tasks[0].id)[0] is templated
+        print("   ✅ Tasks of created projects are indexed")
+
+        added = Task("Added task", "", "Dana")
+        project.stages[2].add_task(added)
+        assert pm.get_task(added.id)[1] is project.stages[2]
+        print("   ✅ Stage.add_task() updates the index")
+
+        reloaded = ProjectManager(data_file)
+        assert reloaded.get_task(default_task.id)[2].name == default_task.name
+        print("   ✅ Index rebuilt on load")
+
+        imported = Project.from_dict(dict(project.to_dict(), name="Imported copy"))
+        pm.register_project(imported)
+        assert pm.get_task(default_task.id)[0] is imported
+        print("   ✅ Imported projects replace stale index entries")
+
+        pm.delete_project(project.id)
+        assert pm.get_task(default_task.id) is None
+        assert pm.get_task("missing") is None
+        print("   ✅ Deleted projects drop out of the index")
+
+
+if __name__ == "__main__":
+    test_task_index()
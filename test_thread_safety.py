@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for the reader-writer lock and concurrent use of the web API
+"""
+import os
+import tempfile
+import threading
+import time
+
+import web_app
+from project_manager import ProjectManager
+from rw_lock import RWLock
+
+
+def _in_thread(target):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_rw_lock():
+    print("🔒 Testing reader-writer locking")
+    print("=" * 50)
+
+    lock = RWLock()
+    both_reading = threading.Barrier(2, timeout=5)
+
+    def reader():
+        with lock.read():
+            both_reading.wait()
+    thread = _in_thread(reader)
+    reader()
+    thread.join()
+    print("   ✅ Readers share the lock")
+
+    events = []
+
+    def write():
+        with lock.write():
+            events.append('write')
+
+    def read():
+        with lock.read():
+            events.append('read')
+
+    with lock.read():
+        writer = _in_thread(write)
+        while not lock._writers_waiting:
+            time.sleep(0.001)
+        late_reader = _in_thread(read)
+        time.sleep(0.05)
+        with lock.read():
+            pass  # Re-entrant reads don't queue behind the waiting writer
+        assert events == []
+    writer.join(5)
+    late_reader.join(5)
+    assert events == ['write', 'read']
+    print("   ✅ Writers wait for readers, and new readers wait for writers")
+
+    with lock.write():
+        with lock.write(), lock.read():
+            pass
+    with lock.read():
+        try:
+            lock.acquire_write()
+            assert False, "upgrade must fail"
+        except RuntimeError:
+            pass
+    print("   ✅ Re-entrant writes, reads inside writes, no upgrades")
+
+
+def test_concurrent_requests():
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = web_app._pm_instance
+        web_app._pm_instance = pm = ProjectManager(os.path.join(tmp, "projects.json"), write_behind=True,
+                                                   flush_delay=0.01)
+        errors = []
+
+        def check(response, status=200):
+            if response.status_code != status:
+                errors.append((response.status_code, response.get_data(as_text=True)))
+            return response
+
+        def writer(n):
+            client = web_app.app.test_client()
+            for i in range(15):
+                project = check(client.post('/api/create_project', json={'name': f"W{n}-{i}"}), 201).json
+                for task in project['stages'][0]['tasks']:
+                    check(client.post(f"/api/task/{task['id']}/complete"))
+                if i % 3 == 0:
+                    check(client.delete(f"/api/project/{project['id']}/delete"))
+
+        def reader():
+            client = web_app.app.test_client()
+            for _ in range(30):
+                check(client.get('/api/projects'))
+                check(client.get('/api/summary'))
+                check(client.get('/api/projects?limit=5&fields=summary'))
+
+        try:
+            threads = [_in_thread(lambda n=n: writer(n)) for n in range(4)] + [_in_thread(reader) for _ in range(4)]
+            for thread in threads:
+                thread.join(60)
+            assert not errors, errors[:3]
+            assert len(pm.projects) == 4 * 10
+            pm._verify_counters()
+            pm.flush()
+            assert sorted(ProjectManager(os.path.join(tmp, "projects.json")).projects) == sorted(pm.projects)
+            print("   ✅ Concurrent requests keep the data and its indexes consistent")
+        finally:
+            pm.close()
+            web_app._pm_instance = previous
+
+
+if __name__ == "__main__":
+    test_rw_lock()
+    test_concurrent_requests()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script for the precomputed project view models used by the list pages
+"""
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from project_manager import ProjectManager
+from web_app import app, build_project_views
+
+
+def test_build_project_views():
+    print("🖼️  Testing project view models")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pm = ProjectManager(os.path.join(tmp, "projects.json"))
+        category = pm.create_category("Work")
+        soon = (datetime.now() + timedelta(days=2, hours=1)).isoformat()
+        late = (datetime.now() - timedelta(days=3)).isoformat()
+        due = pm.create_project("Due soon", deadline=soon, category_id=category.id)
+        overdue = pm.create_project("Overdue", deadline=late)
+        due.stages[0].tasks[0].complete()
+
+        views = {view['id']: view for view in build_project_views(pm.list_projects(), pm.list_categories())}
+        assert views[due.id]['category_name'] == "Work"
+        assert views[due.id]['due_soon'] and views[due.id]['status'] == 'active'
+        assert views[due.id]['progress'] == due.get_overall_progress()
+        assert views[due.id]['current_stage'] == {'name': due.stages[0].name, 'status': 'in_progress'}
+        assert views[overdue.id]['status'] == 'overdue' and views[overdue.id]['category_name'] == pm.get_category(overdue.category_id).name
+        assert views[overdue.id]['stage_count'] == len(overdue.stages)
+        assert views[overdue.id]['task_count'] == sum(len(s.tasks) for s in overdue.stages)
+        print("   ✅ Derived fields match the project methods")
+
+        with app.test_request_context():
+            from flask import render_template
+            html = render_template('category_detail.html', category=category,
+                                   projects=[views[due.id]],
+                                   stats={'active': 1, 'completed': 0, 'overdue': 0, 'average_progress': 0.125,
+                                          'total_stages': 4, 'completed_stages': 0, 'total_tasks': 7})
+        assert "Due soon" in html and "12.5%" in html
+        print("   ✅ Category page renders from view models")
+
+
+if __name__ == "__main__":
+    test_build_project_views()
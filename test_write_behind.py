@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for atomic saves and write-behind flushing
+"""
+import json
+import os
+import tempfile
+import time
+
+from project_manager import ProjectManager
+from project_store import JSONFileStore
+
+
+class CountingStore(JSONFileStore):
+    """JSON store that counts how many full saves were made"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.saves = 0
+
+    def save_encoded(self, text):
+        self.saves += 1
+        super().save_encoded(text)
+
+
+class FailingOnceStore(JSONFileStore):
+    """JSON store whose first save fails with an unexpected error"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.failed = False
+
+    def save_encoded(self, text):
+        if not self.failed:
+            self.failed = True
+            raise RuntimeError("unexpected failure")
+        super().save_encoded(text)
+
+
+def test_atomic_save():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        pm = ProjectManager(data_file)
+        pm.create_project("Atomic Project")
+
+        assert [name for name in os.listdir(tmp) if name.endswith(".tmp")] == [], "Temp files must not be left behind"
+        with open(data_file) as f:
+            assert len(json.load(f)['projects']) == 1
+    print("   ✅ Saves replace the data file atomically")
+
+
+def test_write_behind_coalesces_bursts():
+    print("💾 Testing write-behind flushing")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        store = CountingStore(data_file)
+        pm = ProjectManager(data_file, store=store, write_behind=True, flush_delay=0.2)
+        pm.flush()
+        store.saves = 0
+
+        projects = [pm.create_project(f"Project {i}") for i in range(10)]
+        for project in projects[:5]:
+            pm.delete_project(project.id)
+        assert store.saves == 0, "Mutations should return before anything is written"
+
+        time.sleep(1.0)
+        assert store.saves == 1, f"Expected one coalesced save, got {store.saves}"
+        assert len(ProjectManager(data_file).projects) == 5
+        print("   ✅ 15 mutations flushed with a single background save")
+
+        pm.create_project("Pending Project")
+        pm.close()
+        assert len(ProjectManager(data_file).projects) == 6
+        print("   ✅ close() writes out pending changes")
+
+
+def test_flusher_survives_errors():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "projects.json")
+        ProjectManager(data_file)
+        store = FailingOnceStore(data_file)
+        pm = ProjectManager(data_file, store=store, write_behind=True, flush_delay=0.05)
+        pm.create_project("Retried Project")
+        deadline = time.time() + 5
+        while len(ProjectManager(data_file).projects) < 1 and time.time() < deadline:
+            time.sleep(0.02)
+        assert store.failed and len(ProjectManager(data_file).projects) == 1
+        pm.create_project("Later Project")
+        time.sleep(0.3)
+        assert len(ProjectManager(data_file).projects) == 2, "The flusher must keep running after an error"
+        pm.close()
+        print("   ✅ A failed background write is retried and the flusher keeps running")
+
+
+if __name__ == "__main__":
+    test_atomic_save()
+    test_write_behind_coalesces_bursts()
+    test_flusher_survives_errors()
@@ -3,12 +3,26 @@
 Web interface for Project Management System
 With automatic data reloading for real-time updates
 """
-from flask import Flask, render_template, jsonify, request, redirect, url_for, send_file
-from project_manager import ProjectManager, Task, TaskStatus, StageStatus
+from flask import Flask, Response, g, has_request_context, render_template, jsonify, request, redirect, url_for, send_file, make_response
+from functools import wraps
+from change_bus import ChangeBus
+from project_manager import ProjectManager, TaskStatus, StageStatus, project_sort_key
+from project_store import open_store, read_summary, StoreError, SQLITE_EXTENSIONS
+from project_catalog import ProjectFileCatalog
+from project_import import RECORD_KINDS, import_ndjson, iter_lines
 from notification_system import get_notification_system
+from deadline_scheduler import DeadlineScheduler
+from file_watcher import FileWatcher
+import atexit
+import base64
+import itertools
 import json
 import logging
 import os
+import threading
+import time
+import uuid
+import zlib
 from datetime import datetime
 
 # Configure logging
@@ -18,51 +32,173 @@ app = Flask(__name__)
 
 # Global variables for data management
 _pm_instance = None
-_last_file_mtime = 0
+_pm_lock = threading.Lock()
+_watcher = None
 _data_file = "projects.json"
 _current_project_file = "projects.json"
+# Options for the shared ProjectManager; set compact_models=True before the
+# first request to hold very large data sets in slotted model objects, and
+# lazy=True to build projects only when a request first needs them
+PM_OPTIONS = {'write_behind': True, 'compact_models': False, 'lazy': False}
+# Change events of every ProjectManager instance, relayed by /api/events
+_change_bus = ChangeBus()
+# Project counts of the files offered by the file switcher, read in the background
+_file_catalog = ProjectFileCatalog(
+    on_update=lambda generation: _change_bus.publish('catalog_updated', generation=generation))
+# Send deadline reminders from a scheduler thread in this process. Turn it
+# off when running several web workers, and run `cli.py deadline-daemon` once instead
+DEADLINE_SCHEDULER = True
+_deadline_scheduler = None
+# Seconds between keep-alive comments on idle event streams
+EVENT_STREAM_HEARTBEAT = 15
+# Distinguishes ETags issued by this process from those of an earlier run
+_etag_prefix = uuid.uuid4().hex[:8]
 
 def get_project_manager():
-    """Get ProjectManager instance with automatic data reloading"""
-    global _pm_instance, _last_file_mtime, _data_file, _current_project_file
+    """Get the current ProjectManager instance.
+
+    External changes to the project file are picked up by a background
+    watcher (see _start_watcher), so requests never stat the file or wait
+    for a reload.
+    """
+    global _pm_instance, _data_file
     
-    # Update data file to current project file
-    _data_file = _current_project_file
+    if has_request_context() and 'pm' in g:
+        return g.pm  # The instance whose lock this request holds
+    pm = _pm_instance
+    if pm is not None:
+        return pm
     
-    try:
-        # Check if file exists and get modification time
-        if os.path.exists(_data_file):
-            current_mtime = os.path.getmtime(_data_file)
-        else:
-            current_mtime = 0
-        
-        # Create new instance or reload if file changed AND we don't have an instance
-        # OR if the file was modified by external process (significant time difference)
-        should_reload = False
+    created = False
+    with _pm_lock:
         if _pm_instance is None:
-            should_reload = True
+            _data_file = _current_project_file
             logging.info(f"Creating initial ProjectManager instance for {_data_file}")
-        elif current_mtime > _last_file_mtime + 2:  # Only reload if file was modified more than 2 seconds ago
-            should_reload = True
-            logging.info(f"Reloading project data from {_data_file} (external modification detected)")
-        
-        if should_reload:
-            _pm_instance = ProjectManager(_data_file)
-            _last_file_mtime = current_mtime
-            
-    except Exception as e:
-        logging.error(f"Error loading project manager: {e}")
-        if _pm_instance is None:
-            _pm_instance = ProjectManager(_data_file)
+            try:
+                _pm_instance = ProjectManager(_data_file, bus=_change_bus, **PM_OPTIONS)
+            except Exception as e:
+                logging.error(f"Error loading project manager: {e}")
+                _pm_instance = ProjectManager(_data_file, bus=_change_bus, **PM_OPTIONS)
+            created = True
+        pm = _pm_instance
     
-    return _pm_instance
+    # Outside the lock: stopping the old watcher waits for its reload callback
+    if created:
+        _start_watcher(pm.data_file)
+        # Notifications an earlier run could not send yet go out now
+        get_notification_system().start_dispatcher()
+        _start_deadline_scheduler()
+    return pm
+
+def _start_watcher(data_file):
+    """Watch data_file (and an SQLite write-ahead log next to it) for external changes"""
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+    paths = [data_file]
+    if data_file.endswith(SQLITE_EXTENSIONS):
+        paths.append(data_file + "-wal")
+    _watcher = FileWatcher(paths, lambda path: _reload_project_manager(data_file)).start()
+    logging.info(f"Watching {data_file} for external changes ({_watcher.mode})")
+
+def _start_deadline_scheduler():
+    global _deadline_scheduler
+    if DEADLINE_SCHEDULER and _deadline_scheduler is None:
+        _deadline_scheduler = DeadlineScheduler(
+            check_deadlines_background, lambda: get_project_manager().active_deadlines(),
+            lambda project_id: get_project_manager().active_deadline(project_id),
+            lambda deadline: get_notification_system().threshold_crossings(deadline), _change_bus).start()
+
+def _reload_project_manager(data_file):
+    """Bring external changes to data_file into the shared manager (runs in the watcher thread)"""
+    global _pm_instance
+    pm = _pm_instance
+    if pm is None or pm.data_file != data_file or not pm.store.changed_externally():
+        return  # Our own save, or the file has been switched meanwhile
+    
+    if pm.store.supports_encoded_save:
+        # JSON files carry revisions: only what other processes changed is
+        # reloaded, and changes still queued here are kept unless they conflict
+        logging.info(f"Merging external changes to {data_file}")
+        pm.sync()
+        return
+    logging.info(f"Reloading project data from {data_file} (external modification detected)")
+    # Changes still queued in this process are written first (last writer wins)
+    pm.flush()
+    new_pm = ProjectManager(data_file, bus=_change_bus, **PM_OPTIONS)
+    with _pm_lock:
+        if _pm_instance is not pm:
+            new_pm.close()
+            return
+        _pm_instance = new_pm
+    pm.close()
+    _change_bus.publish('data_reloaded', file=data_file, version=new_pm.data_version)
 
 def switch_project_file(new_file):
     """Switch to a different project file"""
-    global _pm_instance, _last_file_mtime, _current_project_file
-    _current_project_file = new_file
-    _pm_instance = None  # Force reload
-    _last_file_mtime = 0
+    global _pm_instance, _current_project_file
+    with _pm_lock:
+        if _pm_instance is not None:
+            _pm_instance.close()
+        _current_project_file = new_file
+        _pm_instance = None  # Force reload
+    _change_bus.publish('file_switched', file=new_file)
+
+@atexit.register
+def flush_project_manager():
+    """Write out pending write-behind changes and stop notification workers on shutdown"""
+    if _deadline_scheduler is not None:
+        _deadline_scheduler.stop()
+    if _watcher is not None:
+        _watcher.stop()
+    if _pm_instance is not None:
+        _pm_instance.close()
+    get_notification_system().close(timeout=5)
+
+# Endpoints that take the data lock themselves or never touch the data.
+# Streamed imports lock only to apply what they have read and validated.
+_SELF_LOCKING_ENDPOINTS = {None, 'static', 'api_events', 'api_import_projects', 'api_import_all'}
+# Endpoints that only read the data despite their method
+_READ_ONLY_ENDPOINTS = {'api_test_notifications', 'api_export_project_file'}
+
+@app.before_request
+def lock_project_data():
+    """Hold the manager's lock for the request: shared to read, exclusive to change.
+
+    The manager is pinned in g, so a reload swapping in a new instance
+    meanwhile cannot hand the view one whose lock it doesn't hold.
+    """
+    if request.endpoint in _SELF_LOCKING_ENDPOINTS:
+        return
+    pm = get_project_manager()
+    write = request.method not in ('GET', 'HEAD', 'OPTIONS') and request.endpoint not in _READ_ONLY_ENDPOINTS
+    if write:
+        pm.lock.acquire_write()
+        del pm.write_conflicts[:]
+    else:
+        pm.lock.acquire_read()
+    g.pm, g.pm_write = pm, write
+
+@app.after_request
+def report_write_conflicts(response):
+    """Answer 409 when another process had changed what the request changed, and its change was discarded"""
+    pm = g.get('pm')
+    if pm is None or not g.pm_write or not pm.write_conflicts:
+        return response
+    response = jsonify({'error': 'Changed by another process meanwhile; this change was discarded',
+                        'conflicts': list(pm.write_conflicts)})
+    response.status_code = 409
+    return response
+
+@app.teardown_request
+def unlock_project_data(error=None):
+    pm = g.pop('pm', None)
+    if pm is None:
+        return
+    if g.pm_write:
+        pm.lock.release_write()
+    else:
+        pm.lock.release_read()
 
 def get_template_context():
     """Get common template context including subtitle"""
@@ -72,30 +208,103 @@ def get_template_context():
         'current_file': _current_project_file
     }
 
+def data_etag(*parts):
+    """ETag naming the current version of the project data (plus any extra parts)"""
+    etag = f"{_etag_prefix}-{get_project_manager().data_version}"
+    if parts:
+        # hash() is salted per process, like the prefix
+        etag += f"-{hash(parts) & 0xffffffff:x}"
+    return etag
+
+def conditional_get(*validators):
+    """Serve GET requests with an ETag and answer a matching If-None-Match with 304.
+
+    The tag is derived from the project data version, so unchanged data is
+    never rendered or serialized again. Views that also depend on something
+    else pass callables returning extra parts of the tag.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            etag = data_etag(*(validator() for validator in validators))
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.last_modified = get_project_manager().data_modified_at
+            # Caches may keep the response but must check the tag before reuse
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+def deadline_clock():
+    """Validator for pages showing overdue flags and days left, which change with time"""
+    return int(time.time() // 60)
+
+def build_project_views(projects, categories):
+    """Flatten projects into the dicts the project list templates render.
+
+    Derived values are computed once per project and request, and category
+    names are resolved through a dict instead of a loop per row.
+    """
+    category_names = {category.id: category.name for category in categories}
+    views = []
+    for project in projects:
+        is_completed = project.is_completed()
+        is_overdue = project.is_overdue()
+        days_left = project.days_until_deadline()
+        current_stage = project.get_current_stage()
+        views.append({
+            'id': project.id,
+            'name': project.name,
+            'description': project.description,
+            'category_id': project.category_id,
+            'category_name': category_names.get(project.category_id),
+            'created_at': project.created_at,
+            'deadline': project.deadline,
+            'days_until_deadline': days_left,
+            'is_completed': is_completed,
+            'is_overdue': is_overdue,
+            'due_soon': days_left is not None and days_left <= 3 and not is_completed,
+            'status': 'completed' if is_completed else ('overdue' if is_overdue else 'active'),
+            'progress': project.get_overall_progress(),
+            'stage_count': len(project.stages),
+            'completed_stages': project._stage_completed,
+            'task_count': project._task_total,
+            'current_stage': {'name': current_stage.name, 'status': current_stage.status.value} if current_stage else None
+        })
+    return views
+
 @app.route('/')
+@conditional_get()
 def dashboard():
     try:
         pm = get_project_manager()  # Get fresh data
-        projects = pm.list_projects()
         categories = pm.list_categories()
         summary = pm.get_global_summary()
         
-        # Add project count to categories
-        for category in categories:
-            category.project_count = len([p for p in projects if p.category_id == category.id])
+        # The dashboard only shows aggregates, so no per-project work is needed
+        category_counts = pm.count_projects_by_category()
         
-        logging.info(f"Dashboard: {len(projects)} projects, {len(categories)} categories")
-        return render_template('dashboard.html', projects=projects, categories=categories, summary=summary, current_file=_current_project_file, subtitle=pm.get_subtitle())
+        logging.info(f"Dashboard: {summary['total_projects']} projects, {len(categories)} categories")
+        return render_template('dashboard.html', categories=categories, category_counts=category_counts, summary=summary, current_file=_current_project_file, subtitle=pm.get_subtitle())
     except Exception as e:
         logging.error(f"Error rendering dashboard: {e}")
         return "Error loading dashboard", 500
 
 @app.route('/projects')
+@conditional_get(deadline_clock)
 def index():
     try:
         pm = get_project_manager()  # Get fresh data
-        projects = pm.list_projects()
         categories = pm.list_categories()
+        projects = build_project_views(pm.list_projects(), categories)
         context = get_template_context()
         logging.info(f"Projects page: {len(projects)} projects, {len(categories)} categories")
         return render_template('index.html', projects=projects, categories=categories, **context)
@@ -104,6 +313,7 @@ def index():
         return "Error loading page", 500
 
 @app.route('/summary')
+@conditional_get()
 def summary():
     try:
         pm = get_project_manager()  # Get fresh data
@@ -135,33 +345,48 @@ def summary():
         return "Error loading summary page", 500
 
 @app.route('/categories')
+@conditional_get()
 def categories():
     try:
         pm = get_project_manager()  # Get fresh data
         categories = pm.list_categories()
         default_category = pm.get_default_category()
         projects = pm.list_projects()
+        projects_by_category = {category.id: pm.get_projects_by_category(category.id) for category in categories}
+        completed_counts = pm.count_projects_by_category(completed=True)
         logging.info(f"Categories page: {len(categories)} categories")
-        return render_template('categories.html', categories=categories, default_category=default_category, projects=projects)
+        return render_template('categories.html', categories=categories, default_category=default_category, projects=projects,
+                               projects_by_category=projects_by_category, completed_counts=completed_counts)
     except Exception as e:
         logging.error(f"Error rendering categories page: {e}")
         return "Error loading categories page", 500
 
 @app.route('/category/<category_id>')
+@conditional_get(deadline_clock)
 def category_detail(category_id):
     try:
         pm = get_project_manager()  # Get fresh data
         category = pm.get_category(category_id)
         if not category:
             return "Category not found", 404
-        projects = pm.get_projects_by_category(category_id)
+        projects = build_project_views(pm.get_projects_by_category(category_id), [category])
+        stats = {
+            'active': sum(1 for p in projects if not p['is_completed']),
+            'completed': sum(1 for p in projects if p['is_completed']),
+            'overdue': sum(1 for p in projects if p['is_overdue']),
+            'average_progress': sum(p['progress'] for p in projects) / len(projects) if projects else 0,
+            'total_stages': sum(p['stage_count'] for p in projects),
+            'completed_stages': sum(p['completed_stages'] for p in projects),
+            'total_tasks': sum(p['task_count'] for p in projects)
+        }
         logging.info(f"Category detail: {category.name}")
-        return render_template('category_detail.html', category=category, projects=projects)
+        return render_template('category_detail.html', category=category, projects=projects, stats=stats)
     except Exception as e:
         logging.error(f"Error rendering category detail page: {e}")
         return "Error loading category detail page", 500
 
 @app.route('/project/<project_id>')
+@conditional_get(deadline_clock)
 def project_detail(project_id):
     try:
         pm = get_project_manager()  # Get fresh data
@@ -176,17 +401,137 @@ def project_detail(project_id):
         return "Error loading project detail page", 500
 
 # API Endpoints
+# Fields selectable with /api/projects?fields=...; only 'stages' includes tasks
+PROJECT_FIELDS = {
+    'id': lambda p: p.id,
+    'name': lambda p: p.name,
+    'description': lambda p: p.description,
+    'deadline': lambda p: p.deadline,
+    'category_id': lambda p: p.category_id,
+    'created_at': lambda p: p.created_at,
+    'completed_at': lambda p: p.completed_at,
+    'stages': lambda p: [stage.to_dict() for stage in p.stages],
+    'progress': lambda p: p.get_overall_progress(),
+    'is_completed': lambda p: p.is_completed(),
+    'is_overdue': lambda p: p.is_overdue(),
+    'days_until_deadline': lambda p: p.days_until_deadline(),
+    'current_stage': lambda p: p.get_current_stage().name if p.get_current_stage() else None,
+    'stage_count': lambda p: len(p.stages),
+    'completed_stages': lambda p: p._stage_completed,
+    'task_count': lambda p: p._task_total,
+    'completed_tasks': lambda p: p._task_completed,
+}
+# fields=summary: everything except the stage and task details
+SUMMARY_FIELDS = [field for field in PROJECT_FIELDS if field != 'stages']
+# Fields that change with the time as well as with the data
+CLOCK_FIELDS = {'is_overdue', 'days_until_deadline'}
+MAX_PAGE_SIZE = 500
+DEFAULT_PAGE_SIZE = 50
+
+def _parse_flag(value, name):
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError(f"{name} must be true or false")
+
+def parse_project_query(args):
+    """Turn /api/projects query arguments into ProjectManager.find_projects() filters"""
+    filters = {}
+    if 'category' in args:
+        filters['category_id'] = None if args['category'] in ('', 'none') else args['category']
+    if 'status' in args:
+        if args['status'] not in ('active', 'completed'):
+            raise ValueError("status must be 'active' or 'completed'")
+        filters['completed'] = args['status'] == 'completed'
+    if 'overdue' in args:
+        filters['overdue'] = _parse_flag(args['overdue'], 'overdue')
+    if args.get('q'):
+        filters['search'] = args['q']
+    return filters
+
+def parse_fields(value):
+    if value is None:
+        return None
+    fields = SUMMARY_FIELDS if value == 'summary' else [f for f in value.split(',') if f]
+    unknown = [f for f in fields if f not in PROJECT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+def encode_cursor(project):
+    return base64.urlsafe_b64encode(json.dumps(project_sort_key(project)).encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        key = None
+    if not (isinstance(key, list) and len(key) == 2 and all(isinstance(part, str) for part in key)):
+        raise ValueError("Invalid cursor")
+    return tuple(key)
+
+def parse_limit(value):
+    try:
+        return min(max(int(value), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        raise ValueError("limit must be a number")
+
+def project_listing_clock():
+    """deadline_clock() for /api/projects queries with the overdue filter or time-dependent fields"""
+    fields = request.args.get('fields')
+    if 'overdue' in request.args or fields == 'summary' or (fields and CLOCK_FIELDS & set(fields.split(','))):
+        return deadline_clock()
+    return None
+
 @app.route('/api/projects')
+@conditional_get(project_listing_clock)
 def api_projects():
+    """All projects as full dicts, or a filtered, projected and paginated listing.
+
+    Query arguments: category (id, or 'none'), status (active|completed),
+    overdue (true|false), q (text in name or description), fields (comma
+    separated names from PROJECT_FIELDS, or 'summary'), limit and cursor.
+    With limit or cursor the response is {'projects', 'total', 'next_cursor'}.
+    """
     try:
         pm = get_project_manager()  # Get fresh data
-        projects = pm.list_projects()
-        return jsonify([p.to_dict() for p in projects])
+        if not request.args:
+            projects = pm.list_projects()
+            return jsonify([p.to_dict() for p in projects])
+
+        try:
+            filters = parse_project_query(request.args)
+            fields = parse_fields(request.args.get('fields'))
+            paginated = 'limit' in request.args or 'cursor' in request.args
+            if paginated:
+                limit = parse_limit(request.args.get('limit', DEFAULT_PAGE_SIZE))
+                cursor = request.args.get('cursor')
+                # Keyset pagination: resume after the last project of the previous
+                # page, so inserts and deletes never shift the following pages
+                after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        def encode(project):
+            if fields is None:
+                return project.to_dict()
+            return {field: PROJECT_FIELDS[field](project) for field in fields}
+
+        if not paginated:
+            return jsonify([encode(p) for p in pm.find_projects(**filters)])
+        page, total, more = pm.find_projects_page(limit, after, **filters)
+        return jsonify({
+            'projects': [encode(p) for p in page],
+            'total': total,
+            'next_cursor': encode_cursor(page[-1]) if more else None
+        })
     except Exception as e:
         logging.error(f"Error in API /api/projects: {e}")
         return jsonify({'error': 'Internal Server Error'}), 500
 
 @app.route('/api/project/<project_id>')
+@conditional_get()
 def api_project_detail(project_id):
     try:
         pm = get_project_manager()  # Get fresh data
@@ -243,9 +588,9 @@ def api_add_task(project_id):
         data = request.json
         if not data.get('name'): return jsonify({'error': 'Task name is required'}), 400
 
-        task = Task(data['name'], data.get('description', ''), data.get('assignee', ''))
+        task = current_stage.task_class(data['name'], data.get('description', ''), data.get('assignee', ''))
         current_stage.add_task(task)
-        pm.save_data()
+        pm.save_project(project)
         return jsonify(task.to_dict()), 201
     except Exception as e:
         logging.error(f"Error in API /api/project/{project_id}/add_task: {e}")
@@ -255,36 +600,35 @@ def api_add_task(project_id):
 def api_complete_task(task_id):
     try:
         pm = get_project_manager()  # Get fresh data
-        for p in pm.projects.values():
-            for stage in p.stages:
-                for task in stage.tasks:
-                    if task.id == task_id:
-                        task.status = TaskStatus.COMPLETED
-                        task.complete()
-                        
-                        # Check if all tasks in this stage are completed
-                        stage_tasks = stage.tasks
-                        completed_tasks = [t for t in stage_tasks if t.status == TaskStatus.COMPLETED]
-                        
-                        if len(completed_tasks) == len(stage_tasks) and len(stage_tasks) > 0:
-                            # All tasks completed, mark stage as complete
-                            stage.status = StageStatus.COMPLETED
-                            stage.completed_at = datetime.now().isoformat()
-                            
-                            # Check if we should advance to next stage
-                            project_stages = p.stages
-                            current_stage_index = project_stages.index(stage)
-                            
-                            if current_stage_index + 1 < len(project_stages):
-                                # There's a next stage, start it
-                                next_stage = project_stages[current_stage_index + 1]
-                                if next_stage.status == StageStatus.NOT_STARTED:
-                                    next_stage.start()
-                        
-                        pm.save_data()
-                        return jsonify(task.to_dict())
-        
-        return jsonify({'error': 'Task not found'}), 404
+        found = pm.get_task(task_id)
+        if not found:
+            return jsonify({'error': 'Task not found'}), 404
+        
+        p, stage, task = found
+        task.status = TaskStatus.COMPLETED
+        task.complete()
+        
+        # Check if all tasks in this stage are completed
+        stage_tasks = stage.tasks
+        completed_tasks = [t for t in stage_tasks if t.status == TaskStatus.COMPLETED]
+        
+        if len(completed_tasks) == len(stage_tasks) and len(stage_tasks) > 0:
+            # All tasks completed, mark stage as complete
+            stage.status = StageStatus.COMPLETED
+            stage.completed_at = datetime.now().isoformat()
+            
+            # Check if we should advance to next stage
+            project_stages = p.stages
+            current_stage_index = project_stages.index(stage)
+            
+            if current_stage_index + 1 < len(project_stages):
+                # There's a next stage, start it
+                next_stage = project_stages[current_stage_index + 1]
+                if next_stage.status == StageStatus.NOT_STARTED:
+                    next_stage.start()
+        
+        pm.save_project(p)
+        return jsonify(task.to_dict())
     except Exception as e:
         logging.error(f"Error in API /api/task/{task_id}/complete: {e}")
         return jsonify({'error': 'Internal Server Error'}), 500
@@ -303,17 +647,16 @@ def api_update_task_status(task_id):
         except ValueError:
             return jsonify({'error': 'Invalid status value'}), 400
 
-        for p in pm.projects.values():
-            for stage in p.stages:
-                for task in stage.tasks:
-                    if task.id == task_id:
-                        task.status = status_enum
-                        if status_enum == TaskStatus.COMPLETED:
-                            task.complete()
-                        pm.save_data()
-                        return jsonify(task.to_dict())
-        
-        return jsonify({'error': 'Task not found'}), 404
+        found = pm.get_task(task_id)
+        if not found:
+            return jsonify({'error': 'Task not found'}), 404
+        
+        p, _, task = found
+        task.status = status_enum
+        if status_enum == TaskStatus.COMPLETED:
+            task.complete()
+        pm.save_project(p)
+        return jsonify(task.to_dict())
     except Exception as e:
         logging.error(f"Error in API /api/task/{task_id}/update: {e}")
         return jsonify({'error': 'Internal Server Error'}), 500
@@ -326,7 +669,7 @@ def api_next_stage(project_id):
         if not project: return jsonify({'error': 'Project not found'}), 404
         
         success, message = project.advance_to_next_stage()
-        pm.save_data()
+        pm.save_project(project)
         return jsonify({'success': success, 'message': message, 'project': project.to_dict()})
     except Exception as e:
         logging.error(f"Error in API /api/project/{project_id}/next_stage: {e}")
@@ -340,13 +683,40 @@ def api_previous_stage(project_id):
         if not project: return jsonify({'error': 'Project not found'}), 404
 
         success, message = project.go_back_to_previous_stage()
-        pm.save_data()
+        pm.save_project(project)
         return jsonify({'success': success, 'message': message, 'project': project.to_dict()})
     except Exception as e:
         logging.error(f"Error in API /api/project/{project_id}/previous_stage: {e}")
         return jsonify({'error': 'Internal Server Error'}), 500
 
+@app.route('/api/events')
+def api_events():
+    """Server-Sent Events stream of data changes (see change_bus.ChangeBus)"""
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    subscription = _change_bus.subscribe(last_event_id)
+
+    def stream():
+        try:
+            # Browsers reconnect on their own, sending the last id they saw
+            yield "retry: 3000\n\n"
+            while True:
+                event = subscription.get(timeout=EVENT_STREAM_HEARTBEAT)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"id: {event['id']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            _change_bus.unsubscribe(subscription)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/summary')
+@conditional_get()
 def api_summary():
     try:
         pm = get_project_manager()  # Get fresh data
@@ -356,6 +726,7 @@ def api_summary():
         return jsonify({'error': 'Internal Server Error'}), 500
 
 @app.route('/api/categories', methods=['GET', 'POST'])
+@conditional_get()
 def api_categories():
     try:
         pm = get_project_manager()  # Get fresh data
@@ -408,7 +779,7 @@ def api_update_project(project_id):
         if 'name' in data: project.name = data['name']
         if 'description' in data: project.description = data['description']
         
-        pm.save_data()
+        pm.save_project(project)
         return jsonify(project.to_dict())
     except Exception as e:
         logging.error(f"Error in API /api/project/{project_id}/update: {e}")
@@ -426,6 +797,7 @@ def api_delete_project(project_id):
         return jsonify({'error': 'Internal Server Error'}), 500
 
 @app.route('/api/default_category', methods=['GET', 'POST'])
+@conditional_get()
 def api_default_category():
     try:
         pm = get_project_manager()  # Get fresh data
@@ -443,6 +815,7 @@ def api_default_category():
 
 # Template Management Routes
 @app.route('/templates')
+@conditional_get()
 def templates():
     try:
         pm = get_project_manager()  # Get fresh data
@@ -453,6 +826,7 @@ def templates():
         return "Error loading templates page", 500
 
 @app.route('/api/templates', methods=['GET', 'POST'])
+@conditional_get()
 def api_templates():
     try:
         pm = get_project_manager()  # Get fresh data
@@ -475,6 +849,7 @@ def api_templates():
         return jsonify({'error': 'Internal Server Error'}), 500
 
 @app.route('/api/template/<template_id>', methods=['GET', 'PUT', 'DELETE'])
+@conditional_get()
 def api_template(template_id):
     try:
         pm = get_project_manager()  # Get fresh data
@@ -509,10 +884,70 @@ def api_template(template_id):
         return jsonify({'error': 'Internal Server Error'}), 500
 
 # Import/Export Routes
+# Streamed exports (?format=ndjson): one JSON record per line, written out in
+# chunks of about this many bytes
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+def export_records(pm, scope):
+    """NDJSON lines of an export: a header, the records, then a trailer with the counts"""
+    yield json.dumps({'export': scope, 'exported_at': datetime.now().isoformat(), 'format': 1}) + '\n'
+    counts = {'projects': 0}
+    if scope == 'all':
+        counts.update(categories=0, templates=0)
+        for category in pm.list_categories():
+            counts['categories'] += 1
+            yield json.dumps({'category': category.to_dict()}, default=str) + '\n'
+        for template in pm.list_templates():
+            counts['templates'] += 1
+            yield json.dumps({'template': template}, default=str) + '\n'
+    for project in pm.iter_project_dicts():
+        counts['projects'] += 1
+        yield json.dumps({'project': project}, default=str) + '\n'
+    yield json.dumps({'end': counts}) + '\n'
+
+def chunked(lines, size=EXPORT_CHUNK_SIZE):
+    """Join lines into chunks of roughly size characters"""
+    buffer, length = [], 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield ''.join(buffer).encode()
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer).encode()
+
+def gzipped(chunks):
+    """Compress a stream of byte chunks into one gzip member on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for i, chunk in enumerate(chunks):
+        data = compressor.compress(chunk)
+        if i == 0:
+            # Get the header line out straight away
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def streamed_export(pm, scope):
+    """Streaming NDJSON download of an export, gzip compressed with ?gzip=1"""
+    filename = f"{scope}-export-{datetime.now().strftime('%Y-%m-%d')}.ndjson"
+    # The header line goes out as its own chunk so the download starts at once
+    lines = export_records(pm, scope)
+    chunks = itertools.chain([next(lines).encode()], chunked(lines))
+    mimetype = 'application/x-ndjson'
+    if request.args.get('gzip') in ('1', 'true'):
+        chunks, filename, mimetype = gzipped(chunks), filename + '.gz', 'application/gzip'
+    return Response(chunks, mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
 @app.route('/api/export/projects')
+@conditional_get()
 def api_export_projects():
     try:
         pm = get_project_manager()  # Get fresh data
+        if request.args.get('format') == 'ndjson':
+            return streamed_export(pm, 'projects')
         projects = pm.list_projects()
         projects_data = [p.to_dict() for p in projects]
         return jsonify({
@@ -525,6 +960,7 @@ def api_export_projects():
         return jsonify({'error': 'Internal Server Error'}), 500
 
 @app.route('/api/export/templates')
+@conditional_get()
 def api_export_templates():
     try:
         pm = get_project_manager()  # Get fresh data
@@ -539,9 +975,12 @@ def api_export_templates():
         return jsonify({'error': 'Internal Server Error'}), 500
 
 @app.route('/api/export/all')
+@conditional_get()
 def api_export_all():
     try:
         pm = get_project_manager()  # Get fresh data
+        if request.args.get('format') == 'ndjson':
+            return streamed_export(pm, 'all')
         projects = pm.list_projects()
         templates = pm.list_templates()
         categories = pm.list_categories()
@@ -561,23 +1000,42 @@ def api_export_all():
         logging.error(f"Error in API /api/export/all: {e}")
         return jsonify({'error': 'Internal Server Error'}), 500
 
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/gzip')
+
+def streamed_import(pm, kinds):
+    """Import an NDJSON upload (plain or gzip) record by record, see project_import.
+
+    Nothing is applied if any record is invalid, unless ?on_error=skip.
+    """
+    report = import_ndjson(pm, iter_lines(request.stream), kinds=kinds,
+                           atomic=request.args.get('on_error') != 'skip')
+    result = report.to_dict()
+    imported = sum(report.imported.values())
+    if report.committed:
+        result['message'] = f'Successfully imported {imported} items'
+        return jsonify(result)
+    result['error'] = f'Import rejected: {report.error_count} invalid records, nothing was imported'
+    return jsonify(result), 422
+
 @app.route('/api/import/projects', methods=['POST'])
 def api_import_projects():
     try:
         pm = get_project_manager()  # Get fresh data
+        if request.mimetype in NDJSON_MIMETYPES:
+            return streamed_import(pm, kinds=('project',))
         data = request.json
         if 'projects' not in data:
             return jsonify({'error': 'No projects data found'}), 400
         
-        from project_manager import Project
-        imported_count = 0
-        for project_data in data['projects']:
-            # Create project from imported data
-            project = Project.from_dict(project_data)
-            pm.projects[project.id] = project
-            imported_count += 1
+        with pm.lock.write():
+            imported_count = 0
+            for project_data in data['projects']:
+                # Create project from imported data
+                project = pm.project_class.from_dict(project_data)
+                pm.register_project(project)
+                imported_count += 1
         
-        pm.save_data()
+            pm.save_data()
         return jsonify({
             'message': f'Successfully imported {imported_count} projects',
             'imported_count': imported_count
@@ -612,32 +1070,33 @@ def api_import_templates():
 def api_import_all():
     try:
         pm = get_project_manager()  # Get fresh data
+        if request.mimetype in NDJSON_MIMETYPES:
+            return streamed_import(pm, kinds=RECORD_KINDS)
         data = request.json
-        imported_counts = {'projects': 0, 'templates': 0, 'categories': 0}
-        
-        from project_manager import Project, Category
-        
-        # Import categories first
-        if 'categories' in data:
-            for category_data in data['categories']:
-                category = Category.from_dict(category_data)
-                pm.categories[category.id] = category
-                imported_counts['categories'] += 1
-        
-        # Import templates
-        if 'templates' in data:
-            for template in data['templates']:
-                pm.templates[template['id']] = template
-                imported_counts['templates'] += 1
-        
-        # Import projects
-        if 'projects' in data:
-            for project_data in data['projects']:
-                project = Project.from_dict(project_data)
-                pm.projects[project.id] = project
-                imported_counts['projects'] += 1
-        
-        pm.save_data()
+        with pm.lock.write():
+            imported_counts = {'projects': 0, 'templates': 0, 'categories': 0}
+        
+            # Import categories first
+            if 'categories' in data:
+                for category_data in data['categories']:
+                    category = pm.category_class.from_dict(category_data)
+                    pm.categories[category.id] = category
+                    imported_counts['categories'] += 1
+        
+            # Import templates
+            if 'templates' in data:
+                for template in data['templates']:
+                    pm.templates[template['id']] = template
+                    imported_counts['templates'] += 1
+        
+            # Import projects
+            if 'projects' in data:
+                for project_data in data['projects']:
+                    project = pm.project_class.from_dict(project_data)
+                    pm.register_project(project)
+                    imported_counts['projects'] += 1
+        
+            pm.save_data()
         return jsonify({
             'message': f'Successfully imported {sum(imported_counts.values())} items',
             'imported_counts': imported_counts
@@ -759,21 +1218,30 @@ def api_test_notifications():
         logging.error(f"Error testing notifications: {e}")
         return jsonify({'error': 'Internal Server Error'}), 500
 
+def _notifications_configured():
+    config = get_notification_system().config
+    return config['email']['enabled'] or config['sms']['enabled']
+
+def _notification_status():
+    """Queue depth and channel breaker states; a string so it can be part of the ETag"""
+    return json.dumps(get_notification_system().status(), sort_keys=True)
+
 @app.route('/api/system-status')
+@conditional_get(lambda: (_watcher.mode if _watcher is not None else None, _notifications_configured(),
+                          _notification_status()))
 def api_system_status():
     try:
-        notification_system = get_notification_system()
         pm = get_project_manager()
+        notification_system = get_notification_system()
         
         # Check system health
         status = {
             'web_interface': True,
             'data_persistence': os.path.exists(_data_file),
-            'auto_reload': True,
-            'notifications_configured': (
-                notification_system.config['email']['enabled'] or 
-                notification_system.config['sms']['enabled']
-            ),
+            'auto_reload': _watcher is not None,
+            'file_watcher': _watcher.mode if _watcher is not None else None,
+            'notifications_configured': _notifications_configured(),
+            'notifications': notification_system.status(),
             'total_projects': len(pm.list_projects()),
             'timestamp': datetime.now().isoformat()
         }
@@ -783,6 +1251,7 @@ def api_system_status():
         return jsonify({'error': 'Internal Server Error'}), 500
 
 @app.route('/api/recent-activity')
+@conditional_get()
 def api_recent_activity():
     try:
         pm = get_project_manager()
@@ -822,13 +1291,11 @@ def user_guide():
         logging.error(f"Error serving user guide: {e}")
         return "User guide not found", 404
 
-# Background deadline checker (runs periodically)
+# Background deadline checker (run by _deadline_scheduler when a reminder comes due)
 def check_deadlines_background():
+    """Send the deadline reminders due; returns when held digest reminders can go out"""
     try:
-        pm = get_project_manager()
-        notification_system = get_notification_system()
-        projects = pm.list_projects()
-        notification_system.check_deadlines(projects)
+        return get_notification_system().sweep_deadlines(get_project_manager())
     except Exception as e:
         logging.error(f"Error checking deadlines: {e}")
         # Send error notification
@@ -844,35 +1311,16 @@ def check_deadlines_background():
 
 # Project File Management APIs
 @app.route('/api/project-files')
+@conditional_get(lambda: (_current_project_file, _file_catalog.generation, _file_catalog.signatures()))
 def api_project_files():
     try:
-        import glob
-        
-        # Find all JSON files in current directory
-        json_files = glob.glob("*.json")
-        files_info = []
-        
-        for file_name in json_files:
-            try:
-                # Try to load and count projects
-                temp_pm = ProjectManager(file_name)
-                project_count = len(temp_pm.list_projects())
-                
-                files_info.append({
-                    'name': file_name,
-                    'projects': project_count,
-                    'is_current': file_name == _current_project_file,
-                    'size': os.path.getsize(file_name) if os.path.exists(file_name) else 0
-                })
-            except Exception as e:
-                # If file is corrupted or not a valid project file, still show it but with 0 projects
-                files_info.append({
-                    'name': file_name,
-                    'projects': 0,
-                    'is_current': file_name == _current_project_file,
-                    'size': os.path.getsize(file_name) if os.path.exists(file_name) else 0,
-                    'error': str(e)
-                })
+        # Other files come from the catalog, the open one from memory
+        pm = get_project_manager()
+        live = {_current_project_file: {'projects': len(pm.projects), 'categories': len(pm.categories),
+                                        'metadata': pm.metadata}}
+        files_info = _file_catalog.entries(live)
+        for info in files_info:
+            info['is_current'] = info['name'] == _current_project_file
         
         # Sort by current file first, then alphabetically
         files_info.sort(key=lambda x: (not x['is_current'], x['name']))
@@ -894,10 +1342,10 @@ def api_switch_project_file():
         if not os.path.exists(file_name):
             return jsonify({'error': 'File does not exist'}), 404
         
-        # Test if the file is a valid project file
+        # Test if the file is a valid project file (without writing to it)
         try:
-            ProjectManager(file_name)
-        except Exception as e:
+            read_summary(file_name)
+        except StoreError as e:
             return jsonify({'error': f'Invalid project file: {str(e)}'}), 400
         
         switch_project_file(file_name)
@@ -918,8 +1366,8 @@ def api_create_project_file():
         if not file_name:
             return jsonify({'error': 'File name is required'}), 400
         
-        # Add .json extension if not present
-        if not file_name.endswith('.json'):
+        # Add .json extension if not present (.db/.sqlite files use the SQLite store)
+        if not file_name.endswith(('.json',) + SQLITE_EXTENSIONS):
             file_name += '.json'
         
         # Check if file already exists
@@ -929,8 +1377,15 @@ def api_create_project_file():
         # Create new project file based on initialization option
         if initialize_with == 'copy':
             # Copy current file
-            import shutil
-            shutil.copy(_current_project_file, file_name)
+            if file_name.endswith(SQLITE_EXTENSIONS) or _current_project_file.endswith(SQLITE_EXTENSIONS):
+                # SQLite keeps recent writes in its WAL, so copy through the stores
+                source, target = open_store(_current_project_file), open_store(file_name)
+                target.save(source.load() or {})
+                source.close()
+                target.close()
+            else:
+                import shutil
+                shutil.copy(_current_project_file, file_name)
         elif initialize_with == 'sample':
             # Create with sample data
             new_pm = ProjectManager(file_name)
@@ -983,8 +1438,8 @@ def api_import_project_file():
         
         # Validate that it's a proper project file
         try:
-            ProjectManager(file_name)
-        except Exception as e:
+            read_summary(file_name)
+        except StoreError as e:
             os.remove(file_name)  # Clean up invalid file
             return jsonify({'error': f'Invalid project file: {str(e)}'}), 400
         